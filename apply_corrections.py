@@ -2,151 +2,228 @@
 # -*- coding: utf-8 -*-
 """
 Скрипт для автоматического исправления базы данных на основе ошибок из админ-панели
+
+Исправления дописываются в журнал (correction_journal.py) поверх базового
+снимка корпуса, а не переписывают резервные копии целиком: точка
+восстановления - смещение в журнале. После записи в журнал корпус
+публикуется в opencorpora.json и офлайн-версию.
+
+Использование:
+    python3 apply_corrections.py                 # применить все lexicon_errors_*.json
+    python3 apply_corrections.py --strategy votes  # конфликты - по большинству голосов
+    python3 apply_corrections.py --no-publish    # только записать исправления в журнал
+    python3 apply_corrections.py --restore 1234  # откатиться к точке восстановления
+    python3 apply_corrections.py --compact       # проиграть журнал в базовый снимок
 """
 
-import json
-import os
+import argparse
 from datetime import datetime
 
-def load_corpus(filename):
-    """Загружает корпус из JSON файла"""
-    try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Ошибка загрузки {filename}: {e}")
-        return None
+from correction_journal import (ABSENT, append_records, compact, create_base, inverse_records, is_record_start,
+                                journal_end, load_state, make_record, public_corpus, read_records,
+                                replay_records, save_published_state)
+from corpus_format import write_corpus
+from exercise_index import write_exercise_shards
+from merge_corrections import STRATEGIES, find_export_files, merge_exports, print_merge_stats
+
+CORPUS_FILE = 'opencorpora.json'
+OFFLINE_CORPUS_FILE = 'russian_language_offline/opencorpora.json'
+BASE_SNAPSHOT = 'opencorpora_base.rlc'
+JOURNAL_FILE = 'opencorpora_corrections.jsonl'
+
+# Сжатие журнала в базовый снимок, когда после снимка накопилось столько записей
+COMPACT_EVERY = 1000
 
 def save_corpus(corpus, filename):
-    """Сохраняет корпус в JSON файл"""
+    """Сохраняет корпус в JSON или .rlc файл (по расширению)"""
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(corpus, f, ensure_ascii=False, indent=2)
+        write_corpus(corpus, filename)
         print(f"✅ Корпус сохранен в {filename}")
         return True
     except Exception as e:
         print(f"❌ Ошибка сохранения {filename}: {e}")
         return False
 
-def load_errors_from_file(filename):
-    """Загружает ошибки из экспортированного файла"""
-    try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Ошибка загрузки файла ошибок {filename}: {e}")
-        return None
+def corrections_to_records(corpus, corrections):
+    """
+    Применяет исправления из админ-панели к корпусу и возвращает записи журнала
+    для них. Исправления, которые не меняют значение (например, повторный
+    экспорт того же файла), пропускаются.
+    """
+    records = []
+    words = corpus['metadata']['words']
 
-def apply_corrections_to_corpus(corpus, corrections):
-    """Применяет исправления к корпусу"""
-    corrections_applied = 0
-    
     for correction in corrections:
         word = correction['word']
-        corrected_declension = correction.get('correctedDeclension')
-        corrected_conjugation = correction.get('correctedConjugation')
-        
-        if word in corpus['metadata']['words']:
-            features = corpus['metadata']['words'][word]
-            
-            # Применяем исправления склонения
-            if corrected_declension and features.get('pos') == 'NOUN':
-                old_declension = features.get('declension', 'unknown')
-                features['declension'] = corrected_declension
-                print(f"🔧 Исправлено склонение '{word}': {old_declension} → {corrected_declension}")
-                corrections_applied += 1
-            
-            # Применяем исправления спряжения
-            if corrected_conjugation and features.get('pos') == 'VERB':
-                old_conjugation = features.get('conjugation', 'unknown')
-                features['conjugation'] = corrected_conjugation
-                print(f"🔧 Исправлено спряжение '{word}': {old_conjugation} → {corrected_conjugation}")
-                corrections_applied += 1
-            
-            # Добавляем метаданные об исправлении
-            features['last_corrected'] = correction.get('correctedAt', datetime.now().isoformat())
-            features['correction_source'] = 'admin_panel'
-    
-    return corrections_applied
+        if word not in words:
+            continue
+        features = words[word]
+        timestamp = correction.get('correctedAt', datetime.now().isoformat())
 
-def process_errors_file():
-    """Обрабатывает файл с ошибками и применяет исправления"""
+        # Исправления склонения и спряжения
+        for field, key, pos, label in (('declension', 'correctedDeclension', 'NOUN', 'склонение'),
+                                       ('conjugation', 'correctedConjugation', 'VERB', 'спряжение')):
+            corrected = correction.get(key)
+            if not corrected or features.get('pos') != pos or features.get(field) == corrected:
+                continue
+            records.append(make_record(word, field, features.get(field, ABSENT), corrected, timestamp))
+            print(f"🔧 Исправлено {label} '{word}': {features.get(field, 'unknown')} → {corrected}")
+            replay_records(words, records[-1:])
+
+    return records
+
+def apply_corrections_to_corpus(corpus, corrections, journal_path=JOURNAL_FILE):
+    """Записывает исправления в журнал и применяет их к корпусу, возвращает их число"""
+    records = corrections_to_records(corpus, corrections)
+    if records:
+        append_records(journal_path, records)
+        corpus['metadata']['journal_offset'] = journal_end(journal_path)
+    return len(records)
+
+def load_current_corpus():
+    """
+    Текущий корпус: базовый снимок и журнал (снимок создается из opencorpora.json
+    при первом запуске и пересоздается, если opencorpora.json изменили не через журнал)
+    """
+    result = create_base(BASE_SNAPSHOT, CORPUS_FILE, JOURNAL_FILE)
+    if result == 'created':
+        print(f"💾 Создан базовый снимок {BASE_SNAPSHOT} из {CORPUS_FILE}")
+    elif result == 'rebased':
+        print(f"💾 {CORPUS_FILE} изменен не через журнал: снимок {BASE_SNAPSHOT} пересоздан из него")
+    corpus, replayed = load_state(BASE_SNAPSHOT, JOURNAL_FILE)
+    print(f"📖 Загружен снимок {BASE_SNAPSHOT} и {replayed} записей журнала")
+    if replayed >= COMPACT_EVERY:
+        write_corpus(corpus, BASE_SNAPSHOT)
+        print(f"🗜️ Журнал сжат в базовый снимок ({replayed} записей)")
+    return corpus
+
+def publish_corpus(corpus, corrections_applied):
+    """Сохраняет текущий корпус в opencorpora.json и офлайн-версию"""
+    corpus['metadata']['last_correction'] = datetime.now().isoformat()
+    corpus['metadata']['corrections_applied'] = corrections_applied
+    corpus['metadata']['revision'] = f"corrected_{corpus['metadata']['total_words']}_{corrections_applied}"
+    # Смещение журнала остается в базовом снимке, страница и скрипты его не видят
+    published_corpus = public_corpus(corpus)
+
+    if not save_corpus(published_corpus, CORPUS_FILE):
+        return False
+    # Снимок не переписывается: запоминаются хеш опубликованного файла и смещение
+    # журнала, чтобы следующий запуск не принял публикацию за перегенерацию корпуса
+    save_published_state(BASE_SNAPSHOT, CORPUS_FILE, corpus['metadata']['journal_offset'])
+    published = [CORPUS_FILE]
+    # Также обновляем офлайн версию
+    if save_corpus(published_corpus, OFFLINE_CORPUS_FILE):
+        published.append(OFFLINE_CORPUS_FILE)
+
+    # Наборы слов упражнений должны соответствовать опубликованному корпусу
+    for corpus_file in published:
+        write_exercise_shards(published_corpus, corpus_file)
+    return True
+
+def process_errors_file(publish=True, strategy='latest'):
+    """
+    Объединяет исправления из всех файлов с ошибками (merge_corrections.py)
+    и применяет их одной записью корпуса
+    """
     print("🔧 Обработка ошибок из админ-панели...")
     
     # Ищем файлы с ошибками
-    error_files = [f for f in os.listdir('.') if f.startswith('lexicon_errors_') and f.endswith('.json')]
+    error_files = find_export_files()
     
     if not error_files:
         print("❌ Файлы с ошибками не найдены")
         print("💡 Экспортируйте ошибки из админ-панели (кнопка 'Экспорт')")
         return False
     
-    # Берем самый новый файл
-    latest_file = max(error_files, key=os.path.getctime)
-    print(f"📁 Обрабатываем файл: {latest_file}")
-    
-    # Загружаем ошибки
-    errors_data = load_errors_from_file(latest_file)
-    if not errors_data:
-        return False
-    
-    # Фильтруем только исправленные ошибки
-    corrected_errors = [
-        error for error in errors_data['errors'] 
-        if error.get('status') == 'corrected'
-    ]
+    print(f"📁 Обрабатываем файлов: {len(error_files)} (конфликты: {strategy})")
+    corrected_errors, stats = merge_exports(error_files, strategy)
+    print_merge_stats(stats)
     
     if not corrected_errors:
         print("ℹ️ Нет исправленных ошибок для применения")
-        return True
+        return not stats['failed']
     
-    print(f"📊 Найдено {len(corrected_errors)} исправленных ошибок")
+    print(f"📊 Найдено {len(corrected_errors)} исправлений после объединения")
     
-    # Загружаем корпус
-    corpus = load_corpus('opencorpora.json')
-    if not corpus:
+    # Загружаем текущий корпус
+    try:
+        corpus = load_current_corpus()
+    except Exception as e:
+        print(f"Ошибка загрузки корпуса: {e}")
         return False
     
     # Применяем исправления
     corrections_applied = apply_corrections_to_corpus(corpus, corrected_errors)
     
-    if corrections_applied > 0:
-        # Обновляем метаданные корпуса
-        corpus['metadata']['last_correction'] = datetime.now().isoformat()
-        corpus['metadata']['corrections_applied'] = corrections_applied
-        corpus['metadata']['revision'] = f"corrected_{corpus['metadata']['total_words']}_{corrections_applied}"
-        
-        # Сохраняем исправленный корпус
-        if save_corpus(corpus, 'opencorpora.json'):
-            # Также обновляем офлайн версию
-            save_corpus(corpus, 'russian_language_offline/opencorpora.json')
-            print(f"🎉 Успешно применено {corrections_applied} исправлений!")
-            return True
+    if corrections_applied == 0:
+        print("ℹ️ Все исправления уже применены")
+        return True
+
+    print(f"📝 В журнал {JOURNAL_FILE} записано {corrections_applied} исправлений")
+    if not publish or publish_corpus(corpus, corrections_applied):
+        print(f"🎉 Успешно применено {corrections_applied} исправлений!")
+        return True
     
     return False
 
 def create_backup():
-    """Создает резервную копию корпуса"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_filename = f"opencorpora_backup_{timestamp}.json"
-    
-    corpus = load_corpus('opencorpora.json')
-    if corpus and save_corpus(corpus, backup_filename):
-        print(f"💾 Создана резервная копия: {backup_filename}")
+    """Точка восстановления: текущее смещение журнала вместо копии корпуса"""
+    offset = journal_end(JOURNAL_FILE)
+    print(f"💾 Точка восстановления: смещение журнала {offset} (откат: --restore {offset})")
+    return offset
+
+def restore(offset, publish=True):
+    """Откатывает исправления после точки восстановления offset обратными записями журнала"""
+    end = journal_end(JOURNAL_FILE)
+    if not 0 <= offset <= end:
+        print(f"❌ Смещение {offset} вне журнала (0..{end})")
+        return False
+    if not is_record_start(JOURNAL_FILE, offset):
+        print(f"❌ Смещение {offset} попадает внутрь записи журнала: точка восстановления - "
+              f"смещение, напечатанное при запуске (💾 Точка восстановления)")
+        return False
+
+    records = read_records(JOURNAL_FILE, offset, end)
+    if not records:
+        print("ℹ️ После этой точки исправлений нет")
         return True
-    return False
+
+    corpus = load_current_corpus()
+    inverse = inverse_records(records, datetime.now().isoformat())
+    append_records(JOURNAL_FILE, inverse)
+    replay_records(corpus['metadata']['words'], inverse)
+    corpus['metadata']['journal_offset'] = journal_end(JOURNAL_FILE)
+    print(f"↩️ Отменено {len(records)} исправлений после смещения {offset}")
+    return not publish or publish_corpus(corpus, len(inverse))
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Применение исправлений из админ-панели через журнал')
+    parser.add_argument('--no-publish', action='store_true',
+                        help=f'только записать исправления в журнал, не обновлять {CORPUS_FILE}')
+    parser.add_argument('--restore', type=int, metavar='OFFSET', help='откатиться к точке восстановления')
+    parser.add_argument('--compact', action='store_true', help='проиграть журнал в базовый снимок')
+    parser.add_argument('--strategy', choices=STRATEGIES, default='latest',
+                        help='разрешение конфликтов: самое позднее исправление или большинство голосов')
+    args = parser.parse_args()
+    publish = not args.no_publish
+
     print("🔧 Система исправления базы данных Лексикон")
     print("=" * 50)
-    
-    # Создаем резервную копию
-    if not create_backup():
-        print("❌ Не удалось создать резервную копию")
-        exit(1)
+
+    if args.compact:
+        create_base(BASE_SNAPSHOT, CORPUS_FILE, JOURNAL_FILE)
+        replayed = compact(BASE_SNAPSHOT, JOURNAL_FILE)
+        print(f"🗜️ В базовый снимок {BASE_SNAPSHOT} проиграно {replayed} записей журнала")
+        exit(0)
+
+    if args.restore is not None:
+        exit(0 if restore(args.restore, publish) else 1)
+
+    # Запоминаем точку восстановления
+    create_backup()
     
     # Обрабатываем ошибки
-    success = process_errors_file()
+    success = process_errors_file(publish, args.strategy)
     
     if success:
         print("\n✅ Исправления успешно применены!")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк фильтра запрещенных слов
+
+Генерирует синтетический корпус и списки из 10, 100, 1000 и 5000 записей
+(половина - слова целиком, половина - подстроки) и сравнивает прежний способ
+(проверка слова по словарю и цикл по всем подстрокам для каждого слова) с
+автоматом Ахо-Корасик из blocklist_filter.py. Проверяет, что для каждого
+слова срабатывает одна и та же запись.
+"""
+
+import random
+import sys
+import time
+
+from benchmark_declension import FIXTURE_ALPHABET, FIXTURE_VOWELS
+from blocklist_filter import BlocklistFilter, exact_entries, substring_entries
+
+LIST_SIZES = [10, 100, 1000, 5000]
+
+def make_word(rnd):
+    return ''.join(rnd.choice(FIXTURE_ALPHABET) + rnd.choice(FIXTURE_VOWELS)
+                   for _ in range(rnd.randint(1, 5)))
+
+def make_blocklist(size, seed=42):
+    """Половина записей - слова целиком, половина - подстроки из 5-7 букв"""
+    rnd = random.Random(seed)
+    words = [make_word(rnd) for _ in range(size // 2)]
+    patterns = []
+    while len(patterns) < size - size // 2:
+        word = make_word(rnd)
+        if len(word) >= 5:
+            patterns.append(word[:rnd.randint(5, 7)])
+    return exact_entries(words) + substring_entries(patterns)
+
+def naive_match(words, exact_words, patterns):
+    """Прежний способ: словарь слов целиком и цикл по подстрокам"""
+    exact = {word: (word, True, None) for word in reversed(exact_words)}
+    matches = {}
+    for word in words:
+        entry = exact.get(word)
+        if entry is None:
+            lowered = word.lower()
+            for pattern in patterns:
+                if pattern in lowered:
+                    entry = (pattern, False, None)
+                    break
+        if entry is not None:
+            matches[word] = entry
+    return matches
+
+def automaton_match(words, matcher):
+    matches = {}
+    for word in words:
+        entry = matcher.match(word)
+        if entry is not None:
+            matches[word] = entry
+    return matches
+
+def run_benchmark(corpus_size=100000):
+    rnd = random.Random(7)
+    words = list(dict.fromkeys(make_word(rnd) for _ in range(corpus_size)))
+    print(f"Слов в корпусе: {len(words):,}\n")
+    print(f"  {'Записей':>8} {'цикл, мс':>10} {'компиляция, мс':>15} {'Ахо-Корасик, мс':>16} {'совпадений':>11}")
+
+    agreed = True
+    for size in LIST_SIZES:
+        entries = make_blocklist(size)
+        exact_words = [pattern for pattern, exact, category in entries if exact]
+        patterns = [pattern for pattern, exact, category in entries if not exact]
+
+        start = time.perf_counter()
+        expected = naive_match(words, exact_words, patterns)
+        naive_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher = BlocklistFilter(entries)
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = automaton_match(words, matcher)
+        automaton_time = time.perf_counter() - start
+
+        print(f"  {size:>8} {naive_time * 1000:>10.0f} {compile_time * 1000:>15.1f} "
+              f"{automaton_time * 1000:>16.0f} {len(actual):>11,}")
+
+        if expected != actual:
+            agreed = False
+            mismatches = [word for word in words if expected.get(word) != actual.get(word)]
+            for word in mismatches[:5]:
+                print(f"    ❌ {word}: было {expected.get(word)}, стало {actual.get(word)}")
+
+    if agreed:
+        print("\n✅ Результаты совпадают для всех слов")
+    return agreed
+
+if __name__ == "__main__":
+    corpus_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    if not run_benchmark(corpus_size):
+        sys.exit(1)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк загрузки корпуса и поиска слов
+
+Генерирует синтетический корпус в формате metadata.words, сохраняет его
+в JSON и .rlc и сравнивает время открытия и поиска слов: полная загрузка
+через read_corpus против CorpusReader поверх mmap.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from corpus_format import CorpusReader, read_corpus, write_corpus
+from parse_opencorpora import FEATURE_FIELDS
+
+FIXTURE_ALPHABET = 'абвгдежзиклмнопрстуфхцчшщэюя'
+
+# Типичные наборы признаков корпуса для синтетических слов
+FIXTURE_FEATURES = [
+    {'pos': 'NOUN', 'gender': 'FEMININE', 'number': 'SINGULAR', 'case': 'NOMINATIVE',
+     'declension': '1', 'animacy': 'INANIMATE'},
+    {'pos': 'NOUN', 'gender': 'MASCULINE', 'number': 'SINGULAR', 'case': 'NOMINATIVE',
+     'declension': '2', 'animacy': 'ANIMATE'},
+    {'pos': 'NOUN', 'gender': 'FEMININE', 'number': 'SINGULAR', 'case': 'NOMINATIVE',
+     'declension': '3', 'animacy': 'INANIMATE'},
+    {'pos': 'VERB', 'mood': 'INFINITIVE', 'conjugation': 'I', 'aspect': 'IMPERFECTIVE',
+     'transitivity': 'TRANSITIVE'},
+    {'pos': 'VERB', 'mood': 'INFINITIVE', 'conjugation': 'II', 'aspect': 'PERFECTIVE',
+     'transitivity': 'INTRANSITIVE'},
+    {'pos': 'ADJECTIVE', 'gender': 'MASCULINE', 'number': 'SINGULAR', 'case': 'NOMINATIVE'},
+    {'pos': 'ADVERB'},
+]
+
+def make_corpus(size, seed=42):
+    """Создает детерминированный корпус из size уникальных слов"""
+    rnd = random.Random(seed)
+    words = {}
+    while len(words) < size:
+        word = ''.join(rnd.choice(FIXTURE_ALPHABET) for _ in range(rnd.randint(3, 10)))
+        if word in words:
+            continue
+        features = dict.fromkeys(FEATURE_FIELDS)
+        features.update(rnd.choice(FIXTURE_FEATURES))
+        features['lemma'] = word
+        words[word] = features
+
+    return {
+        'metadata': {
+            'source': 'Synthetic',
+            'version': '0',
+            'revision': '0',
+            'total_words': len(words),
+            'words': words
+        }
+    }
+
+def run_benchmark(size=100000, lookups=10000):
+    corpus = make_corpus(size)
+    rnd = random.Random(1)
+    words = list(corpus['metadata']['words'])
+    queries = [rnd.choice(words) for _ in range(lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, 'corpus.json')
+        rlc_path = os.path.join(tmp_dir, 'corpus.rlc')
+        write_corpus(corpus, json_path)
+        write_corpus(corpus, rlc_path)
+        del corpus
+
+        print(f"Слов: {size:,}, запросов: {lookups:,}")
+        print(f"JSON: {os.path.getsize(json_path) / 1024:.0f} KB, "
+              f".rlc: {os.path.getsize(rlc_path) / 1024:.0f} KB\n")
+        print(f"  {'Способ':<28} {'Открытие, мс':>13} {'Поиск, мкс/слово':>17}")
+
+        for label, path in (('read_corpus(JSON)', json_path), ('read_corpus(.rlc)', rlc_path)):
+            start = time.perf_counter()
+            loaded = read_corpus(path)['metadata']['words']
+            opened = time.perf_counter() - start
+            start = time.perf_counter()
+            for word in queries:
+                loaded[word]
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<28} {opened * 1000:>13.1f} {elapsed / lookups * 1e6:>17.2f}")
+
+        start = time.perf_counter()
+        with CorpusReader(rlc_path) as reader:
+            opened = time.perf_counter() - start
+            start = time.perf_counter()
+            for word in queries:
+                reader[word]
+            elapsed = time.perf_counter() - start
+
+            # Проверяем, что mmap-поиск возвращает те же признаки
+            loaded = read_corpus(json_path)['metadata']['words']
+            for word in queries[:1000]:
+                if reader[word] != loaded[word]:
+                    print(f"❌ Расхождение для {word}")
+                    return False
+        print(f"  {'CorpusReader(.rlc, mmap)':<28} {opened * 1000:>13.1f} {elapsed / lookups * 1e6:>17.2f}")
+
+    print("\n✅ Результаты поиска совпадают")
+    return True
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    if not run_benchmark(size):
+        sys.exit(1)
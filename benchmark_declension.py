@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк определения склонения
+
+Генерирует синтетические существительные (обычные окончания, исключения,
+иностранные слова, разные рода), сравнивает прежние функции на цепочках
+endswith / проверок по спискам / регулярных выражений с declension_engine
+и проверяет, что результаты совпадают для каждого слова.
+"""
+
+import random
+import re
+import sys
+import time
+
+import declension_engine
+
+FIXTURE_ALPHABET = 'бвгджзклмнпрстфхцчшщ'
+FIXTURE_VOWELS = 'аеиоуыэюяё'
+FIXTURE_ENDINGS = ['', '', '', 'а', 'я', 'о', 'е', 'ь', 'и', 'у', 'ю', 'мя', 'ство', 'ие', 'ао', 'ооо']
+FIXTURE_GENDERS = ['MASCULINE', 'FEMININE', 'NEUTER', None]
+
+# Прежние реализации (эталон для сравнения)
+
+def determine_declension_parser_legacy(lemma, gender):
+    if gender == 'FEMININE' and lemma.endswith('ь'):
+        return '3rd'
+    elif lemma.endswith('а') or lemma.endswith('я'):
+        return '1st'
+    elif lemma.endswith('о') or lemma.endswith('е') or gender == 'NEUTER':
+        return '2nd'
+    elif lemma.endswith('мя'):
+        return 'heteroclitic'
+    elif lemma.endswith('о') and not lemma.endswith('мя'):
+        indeclinable_endings = ['кофе', 'какао', 'радио', 'метро', 'кино', 'кабаре', 'бюро', 'депо', 'фойе', 'ателье', 'кафе', 'пенсне', 'колье']
+        if lemma in indeclinable_endings:
+            return 'indeclinable'
+        return '2nd'
+    else:
+        return '1st'
+
+def determine_declension_expand_legacy(word, gender):
+    word_lower = word.lower()
+    heteroclitic_words = [
+        'время', 'имя', 'племя', 'знамя', 'пламя', 'стремя', 'темя',
+        'семя', 'бремя', 'вымя', 'племя', 'время', 'имя', 'знамя'
+    ]
+    if word_lower in heteroclitic_words:
+        return 'heteroclitic'
+    indeclinable_words = [
+        'кофе', 'пальто', 'кино', 'такси', 'метро', 'кафе', 'меню',
+        'алоэ', 'какао', 'радио', 'шоу', 'казино', 'кабаре', 'бюро',
+        'депо', 'фойе', 'ателье', 'пенсне', 'колье', 'какаду', 'кенгуру',
+        'шимпанзе', 'какао', 'радио', 'метро', 'кино', 'такси'
+    ]
+    if word_lower in indeclinable_words:
+        return 'indeclinable'
+    if word_lower.endswith('а') or word_lower.endswith('я'):
+        return '1st'
+    elif word_lower.endswith('о') or word_lower.endswith('е'):
+        return '2nd'
+    elif word_lower.endswith('ь'):
+        return '3rd'
+    else:
+        if gender == 'MASCULINE':
+            return '2nd'
+        return '1st'
+
+def determine_declension_verify_legacy(word, gender):
+    word_lower = word.lower()
+    if word_lower.endswith(('а', 'я')):
+        return '1st'
+    if word_lower.endswith('ь') and gender == 'FEMININE':
+        return '3rd'
+    heteroclitic_words = {
+        'путь', 'время', 'имя', 'племя', 'знамя', 'пламя',
+        'стремя', 'темя', 'семя', 'бремя', 'вымя'
+    }
+    if word_lower in heteroclitic_words:
+        return 'heteroclitic'
+    indeclinable_patterns = [r'[а-я]+[оеиую]$', r'[а-я]+и$', r'[а-я]+у$', r'[а-я]+ю$']
+    indeclinable_words = {
+        'кофе', 'пальто', 'кино', 'метро', 'такси', 'меню', 'кафе',
+        'ателье', 'пенсне', 'кашне', 'пари', 'реле', 'шоссе', 'алоэ',
+        'какао', 'пианино', 'радио', 'видео', 'аудио', 'фото', 'авто',
+        'мото', 'домино', 'казино', 'лото', 'бюро', 'депо', 'фойе',
+        'манто', 'боа', 'кенгуру', 'шимпанзе', 'какаду', 'фламинго',
+        'самоа', 'манчестер', 'джозеф', 'кортни', 'ник', 'пабло',
+        'ариэль', 'ольга', 'елена', 'александрия', 'минниханов'
+    }
+    if word_lower in indeclinable_words:
+        return 'indeclinable'
+    for pattern in indeclinable_patterns:
+        if re.match(pattern, word_lower):
+            return 'indeclinable'
+    if gender == 'MASCULINE' and not word_lower.endswith(('а', 'я', 'ь')):
+        return '2nd'
+    elif gender == 'NEUTER' and word_lower.endswith(('о', 'е')):
+        return '2nd'
+    return '2nd'
+
+def determine_declension_check_legacy(word, gender):
+    if word.endswith(('а', 'я')):
+        if gender in ['MASCULINE', 'FEMININE']:
+            return '1st'
+    elif word.endswith(('о', 'е')):
+        if gender == 'NEUTER':
+            return '2nd'
+    elif not word.endswith(('а', 'я', 'ь')):
+        if gender == 'MASCULINE':
+            return '2nd'
+    elif word.endswith('ь'):
+        if gender == 'FEMININE':
+            return '3rd'
+    heteroclitic_words = {
+        'путь', 'время', 'имя', 'племя', 'знамя', 'пламя', 'бремя', 'стремя', 'темя', 'семя'
+    }
+    if word in heteroclitic_words:
+        return 'heteroclitic'
+    indeclinable_words = set(declension_engine.CHECK_INDECLINABLE_WORDS)
+    indeclinable_patterns = ['ооо', 'ао', 'нло', 'вконтакте']
+    for pattern in indeclinable_patterns:
+        if pattern in word.lower():
+            return 'indeclinable'
+    if word in indeclinable_words:
+        return 'indeclinable'
+    if word.istitle() and len(word) > 2:
+        if word.lower() in declension_engine.CHECK_FOREIGN_NAMES:
+            return 'indeclinable'
+    return None
+
+PROFILES = [
+    ('parse_opencorpora', determine_declension_parser_legacy, declension_engine.PARSER_DECLENSION),
+    ('expand_corpus', determine_declension_expand_legacy, declension_engine.EXPAND_DECLENSION),
+    ('verify_corpus', determine_declension_verify_legacy, declension_engine.VERIFY_DECLENSION),
+    ('comprehensive_check', determine_declension_check_legacy, declension_engine.CHECK_DECLENSION),
+]
+
+def make_nouns(count, seed=42):
+    """Детерминированный список пар (существительное, род)"""
+    rnd = random.Random(seed)
+    exceptions = sorted(set(declension_engine.CHECK_INDECLINABLE_WORDS) |
+                        set(declension_engine.VERIFY_INDECLINABLE_WORDS) |
+                        set(declension_engine.VERIFY_HETEROCLITIC_WORDS) |
+                        declension_engine.CHECK_FOREIGN_NAMES)
+    nouns = []
+    for _ in range(count):
+        if rnd.random() < 0.05:
+            word = rnd.choice(exceptions)
+        else:
+            word = ''.join(rnd.choice(FIXTURE_ALPHABET) + rnd.choice(FIXTURE_VOWELS)
+                           for _ in range(rnd.randint(1, 4))) + rnd.choice(FIXTURE_ENDINGS)
+        if rnd.random() < 0.02:
+            word = word.capitalize()
+        nouns.append((word, rnd.choice(FIXTURE_GENDERS)))
+    return nouns
+
+def run_benchmark(count=500000):
+    nouns = make_nouns(count)
+    print(f"Существительных: {len(nouns):,}\n")
+    print(f"  {'Правила':<22} {'Прежние, мс':>12} {'Дерево, мс':>11} {'Ускорение':>10}")
+
+    agreed = True
+    for label, legacy, engine in PROFILES:
+        # Прежние функции expand/verify приводят слово к нижнему регистру сами
+        lowercase = legacy in (determine_declension_expand_legacy, determine_declension_verify_legacy)
+
+        start = time.perf_counter()
+        expected = [legacy(word, gender) for word, gender in nouns]
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if lowercase:
+            actual = engine.classify_many((word.lower(), gender) for word, gender in nouns)
+        else:
+            actual = engine.classify_many(nouns)
+        engine_time = time.perf_counter() - start
+
+        print(f"  {label:<22} {legacy_time * 1000:>12.0f} {engine_time * 1000:>11.0f} "
+              f"{legacy_time / engine_time:>9.1f}x")
+
+        mismatches = [(noun, e, a) for noun, e, a in zip(nouns, expected, actual) if e != a]
+        if mismatches:
+            agreed = False
+            for (word, gender), e, a in mismatches[:5]:
+                print(f"    ❌ {word} ({gender}): было {e}, стало {a}")
+
+    if agreed:
+        print("\n✅ Результаты совпадают для всех слов")
+    return agreed
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    if not run_benchmark(count):
+        sys.exit(1)
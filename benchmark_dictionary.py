@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк пропускной способности parse_opencorpora_dict.py
+
+Генерирует синтетический словарь в формате dict.opcorpora.xml с заданным
+числом лемм, прогоняет потоковый парсер и печатает леммы/с, формы/с и
+пиковое потребление памяти. Память должна оставаться почти одинаковой
+при росте числа лемм.
+"""
+
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# Парадигмы синтетического словаря: граммемы леммы, окончание леммы, формы (окончание, граммемы)
+FIXTURE_PARADIGMS = [
+    (['NOUN', 'inan', 'femn'], 'а', [
+        ('а', ['sing', 'nomn']), ('ы', ['sing', 'gent']), ('е', ['sing', 'datv']),
+        ('у', ['sing', 'accs']), ('ой', ['sing', 'ablt']), ('е', ['sing', 'loct']),
+        ('ы', ['plur', 'nomn']), ('', ['plur', 'gent']), ('ам', ['plur', 'datv']),
+        ('ы', ['plur', 'accs']), ('ами', ['plur', 'ablt']), ('ах', ['plur', 'loct'])]),
+    (['NOUN', 'anim', 'masc'], '', [
+        ('', ['sing', 'nomn']), ('а', ['sing', 'gent']), ('у', ['sing', 'datv']),
+        ('а', ['sing', 'accs']), ('ом', ['sing', 'ablt']), ('е', ['sing', 'loct']),
+        ('ы', ['plur', 'nomn']), ('ов', ['plur', 'gent']), ('ам', ['plur', 'datv']),
+        ('ов', ['plur', 'accs']), ('ами', ['plur', 'ablt']), ('ах', ['plur', 'loct'])]),
+    (['VERB', 'impf', 'tran'], 'ать', [
+        ('ать', ['INFN']), ('аю', ['sing', '1per', 'pres', 'indc']),
+        ('аешь', ['sing', '2per', 'pres', 'indc']), ('ает', ['sing', '3per', 'pres', 'indc']),
+        ('аем', ['plur', '1per', 'pres', 'indc']), ('аете', ['plur', '2per', 'pres', 'indc']),
+        ('ают', ['plur', '3per', 'pres', 'indc']), ('ал', ['masc', 'sing', 'past', 'indc']),
+        ('ала', ['femn', 'sing', 'past', 'indc']), ('али', ['plur', 'past', 'indc']),
+        ('ай', ['sing', 'impr', 'excl']), ('айте', ['plur', 'impr', 'excl'])]),
+    (['ADJF', 'Qual'], 'ый', [
+        ('ый', ['masc', 'sing', 'nomn']), ('ого', ['masc', 'sing', 'gent']),
+        ('ая', ['femn', 'sing', 'nomn']), ('ой', ['femn', 'sing', 'gent']),
+        ('ое', ['neut', 'sing', 'nomn']), ('ые', ['plur', 'nomn'])]),
+    (['ADVB'], 'о', [('о', [])]),
+]
+
+FIXTURE_ALPHABET = 'бвгдзклмнпрстфхчшщ'
+FIXTURE_VOWELS = 'аеиоуя'
+
+def write_dictionary_fixture(path, lemmas, seed=42):
+    """Записывает детерминированный словарь в формате dict.opcorpora.xml"""
+    rnd = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="utf-8" standalone="yes"?>\n')
+        f.write('<dictionary version="0.92" revision="417150">\n')
+        f.write('<grammemes><grammeme parent="">POST</grammeme></grammemes>\n<lemmata>\n')
+        for lemma_id in range(1, lemmas + 1):
+            lemma_grammemes, lemma_ending, forms = rnd.choice(FIXTURE_PARADIGMS)
+            stem = ''.join(rnd.choice(FIXTURE_ALPHABET) + rnd.choice(FIXTURE_VOWELS)
+                           for _ in range(rnd.randint(1, 4))) + rnd.choice(FIXTURE_ALPHABET)
+            l = ''.join(f'<g v="{g}"/>' for g in lemma_grammemes)
+            f.write(f'<lemma id="{lemma_id}" rev="{lemma_id}"><l t="{stem + lemma_ending}">{l}</l>')
+            for ending, form_grammemes in forms:
+                g = ''.join(f'<g v="{v}"/>' for v in form_grammemes)
+                f.write(f'<f t="{stem + ending}">{g}</f>')
+            f.write('</lemma>\n')
+        f.write('</lemmata>\n<links>\n')
+        for link_id in range(1, lemmas // 10 + 1):
+            f.write(f'<link id="{link_id}" from="{link_id}" to="{link_id + 1}" type="1"/>\n')
+        f.write('</links>\n</dictionary>\n')
+
+def run_parser(fixture_path, index_path, words_path):
+    """Запускает парсер в отдельном процессе, чтобы честно измерить пиковую память"""
+    code = (
+        'import io, contextlib, resource, sys, time\n'
+        'import parse_opencorpora_dict\n'
+        'start = time.perf_counter()\n'
+        'with contextlib.redirect_stdout(io.StringIO()):\n'
+        '    stats = parse_opencorpora_dict.parse_opencorpora_dict(sys.argv[1], sys.argv[2], sys.argv[3])\n'
+        'elapsed = time.perf_counter() - start\n'
+        'rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n'
+        'print(stats["lemmas"], stats["forms"], elapsed, rss)\n'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code, fixture_path, index_path, words_path],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    )
+    lemmas, forms, elapsed, rss = result.stdout.split()
+    return int(lemmas), int(forms), float(elapsed), int(rss)
+
+def run_benchmark(sizes):
+    print(f"{'Лемм':>10} {'XML, MB':>9} {'Время, с':>9} {'Лемм/с':>10} {'Форм/с':>11} {'Пик RSS, MB':>12}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            fixture_path = os.path.join(tmp_dir, f'dict.{size}.xml')
+            write_dictionary_fixture(fixture_path, size)
+            xml_size = os.path.getsize(fixture_path) / (1024 * 1024)
+
+            lemmas, forms, elapsed, rss = run_parser(
+                fixture_path,
+                os.path.join(tmp_dir, 'index.jsonl'),
+                os.path.join(tmp_dir, 'words.json')
+            )
+            # ru_maxrss в Linux измеряется в килобайтах, в macOS - в байтах
+            rss_mb = rss / 1024 if sys.platform != 'darwin' else rss / (1024 * 1024)
+            print(f"{lemmas:>10,} {xml_size:>9.1f} {elapsed:>9.2f} {lemmas / elapsed:>10,.0f} "
+                  f"{forms / elapsed:>11,.0f} {rss_mb:>12.1f}")
+            os.remove(fixture_path)
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 50000, 200000]
+    run_benchmark(sizes)
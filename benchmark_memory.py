@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк памяти: словари признаков против WordFeatures
+
+Для синтетических корпусов разного размера загружает metadata.words из JSON
+(как это делают скрипты исправления) и измеряет через tracemalloc, сколько
+памяти занимают слова в виде словарей и после преобразования в WordFeatures.
+"""
+
+import gc
+import json
+import sys
+import tracemalloc
+
+from benchmark_corpus import make_corpus
+from word_features import compact_words
+
+def measure_words(text, compact):
+    """Возвращает объем памяти (в байтах), удерживаемой загруженными словами"""
+    gc.collect()
+    tracemalloc.start()
+    words = json.loads(text)
+    if compact:
+        compact_words(words)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del words
+    return current
+
+def run_benchmark(sizes):
+    print(f"{'Слов':>10} {'dict, MB':>10} {'WordFeatures, MB':>17} {'Байт/слово':>19} {'Экономия':>9}")
+    for size in sizes:
+        text = json.dumps(make_corpus(size)['metadata']['words'], ensure_ascii=False)
+        as_dict = measure_words(text, compact=False)
+        as_slots = measure_words(text, compact=True)
+        print(f"{size:>10,} {as_dict / 2**20:>10.1f} {as_slots / 2**20:>17.1f} "
+              f"{as_dict / size:>9.0f} → {as_slots / size:<7.0f} {1 - as_slots / as_dict:>8.0%}")
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [5000, 50000, 500000]
+    run_benchmark(sizes)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Микро-бенчмарк декодера граммем parse_opencorpora.py
+
+Генерирует фиксированный XML в формате annot.opcorpora.xml (одинаковый при
+каждом запуске) и сравнивает скорость старой цепочки if/elif с табличным
+декодером в токенах в секунду. Заодно проверяет, что результаты совпадают.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import quoteattr
+
+import parse_opencorpora
+
+# Типичные наборы граммем OpenCorpora для генерации токенов
+FIXTURE_GRAMMEMES = [
+    ['NOUN', 'inan', 'femn', 'sing', 'nomn'],
+    ['NOUN', 'anim', 'masc', 'sing', 'nomn'],
+    ['NOUN', 'inan', 'neut', 'plur', 'gent'],
+    ['NOUN', 'inan', 'masc', 'sing', 'loc2'],
+    ['NOUN', 'inan', 'femn', 'sing', 'ablt'],
+    ['INFN', 'perf', 'tran'],
+    ['INFN', 'impf', 'intr'],
+    ['VERB', 'impf', 'tran', 'sing', '3per', 'pres', 'indc'],
+    ['VERB', 'perf', 'intr', 'plur', 'past', 'indc'],
+    ['VERB', 'impf', 'tran', 'sing', 'impr', 'excl'],
+    ['ADJF', 'Qual', 'masc', 'sing', 'nomn'],
+    ['ADJS', 'femn', 'sing'],
+    ['COMP', 'Qual'],
+    ['ADVB'],
+    ['CONJ'],
+    ['NPRO', 'masc', 'sing', 'datv'],
+    ['NUMR', 'accs'],
+    ['PREP'],
+    ['PRCL'],
+    ['PNCT'],
+]
+
+FIXTURE_ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+FIXTURE_ENDINGS = ['а', 'я', 'о', 'е', 'ь', 'ть', 'ить', 'ать', 'ый', 'ой', 'ом', 'ет', 'ит', '']
+
+def write_annotation_fixture(path, texts=200, seed=42, vocabulary=5000):
+    """Записывает детерминированный XML в формате annot.opcorpora.xml"""
+    rnd = random.Random(seed)
+    lexicon = []
+    for _ in range(vocabulary):
+        stem = ''.join(rnd.choice(FIXTURE_ALPHABET) for _ in range(rnd.randint(2, 8)))
+        lexicon.append((stem + rnd.choice(FIXTURE_ENDINGS), rnd.choice(FIXTURE_GRAMMEMES)))
+
+    token_id = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        f.write('<annotation version="0.12" revision="1000000">\n')
+        for text_id in range(texts):
+            f.write(f'<text id="{text_id}" parent="0" name="fixture {text_id}"><tags></tags><paragraphs>\n')
+            for paragraph_id in range(3):
+                f.write(f'<paragraph id="{paragraph_id}">')
+                for sentence_id in range(5):
+                    f.write(f'<sentence id="{sentence_id}"><source></source><tokens>')
+                    for _ in range(12):
+                        token_id += 1
+                        word, grammemes = rnd.choice(lexicon)
+                        g = ''.join(f'<g v="{v}"/>' for v in grammemes)
+                        text = quoteattr(word.capitalize() if rnd.random() < 0.2 else word)
+                        f.write(f'<token id="{token_id}" text={text}><tfr rev_id="1" t={text}>'
+                                f'<v><l id="{token_id}" t={quoteattr(word)}>{g}</l></v></tfr></token>')
+                    f.write('</tokens></sentence>')
+                f.write('</paragraph>\n')
+            f.write('</paragraphs></text>\n')
+        f.write('</annotation>\n')
+
+def extract_morphological_features_legacy(lemma_element):
+    """Прежняя реализация на цепочке if/elif (эталон для сравнения)"""
+    features = {
+        'lemma': lemma_element.get('t', ''),
+        'pos': None,
+        'gender': None,
+        'number': None,
+        'case': None,
+        'declension': None,
+        'conjugation': None,
+        'aspect': None,
+        'transitivity': None,
+        'mood': None,
+        'tense': None,
+        'person': None,
+        'animacy': None,
+        'degree': None
+    }
+
+    grammemes = []
+    for g in lemma_element.findall('g'):
+        grammemes.append(g.get('v', ''))
+
+    for grammeme in grammemes:
+        if grammeme == 'NOUN':
+            features['pos'] = 'NOUN'
+        elif grammeme == 'VERB':
+            features['pos'] = 'VERB'
+        elif grammeme == 'INFN':
+            features['pos'] = 'VERB'
+            features['mood'] = 'INFINITIVE'
+        elif grammeme == 'ADJF':
+            features['pos'] = 'ADJECTIVE'
+        elif grammeme == 'ADJS':
+            features['pos'] = 'ADJECTIVE'
+            features['degree'] = 'SHORT'
+        elif grammeme == 'COMP':
+            features['pos'] = 'ADJECTIVE'
+            features['degree'] = 'COMPARATIVE'
+        elif grammeme == 'ADVB':
+            features['pos'] = 'ADVERB'
+        elif grammeme == 'CONJ':
+            features['pos'] = 'CONJUNCTION'
+        elif grammeme == 'PRCL':
+            features['pos'] = 'PARTICLE'
+        elif grammeme == 'PREP':
+            features['pos'] = 'PREPOSITION'
+        elif grammeme == 'NPRO':
+            features['pos'] = 'PRONOUN'
+        elif grammeme == 'NUMR':
+            features['pos'] = 'NUMERAL'
+        elif grammeme == 'INTJ':
+            features['pos'] = 'INTERJECTION'
+        elif grammeme == 'masc':
+            features['gender'] = 'MASCULINE'
+        elif grammeme == 'femn':
+            features['gender'] = 'FEMININE'
+        elif grammeme == 'neut':
+            features['gender'] = 'NEUTER'
+        elif grammeme == 'sing':
+            features['number'] = 'SINGULAR'
+        elif grammeme == 'plur':
+            features['number'] = 'PLURAL'
+        elif grammeme == 'nomn':
+            features['case'] = 'NOMINATIVE'
+        elif grammeme == 'gent':
+            features['case'] = 'GENITIVE'
+        elif grammeme == 'datv':
+            features['case'] = 'DATIVE'
+        elif grammeme == 'accs':
+            features['case'] = 'ACCUSATIVE'
+        elif grammeme == 'ablt':
+            features['case'] = 'INSTRUMENTAL'
+        elif grammeme in ['loct', 'loc1', 'loc2']:
+            features['case'] = 'PREPOSITIONAL'
+        elif grammeme == 'anim':
+            features['animacy'] = 'ANIMATE'
+        elif grammeme == 'inan':
+            features['animacy'] = 'INANIMATE'
+        elif grammeme == 'perf':
+            features['aspect'] = 'PERFECTIVE'
+        elif grammeme == 'impf':
+            features['aspect'] = 'IMPERFECTIVE'
+        elif grammeme == 'tran':
+            features['transitivity'] = 'TRANSITIVE'
+        elif grammeme == 'intr':
+            features['transitivity'] = 'INTRANSITIVE'
+        elif grammeme == 'indc':
+            features['mood'] = 'INDICATIVE'
+        elif grammeme == 'impr':
+            features['mood'] = 'IMPERATIVE'
+        elif grammeme == 'pres':
+            features['tense'] = 'PRESENT'
+        elif grammeme == 'past':
+            features['tense'] = 'PAST'
+        elif grammeme == 'futr':
+            features['tense'] = 'FUTURE'
+        elif grammeme == '1per':
+            features['person'] = '1'
+        elif grammeme == '2per':
+            features['person'] = '2'
+        elif grammeme == '3per':
+            features['person'] = '3'
+
+    if features['pos'] == 'NOUN' and features['case'] == 'NOMINATIVE' and features['number'] == 'SINGULAR':
+        features['declension'] = parse_opencorpora.determine_declension(features['lemma'], features['gender'])
+
+    if features['pos'] == 'VERB' and features['mood'] == 'INFINITIVE':
+        features['conjugation'] = parse_opencorpora.determine_conjugation(features['lemma'])
+
+    return features
+
+def measure(label, decode, lemmas, repeat):
+    """Запускает декодер по всем леммам и печатает скорость"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for lemma in lemmas:
+            decode(lemma)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    rate = len(lemmas) / best
+    print(f"  {label:<20} {best * 1000:8.1f} мс   {rate:12,.0f} токенов/с")
+    return rate
+
+def run_benchmark(texts=200, repeat=5):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fixture_path = os.path.join(tmp_dir, 'annot.fixture.xml')
+        write_annotation_fixture(fixture_path, texts=texts)
+        print(f"Фикстура: {os.path.getsize(fixture_path) / (1024 * 1024):.1f} MB")
+        lemmas = ET.parse(fixture_path).getroot().findall('.//token/tfr/v/l')
+
+    print(f"Токенов: {len(lemmas)}")
+
+    # Проверяем, что оба декодера дают одинаковый результат
+    for lemma in lemmas:
+        if parse_opencorpora.extract_morphological_features(lemma) != extract_morphological_features_legacy(lemma):
+            print(f"❌ Расхождение для {lemma.get('t')}")
+            return False
+    print("✅ Результаты декодеров совпадают")
+
+    print("\nСкорость декодирования (лучшее из {} запусков):".format(repeat))
+    before = measure('if/elif (до)', extract_morphological_features_legacy, lemmas, repeat)
+    after = measure('таблица (после)', parse_opencorpora.extract_morphological_features, lemmas, repeat)
+    print(f"\nУскорение: {after / before:.1f}x")
+    return True
+
+if __name__ == "__main__":
+    texts = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    if not run_benchmark(texts):
+        sys.exit(1)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Нагрузочный тест локального сервера приложения
+
+Запускает serve_app.py (и для сравнения python3 -m http.server) в отдельном
+процессе и имитирует класс: N клиентов одновременно открывают страницу -
+загружают манифест, наборы слов упражнения «склонение» и корпус (как
+index.html) - и повторяют это в течение нескольких секунд. Сценарии:
+    первая загрузка - без кэша и без сжатия;
+    gzip            - Accept-Encoding: gzip (заранее сжатые .gz);
+    повторная       - If-None-Match с ETag прошлой загрузки (ответы 304).
+Печатает запросов в секунду, МБ/с и задержку (медиана, 95-й процентиль).
+
+Использование:
+    python3 benchmark_server.py                  # 1, 10 и 50 клиентов
+    python3 benchmark_server.py 30 100 --seconds 5 --directory russian_language_offline
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(command, port):
+    """Запускает сервер и ждет, пока он начнет принимать соединения"""
+    process = subprocess.Popen(command, cwd=SCRIPT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"Сервер не запустился: {' '.join(command)}")
+
+def page_files(directory):
+    """Файлы, которые index.html загружает для первого упражнения"""
+    with open(os.path.join(directory, 'opencorpora.manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    return ['opencorpora.manifest.json'] + manifest['exercises']['declension']['shards'] + [manifest['corpus']]
+
+def run_client(port, files, scenario, stop_at, results):
+    """Один ученик: загрузки страницы по одному соединению до stop_at"""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    etags = {}
+    latencies = []
+    received = 0
+    errors = 0
+
+    while time.perf_counter() < stop_at:
+        for name in files:
+            headers = {}
+            if scenario == 'gzip':
+                headers['Accept-Encoding'] = 'gzip'
+            elif scenario == 'revalidate' and name in etags:
+                headers['If-None-Match'] = etags[name]
+
+            start = time.perf_counter()
+            try:
+                connection.request('GET', '/' + name, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            received += len(body)
+            if response.status not in (200, 304):
+                errors += 1
+            if response.getheader('ETag'):
+                etags[name] = response.getheader('ETag')
+
+    connection.close()
+    results.append((latencies, received, errors))
+
+def run_load(port, files, scenario, clients, seconds):
+    results = []
+    stop_at = time.perf_counter() + seconds
+    threads = [threading.Thread(target=run_client, args=(port, files, scenario, stop_at, results))
+               for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for client_latencies, _, _ in results for latency in client_latencies)
+    received = sum(client_received for _, client_received, _ in results)
+    errors = sum(client_errors for _, _, client_errors in results)
+    if not latencies:
+        return 0, 0, 0, 0, errors
+    return (len(latencies) / elapsed, received / elapsed / 1024 / 1024,
+            latencies[len(latencies) // 2] * 1000, latencies[int(len(latencies) * 0.95)] * 1000, errors)
+
+def run_benchmark(client_counts, seconds, directory):
+    files = page_files(directory)
+    print(f"Загрузка страницы: {len(files)} запросов ({', '.join(files[:2])}, ..., {files[-1]})\n")
+    print(f"  {'Сервер':<12} {'Сценарий':<16} {'Клиентов':>8} {'запросов/с':>11} {'МБ/с':>8} "
+          f"{'медиана, мс':>12} {'p95, мс':>9} {'ошибок':>7}")
+
+    servers = [
+        ('http.server', [sys.executable, '-m', 'http.server', '{port}', '--bind', '127.0.0.1',
+                         '--directory', directory], ['full']),
+        ('serve_app', [sys.executable, 'serve_app.py', '--port', '{port}', '--bind', '127.0.0.1',
+                       '--directory', directory, '--quiet'], ['full', 'gzip', 'revalidate']),
+    ]
+    names = {'full': 'первая загрузка', 'gzip': 'gzip', 'revalidate': 'повторная (304)'}
+
+    for server_name, command, scenarios in servers:
+        port = free_port()
+        process = start_server([part.format(port=port) for part in command], port)
+        try:
+            for scenario in scenarios:
+                for clients in client_counts:
+                    rate, throughput, median, p95, errors = run_load(port, files, scenario, clients, seconds)
+                    print(f"  {server_name:<12} {names[scenario]:<16} {clients:>8} {rate:>11,.0f} "
+                          f"{throughput:>8.1f} {median:>12.2f} {p95:>9.2f} {errors:>7}")
+        finally:
+            process.terminate()
+            process.wait()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Нагрузочный тест сервера приложения')
+    parser.add_argument('clients', nargs='*', type=int, default=[1, 10, 50], help='число одновременных клиентов')
+    parser.add_argument('--seconds', type=float, default=3, help='длительность каждого замера')
+    parser.add_argument('--directory', default=SCRIPT_DIR, help='каталог приложения')
+    args = parser.parse_args()
+
+    run_benchmark(args.clients, args.seconds, os.path.abspath(args.directory))
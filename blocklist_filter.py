@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Фильтр слов по списку запрещенных слов и подстрок (алгоритм Ахо-Корасик)
+
+Слова целиком и подстроки списка компилируются в один автомат Ахо-Корасик,
+поэтому каждое слово проверяется одним проходом по его буквам, сколько бы
+записей ни было в списке (прежде - цикл по всем подстрокам для каждого слова).
+Фильтр сообщает, какая запись списка сработала.
+
+Запись списка - кортеж (образец, целиком, категория):
+    целиком=True  - слово должно совпасть с образцом (с учетом регистра, как ключ корпуса);
+    целиком=False - образец ищется как подстрока в слове в нижнем регистре.
+
+Формат файла списка (UTF-8, по записи в строке):
+    # комментарий
+    [категория]     - необязательный заголовок, относится к следующим записям
+    слово           - слово целиком
+    *подстрока*     - подстрока
+"""
+
+from collections import deque
+
+def exact_entries(words, category=None):
+    """Записи для слов, которые должны совпасть целиком"""
+    return [(word, True, category) for word in words]
+
+def substring_entries(patterns, category=None):
+    """Записи для подстрок"""
+    return [(pattern, False, category) for pattern in patterns]
+
+def parse_blocklist(lines):
+    """Записи списка из строк файла"""
+    entries = []
+    category = None
+    for line in lines:
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith('[') and line.endswith(']'):
+            category = line[1:-1].strip() or None
+        elif len(line) > 2 and line.startswith('*') and line.endswith('*'):
+            entries.append((line[1:-1], False, category))
+        else:
+            entries.append((line, True, category))
+    return entries
+
+def load_blocklist(path):
+    """Загружает список запрещенных слов и подстрок из файла"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_blocklist(f)
+
+class AhoCorasick:
+    """
+    Автомат Ахо-Корасик для набора строк.
+
+    goto[state] - переходы по буквам, fail[state] - суффиксная ссылка,
+    delta[state] - переходы вместе с унаследованными по суффиксным ссылкам,
+    output[state] - номера строк, которые оканчиваются в этом состоянии
+    (вместе со строками по цепочке суффиксных ссылок).
+    """
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        output = [[]]
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = self.goto[state][char] = len(self.goto)
+                    self.goto.append({})
+                    output.append([])
+                state = next_state
+            output[state].append(index)
+
+        # Суффиксные ссылки строятся обходом в ширину: ссылка ведет в более
+        # мелкое состояние, поэтому его выход уже дополнен к моменту обработки
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                output[next_state].extend(output[self.fail[next_state]])
+        self.output = [tuple(indices) for indices in output]
+
+        # Полная таблица переходов: переходы состояния дополнены переходами
+        # его суффиксной ссылки, поэтому при поиске откатываться не нужно.
+        # Переходы в корень не хранятся (get(char, 0))
+        self.delta = [None] * len(self.goto)
+        self.delta[0] = self.goto[0]
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            queue.extend(self.goto[state].values())
+            self.delta[state] = {**self.delta[self.fail[state]], **self.goto[state]}
+
+    def find_all(self, text):
+        """Пары (позиция конца + 1, номер строки) для всех вхождений строк в text"""
+        delta, output = self.delta, self.output
+        state = 0
+        for position, char in enumerate(text, 1):
+            state = delta[state].get(char, 0)
+            for index in output[state]:
+                yield position, index
+
+class BlocklistFilter:
+    """
+    Скомпилированный список запрещенных записей.
+
+    match(word) возвращает сработавшую запись или None. Если срабатывает
+    несколько записей, побеждает слово целиком, затем подстрока, которая
+    стоит в списке раньше (так же, как в прежних циклах по спискам).
+    """
+
+    def __init__(self, entries):
+        # Сначала слова целиком, затем подстроки: номер записи - ее приоритет
+        self.entries = [entry for entry in entries if entry[1]] + [entry for entry in entries if not entry[1]]
+
+        # Одинаковые образцы (например, слово и подстрока 'секс') - одна строка автомата
+        patterns = {}
+        for number, (pattern, exact, category) in enumerate(self.entries):
+            patterns.setdefault(pattern.lower(), []).append(number)
+        self.automaton = AhoCorasick(list(patterns))
+        self.pattern_entries = [tuple(numbers) for numbers in patterns.values()]
+
+    def match(self, word):
+        delta, output = self.automaton.delta, self.automaton.output
+        entries, pattern_entries = self.entries, self.pattern_entries
+
+        best = None
+        state = 0
+        for char in word.lower():
+            state = delta[state].get(char, 0)
+            for index in output[state]:
+                for number in pattern_entries[index]:
+                    if best is not None and number >= best:
+                        break
+                    pattern, exact, category = entries[number]
+                    if not exact or word == pattern:
+                        best = number
+                        break
+
+        return None if best is None else entries[best]
+
+    def match_all(self, word):
+        """Номера всех сработавших записей в self.entries, по приоритету"""
+        delta, output = self.automaton.delta, self.automaton.output
+        entries, pattern_entries = self.entries, self.pattern_entries
+
+        numbers = set()
+        state = 0
+        for char in word.lower():
+            state = delta[state].get(char, 0)
+            for index in output[state]:
+                for number in pattern_entries[index]:
+                    pattern, exact, category = entries[number]
+                    if not exact or word == pattern:
+                        numbers.add(number)
+        return sorted(numbers)
+
+    def exact_words(self):
+        """Слова списка, которые должны совпасть целиком"""
+        return [pattern for pattern, exact, category in self.entries if exact]
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Определение спряжения глаголов по обратному суффиксному дереву
+
+Окончания инфинитивов и личных форм, списки исключений и условия по
+наклонению (INFINITIVE, INDICATIVE, IMPERATIVE) задаются таблицами и
+компилируются в SuffixRuleEngine (suffix_rules.py): слово классифицируется
+за один проход по окончанию, а не перебором списков окончаний.
+
+Таблицы повторяют правила прежних реализаций, поэтому результаты совпадают:
+    BASIC_CONJUGATION      - fix_conjugations.py
+    FORMS_CONJUGATION      - fix_conjugations_advanced.py (по формам глагола)
+    FORMS_DEFAULT          - fix_conjugations_advanced.py, если спряжение не определено
+    CORRECT_CONJUGATION    - fix_conjugations_correct.py
+    FINAL_CONJUGATION      - fix_conjugations_final.py
+    INFINITIVE_DEFAULT     - fix_conjugations_correct/final.py, если спряжение не определено
+    CHECK_CONJUGATION      - comprehensive_corpus_check (проверка спряжений)
+    EXPAND_CONJUGATION     - expand_corpus.determine_conjugation_correct
+    PARSER_CONJUGATION     - parse_opencorpora.determine_conjugation
+
+Пакетная классификация: ENGINE.classify_many([(слово, наклонение), ...])
+или classify_verbs(words) для словаря metadata.words.
+"""
+
+from suffix_rules import SuffixRuleEngine, suffix_rule, word_rule
+
+INFINITIVE = frozenset({'INFINITIVE'})
+INDICATIVE = frozenset({'INDICATIVE'})
+IMPERATIVE = frozenset({'IMPERATIVE'})
+
+# 1-е спряжение: инфинитивы на -ать, -ять, -ыть, -уть, -оть, -ти, -чь
+FIRST_INFINITIVE_ENDINGS = ['ать', 'ять', 'ыть', 'уть', 'оть', 'ти', 'чь']
+
+# Исключения из -ить, которые спрягаются по 1-му спряжению
+FIRST_ITE_EXCEPTIONS = ['брить', 'стелить', 'стлать', 'зиждиться']
+
+# Исключения из -ать, -еть, которые спрягаются по 2-му спряжению
+SECOND_EXCEPTIONS = [
+    'слышать', 'дышать', 'держать', 'гнать', 'терпеть', 'вертеть',
+    'обидеть', 'зависеть', 'ненавидеть', 'видеть', 'смотреть'
+]
+
+# Разноспрягаемые глаголы
+HETEROCLITIC_VERBS = ['есть', 'дать', 'хотеть', 'бежать', 'брезжить']
+
+# Ударные окончания 3-го лица: Е(Ё), У, Ю - 1-е спряжение, И, А, Я - 2-е
+FIRST_STRESSED_ENDINGS = ['ет', 'ёт', 'ут', 'ют']
+SECOND_STRESSED_ENDINGS = ['ит', 'ат', 'ят']
+
+# Окончания личных форм
+FIRST_FORM_ENDINGS = ['ет', 'ёт', 'ут', 'ют', 'ешь', 'ёшь', 'ете', 'ёте', 'ем', 'ём']
+SECOND_FORM_ENDINGS = ['ит', 'ат', 'ят', 'ишь', 'ите', 'им']
+FIRST_REFLEXIVE_ENDINGS = ['ется', 'ётся', 'утся', 'ются', 'ешься', 'ёшься', 'етесь', 'ётесь', 'емся', 'ёмся']
+SECOND_REFLEXIVE_ENDINGS = ['ится', 'атся', 'ятся', 'ишься', 'итесь', 'имся']
+
+# Повелительное наклонение: -и/-ите - 2-е спряжение, -й/-йте - 1-е
+SECOND_IMPERATIVE_ENDINGS = ['и', 'ите']
+FIRST_IMPERATIVE_ENDINGS = ['й', 'йте']
+
+def has_vy_prefix(word):
+    """Приставка вы- (корень проверяется по окончанию слова)"""
+    return word.startswith('вы') and len(word) > 3
+
+# fix_conjugations.py: по окончанию инфинитива
+BASIC_CONJUGATION = SuffixRuleEngine(
+    word_rule(['брить', 'стелить'], '1st') +
+    suffix_rule('ить', '2nd') +
+    word_rule(['дышать', 'слышать', 'держать', 'гнать', 'терпеть', 'обидеть', 'зависеть',
+               'ненавидеть', 'видеть', 'вертеть', 'смотреть'], '2nd') +
+    suffix_rule(['ать', 'ять', 'еть', 'уть', 'оть'], '1st') +
+    # Глаголы на -чь и возвратные на -чься
+    suffix_rule(['чь', 'чься'], '1st')
+)
+
+# fix_conjugations_advanced.py: по формам глагола с учетом наклонения
+FORMS_CONJUGATION = SuffixRuleEngine(
+    suffix_rule('ить', '2nd', INFINITIVE) +
+    word_rule(['дышать', 'слышать', 'держать', 'гнать', 'терпеть', 'обидеть',
+               'зависеть', 'ненавидеть', 'видеть', 'вертеть'], '2nd', INFINITIVE) +
+    suffix_rule(['ать', 'ять', 'еть', 'уть', 'оть'], '1st', INFINITIVE) +
+    suffix_rule('чь', '1st', INFINITIVE) +
+    # Формы настоящего времени (изъявительное наклонение)
+    suffix_rule(SECOND_FORM_ENDINGS + SECOND_REFLEXIVE_ENDINGS, '2nd', INDICATIVE) +
+    suffix_rule(FIRST_FORM_ENDINGS + FIRST_REFLEXIVE_ENDINGS, '1st', INDICATIVE) +
+    suffix_rule(SECOND_IMPERATIVE_ENDINGS, '2nd', IMPERATIVE) +
+    suffix_rule(FIRST_IMPERATIVE_ENDINGS, '1st', IMPERATIVE)
+)
+
+FORMS_DEFAULT = SuffixRuleEngine(
+    suffix_rule(['ать', 'ять', 'еть', 'уть', 'оть'], '1st') +
+    suffix_rule('ить', '2nd')
+)
+
+def infinitive_rules(first_exceptions):
+    """Шаги 3-4 алгоритма: инфинитив с безударным окончанием"""
+    return (
+        suffix_rule(FIRST_INFINITIVE_ENDINGS, '1st', INFINITIVE) +
+        word_rule(first_exceptions, '1st', INFINITIVE) +
+        suffix_rule('ить', '2nd', INFINITIVE) +
+        word_rule(SECOND_EXCEPTIONS, '2nd', INFINITIVE) +
+        suffix_rule('', None, INFINITIVE)
+    )
+
+def stressed_rules(tags=None, when=None):
+    """Шаги 1-2 (и 5 для приставки вы-): ударные окончания 3-го лица"""
+    return (
+        suffix_rule(FIRST_STRESSED_ENDINGS, '1st', tags, when) +
+        suffix_rule(SECOND_STRESSED_ENDINGS, '2nd', tags, when)
+    )
+
+FORM_RULES = (
+    suffix_rule(FIRST_FORM_ENDINGS, '1st') +
+    suffix_rule(SECOND_FORM_ENDINGS, '2nd')
+)
+
+# fix_conjugations_correct.py: разноспрягаемые проверяются после приставки вы-
+CORRECT_CONJUGATION = SuffixRuleEngine(
+    stressed_rules(INDICATIVE) +
+    infinitive_rules(FIRST_ITE_EXCEPTIONS) +
+    stressed_rules(when=has_vy_prefix) +
+    suffix_rule('', None, when=has_vy_prefix) +
+    word_rule(HETEROCLITIC_VERBS, 'heteroclitic') +
+    FORM_RULES
+)
+
+# fix_conjugations_final.py: разноспрягаемые глаголы имеют приоритет,
+# исключения из -ить не попадают во 2-е спряжение
+FINAL_CONJUGATION = SuffixRuleEngine(
+    word_rule(HETEROCLITIC_VERBS, 'heteroclitic') +
+    stressed_rules(INDICATIVE) +
+    infinitive_rules(FIRST_ITE_EXCEPTIONS) +
+    stressed_rules(when=has_vy_prefix) +
+    suffix_rule('', None, when=has_vy_prefix) +
+    FORM_RULES
+)
+
+INFINITIVE_DEFAULT = SuffixRuleEngine(
+    suffix_rule(FIRST_INFINITIVE_ENDINGS, '1st') +
+    suffix_rule('ить', '2nd')
+)
+
+# comprehensive_corpus_check: окончания инфинитива, затем исключения
+CHECK_CONJUGATION = SuffixRuleEngine(
+    suffix_rule(FIRST_INFINITIVE_ENDINGS, '1st') +
+    suffix_rule('ить', '2nd') +
+    word_rule(['брить', 'стелить', 'зиждиться', 'выпить', 'уничтожить', 'жить'], '1st') +
+    word_rule(SECOND_EXCEPTIONS + ['лежать'], '2nd')
+)
+
+# expand_corpus.determine_conjugation_correct и parse_opencorpora.determine_conjugation
+EXPAND_CONJUGATION = SuffixRuleEngine(
+    word_rule(['брить', 'стелить', 'зиждиться'], '1st') +
+    suffix_rule(['ить', 'ать', 'ять', 'еть', 'уть', 'оть'], '2nd'),
+    default='1st'
+)
+
+PARSER_CONJUGATION = SuffixRuleEngine(
+    word_rule(['брить', 'стелить', 'зиждиться'], '2nd') +
+    suffix_rule(['ить', 'ать', 'ять', 'еть', 'уть', 'оть'], '2nd'),
+    default='1st'
+)
+
+def classify_verbs(words, engine=FINAL_CONJUGATION):
+    """
+    Пакетно определяет спряжение всех глаголов словаря metadata.words.
+
+    Возвращает словарь слово -> спряжение (None, если правило не найдено).
+    """
+    verbs = [(word, features.get('mood')) for word, features in words.items()
+             if features.get('pos') == 'VERB']
+    return dict(zip((word for word, _ in verbs), engine.classify_many(verbs)))
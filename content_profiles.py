@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Профили фильтрации слов по возрасту аудитории
+
+Профиль - набор категорий списка неподходящих слов (remove_inappropriate_words.py
+или файл --blocklist), слова которых этой аудитории не показываются. Вместо
+удаления слов из корпуса каждое слово получает маску content_flags: бит i
+установлен, если слово не подходит профилю i; порядок профилей сохраняется в
+metadata.content_profiles. Слова, подходящие всем профилям, маски не имеют.
+Один корпус обслуживает все аудитории (index.html?profile=teen), отдельные
+копии вроде opencorpora_child_safe.json не нужны.
+
+Весь список компилируется в один автомат (blocklist_filter.py) один раз на
+набор профилей и кэшируется; маска слова получается одним проходом по слову
+сразу для всех профилей. Записи файла без категории относятся ко всем профилям.
+
+Использование:
+    python3 content_profiles.py opencorpora.json opencorpora_profiles.json
+    python3 content_profiles.py in.json out.json --blocklist blocklist.txt --profiles profiles.json
+"""
+
+import argparse
+import json
+import os
+from collections import Counter
+
+from blocklist_filter import BlocklistFilter, load_blocklist
+from corpus_format import read_corpus, write_corpus
+from remove_inappropriate_words import DEFAULT_BLOCKLIST
+
+FLAGS_FIELD = 'content_flags'
+PROFILES_KEY = 'content_profiles'
+
+# Профиль -> категории, слова которых ему не подходят (от строгого к мягкому).
+# Порядок задает номер бита в маске
+PROFILES = {
+    'child': ['sex', 'drugs', 'alcohol', 'violence', 'terrorism', 'crime',
+              'smoking', 'gambling', 'corruption', 'mental_health'],
+    'teen': ['sex', 'drugs', 'violence', 'terrorism', 'gambling'],
+    'adult': ['sex'],
+}
+
+class ProfileMatcher:
+    """
+    Список неподходящих слов, скомпилированный для набора профилей.
+
+    mask(word) - маска профилей, которым слово не подходит;
+    profile_filter(name) - BlocklistFilter только для категорий профиля
+    (для удаления слов одного профиля), компилируется при первом запросе.
+    """
+
+    def __init__(self, entries, profiles=PROFILES):
+        self.names = list(profiles)
+        self.entries = entries
+        self.profiles = profiles
+        self.filters = {}
+
+        all_profiles = (1 << len(self.names)) - 1
+        category_masks = {}
+        for bit, name in enumerate(self.names):
+            for category in profiles[name]:
+                category_masks[category] = category_masks.get(category, 0) | (1 << bit)
+
+        self.blocklist = BlocklistFilter(entries)
+        self.entry_masks = [all_profiles if category is None else category_masks.get(category, 0)
+                            for pattern, exact, category in self.blocklist.entries]
+
+    def mask(self, word):
+        mask = 0
+        for number in self.blocklist.match_all(word):
+            mask |= self.entry_masks[number]
+        return mask
+
+    def profile_filter(self, name):
+        if name not in self.filters:
+            categories = set(self.profiles[name])
+            self.filters[name] = BlocklistFilter([entry for entry in self.entries
+                                                  if entry[2] is None or entry[2] in categories])
+        return self.filters[name]
+
+_matchers = {}
+
+def compile_profiles(blocklist_path=None, profiles=PROFILES):
+    """
+    Скомпилированные профили для встроенного списка или файла blocklist_path.
+    Кэшируются по файлу (с временем изменения) и набору профилей.
+    """
+    key = (blocklist_path, blocklist_path and os.path.getmtime(blocklist_path),
+           tuple((name, tuple(categories)) for name, categories in profiles.items()))
+    if key not in _matchers:
+        entries = load_blocklist(blocklist_path) if blocklist_path else DEFAULT_BLOCKLIST
+        _matchers[key] = ProfileMatcher(entries, profiles)
+    return _matchers[key]
+
+def load_profiles(path):
+    """Профили из JSON файла: {"имя": ["категория", ...], ...}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def mark_profiles_in_words(words_data, matcher=None):
+    """
+    Записывает маску content_flags в признаки слов словаря metadata.words на месте
+    (у подходящих всем профилям слов маска удаляется), возвращает статистику:
+    {'flagged': слов с маской, 'changed': слов с новой маской, 'profiles': {профиль: слов}}
+    """
+    matcher = matcher or compile_profiles()
+    flagged = changed = 0
+    per_profile = Counter()
+
+    for word, features in words_data.items():
+        mask = matcher.mask(word)
+        if features.get(FLAGS_FIELD, 0) != mask:
+            changed += 1
+        if mask:
+            features[FLAGS_FIELD] = mask
+            flagged += 1
+            for bit, name in enumerate(matcher.names):
+                if mask & (1 << bit):
+                    per_profile[name] += 1
+        elif FLAGS_FIELD in features:
+            del features[FLAGS_FIELD]
+
+    return {'flagged': flagged, 'changed': changed,
+            'profiles': {name: per_profile[name] for name in matcher.names}}
+
+def mark_content_profiles(input_json_path, output_json_path, blocklist_path=None, profiles_path=None):
+    """Размечает корпус масками профилей и сохраняет его"""
+    profiles = load_profiles(profiles_path) if profiles_path else PROFILES
+    matcher = compile_profiles(blocklist_path, profiles)
+
+    print(f"Загружаем корпус из {input_json_path}...")
+    corpus = read_corpus(input_json_path)
+    words_data = corpus['metadata']['words']
+    print(f"Всего слов в корпусе: {len(words_data)}")
+
+    stats = mark_profiles_in_words(words_data, matcher)
+    corpus['metadata'][PROFILES_KEY] = matcher.names
+
+    print(f"\nПрофили (бит маски {FLAGS_FIELD}):")
+    for bit, name in enumerate(matcher.names):
+        print(f"  {1 << bit:>3} {name:<10} не подходит слов: {stats['profiles'][name]}")
+    print(f"Слов с маской: {stats['flagged']}, изменено: {stats['changed']}")
+
+    write_corpus(corpus, output_json_path)
+    print(f"\n✅ Размеченный корпус сохранен в {output_json_path}")
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Разметка слов корпуса масками профилей аудитории')
+    parser.add_argument('input_json_file')
+    parser.add_argument('output_json_file')
+    parser.add_argument('--blocklist', metavar='FILE', help='файл со списком вместо встроенного')
+    parser.add_argument('--profiles', metavar='FILE', help='JSON файл профилей: {"имя": ["категория", ...]}')
+    args = parser.parse_args()
+
+    mark_content_profiles(args.input_json_file, args.output_json_file, args.blocklist, args.profiles)
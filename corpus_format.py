@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Общий загрузчик и писатель корпуса, компактный двоичный формат .rlc
+
+Все скрипты читают и пишут корпус через read_corpus/write_corpus: файлы
+с расширением .rlc сохраняются в двоичном формате, остальные - в привычном
+JSON (metadata.words). Преобразование в обе стороны без потерь.
+
+Устройство файла .rlc (все числа little-endian):
+    MAGIC, длина заголовка (uint32), заголовок JSON, секции с выравниванием 4:
+      word_offsets / word_data     - отсортированная таблица слов (UTF-8)
+      lemma_offsets / lemma_data   - отсортированная таблица лемм
+      record_offsets / records     - запись признаков каждого слова
+      order                        - исходный порядок слов (индексы в таблице)
+      hash_index                   - хеш-таблица слово -> индекс (zlib.crc32,
+                                     открытая адресация, 0 - пустая ячейка)
+
+Запись слова: uint16 маска присутствующих ключей, uint16 маска непустых
+значений, uint32 номер леммы (если лемма не пустая), по одному байту кода
+на каждый непустой перечислимый признак (pos, gender, case, declension, ...)
+и по uint32 на каждый непустой числовой признак (frequency). Пустые (null)
+признаки места не занимают. Нестандартные ключи (например, last_corrected
+из apply_corrections.py) и числа вне uint32 хранятся в заголовке как есть.
+
+CorpusReader открывает .rlc через mmap и находит признаки слова за O(1)
+по хеш-таблице, не распаковывая остальные слова.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from parse_opencorpora import FEATURE_FIELDS
+from word_features import compact_words, features_to_json
+
+MAGIC = b'RLCORP\x00\x01'
+CORPUS_EXTENSION = '.rlc'
+
+# Ключи записи признаков: lemma хранится ссылкой на таблицу лемм, остальные - кодами
+ENUM_FIELDS = FEATURE_FIELDS[1:]
+MAX_ENUM_VALUES = 255
+
+# Числовые признаки записи (uint32); биты масок идут после перечислимых
+NUMERIC_FIELDS = ('frequency',)
+MAX_NUMERIC_VALUE = 0xFFFFFFFF
+
+SECTIONS = ('word_offsets', 'word_data', 'lemma_offsets', 'lemma_data',
+            'record_offsets', 'records', 'order', 'hash_index')
+
+def is_binary_corpus(path):
+    """Проверяет, записан ли файл в двоичном формате .rlc"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+def read_corpus(path, compact=False):
+    """
+    Загружает корпус из .rlc или JSON файла.
+
+    При compact=True признаки слов загружаются как WordFeatures вместо словарей.
+    """
+    if is_binary_corpus(path):
+        with open(path, 'rb') as f:
+            corpus = unpack_corpus(f.read())
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            corpus = json.load(f)
+
+    if compact:
+        compact_words(corpus['metadata']['words'])
+    return corpus
+
+def write_corpus(corpus, path):
+    """Сохраняет корпус; формат выбирается по расширению файла"""
+    if path.endswith(CORPUS_EXTENSION):
+        with open(path, 'wb') as f:
+            f.write(pack_corpus(corpus))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(corpus, f, ensure_ascii=False, indent=2, default=features_to_json)
+
+def uint32_array(values):
+    """Массив uint32 в порядке little-endian"""
+    result = array('I', values)
+    if sys.byteorder == 'big':
+        result.byteswap()
+    return result
+
+def string_table(strings):
+    """Собирает таблицу строк: смещения (uint32) и данные UTF-8"""
+    offsets = [0]
+    data = bytearray()
+    for string in strings:
+        data += string.encode('utf-8')
+        offsets.append(len(data))
+    return uint32_array(offsets).tobytes(), bytes(data)
+
+def build_hash_index(encoded_words):
+    """Строит хеш-таблицу с открытой адресацией: ячейка хранит индекс слова + 1"""
+    size = 8
+    while size < len(encoded_words) * 2:
+        size *= 2
+    mask = size - 1
+
+    slots = array('I', bytes(4 * size))
+    for index, word in enumerate(encoded_words):
+        slot = zlib.crc32(word) & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = index + 1
+
+    if sys.byteorder == 'big':
+        slots.byteswap()
+    return slots.tobytes()
+
+def is_enum_value(value):
+    """Перечислимыми считаются строки и целые числа (bool и float - в extras)"""
+    return isinstance(value, (str, int)) and not isinstance(value, bool)
+
+def is_numeric_value(value):
+    """Числовые признаки в записи - целые от 0 до MAX_NUMERIC_VALUE"""
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= MAX_NUMERIC_VALUE
+
+def pack_corpus(corpus):
+    """Упаковывает корпус в формате metadata.words в байты .rlc"""
+    metadata = corpus['metadata']
+    words = metadata['words']
+    sorted_words = sorted(words)
+    word_index = {word: index for index, word in enumerate(sorted_words)}
+
+    # Таблицы значений перечислимых признаков
+    values = {field: set() for field in ENUM_FIELDS}
+    lemmas = set()
+    for features in words.values():
+        lemma = features.get('lemma')
+        if isinstance(lemma, str):
+            lemmas.add(lemma)
+        for field in ENUM_FIELDS:
+            value = features.get(field)
+            if value is not None and is_enum_value(value):
+                values[field].add(value)
+
+    value_tables = {}
+    for field in ENUM_FIELDS:
+        table = sorted(values[field], key=lambda value: (type(value).__name__, value))
+        if len(table) > MAX_ENUM_VALUES:
+            raise ValueError(f"Слишком много значений признака {field}: {len(table)}")
+        value_tables[field] = table
+    value_codes = {field: {value: code for code, value in enumerate(table, 1)}
+                   for field, table in value_tables.items()}
+
+    numeric_bits = {field: 1 << (len(ENUM_FIELDS) + position)
+                    for position, field in enumerate(NUMERIC_FIELDS, 1)}
+
+    sorted_lemmas = sorted(lemmas)
+    lemma_index = {lemma: index for index, lemma in enumerate(sorted_lemmas)}
+
+    # Записи признаков
+    record_offsets = [0]
+    records = bytearray()
+    extras = {}
+    for index, word in enumerate(sorted_words):
+        features = words[word]
+        present = 0
+        non_null = 0
+        lemma_ref = b''
+        codes = bytearray()
+        word_extras = {}
+
+        for key, value in features.items():
+            if key == 'lemma' and (value is None or isinstance(value, str)):
+                present |= 1
+                if value is not None:
+                    non_null |= 1
+                    lemma_ref = struct.pack('<I', lemma_index[value])
+            elif key in value_codes and (value is None or is_enum_value(value)):
+                bit = 1 << (ENUM_FIELDS.index(key) + 1)
+                present |= bit
+                if value is not None:
+                    non_null |= bit
+            elif key in numeric_bits and (value is None or is_numeric_value(value)):
+                present |= numeric_bits[key]
+                if value is not None:
+                    non_null |= numeric_bits[key]
+            else:
+                word_extras[key] = value
+
+        for position, field in enumerate(ENUM_FIELDS, 1):
+            if non_null & (1 << position):
+                codes.append(value_codes[field][features[field]])
+        for field, bit in numeric_bits.items():
+            if non_null & bit:
+                codes += struct.pack('<I', features[field])
+
+        if word_extras:
+            extras[str(index)] = word_extras
+
+        records += struct.pack('<HH', present, non_null) + lemma_ref + codes
+        record_offsets.append(len(records))
+
+    word_offsets, word_data = string_table(sorted_words)
+    lemma_offsets, lemma_data = string_table(sorted_lemmas)
+    order = uint32_array(word_index[word] for word in words).tobytes()
+
+    section_data = {
+        'word_offsets': word_offsets,
+        'word_data': word_data,
+        'lemma_offsets': lemma_offsets,
+        'lemma_data': lemma_data,
+        'record_offsets': uint32_array(record_offsets).tobytes(),
+        'records': bytes(records),
+        'order': order,
+        'hash_index': build_hash_index([word.encode('utf-8') for word in sorted_words])
+    }
+
+    # Смещения секций отсчитываются от начала данных после заголовка
+    body = bytearray()
+    sections = {}
+    for name in SECTIONS:
+        data = section_data[name]
+        sections[name] = [len(body), len(data)]
+        body += data
+        body += b'\0' * (-len(body) % 4)
+
+    header = {
+        'format': 1,
+        'metadata': {key: value for key, value in metadata.items() if key != 'words'},
+        'metadata_keys': list(metadata.keys()),
+        'count': len(sorted_words),
+        'fields': list(ENUM_FIELDS),
+        'numeric_fields': list(NUMERIC_FIELDS),
+        'values': value_tables,
+        'extras': extras,
+        'sections': sections
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    header_bytes += b' ' * (-(len(MAGIC) + 4 + len(header_bytes)) % 4)
+
+    return MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes + bytes(body)
+
+def read_header(data):
+    """Читает заголовок .rlc; возвращает заголовок и смещение начала данных"""
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Файл не является корпусом .rlc")
+
+    header_length, = struct.unpack_from('<I', data, len(MAGIC))
+    header_start = len(MAGIC) + 4
+    header = json.loads(bytes(data[header_start:header_start + header_length]).decode('utf-8'))
+    return header, header_start + header_length
+
+def read_section(data, header, body_start, name):
+    """Возвращает memoryview секции без копирования"""
+    offset, length = header['sections'][name]
+    return memoryview(data)[body_start + offset:body_start + offset + length]
+
+def read_uint32_section(data, header, body_start, name):
+    """Возвращает секцию как массив uint32"""
+    result = array('I')
+    result.frombytes(read_section(data, header, body_start, name))
+    if sys.byteorder == 'big':
+        result.byteswap()
+    return result
+
+def read_string_table(data, header, body_start, prefix):
+    """Декодирует таблицу строк целиком"""
+    offsets = read_uint32_section(data, header, body_start, prefix + '_offsets')
+    blob = bytes(read_section(data, header, body_start, prefix + '_data'))
+    return [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+def decode_record(record, fields, value_tables, lemmas, numeric_fields=()):
+    """Восстанавливает словарь признаков из записи слова"""
+    present, non_null = struct.unpack_from('<HH', record, 0)
+    position = 4
+    features = {}
+
+    if present & 1:
+        if non_null & 1:
+            lemma_ref, = struct.unpack_from('<I', record, position)
+            position += 4
+            features['lemma'] = lemmas[lemma_ref]
+        else:
+            features['lemma'] = None
+
+    for bit, field in enumerate(fields, 1):
+        mask = 1 << bit
+        if present & mask:
+            if non_null & mask:
+                features[field] = value_tables[field][record[position] - 1]
+                position += 1
+            else:
+                features[field] = None
+
+    for bit, field in enumerate(numeric_fields, len(fields) + 1):
+        mask = 1 << bit
+        if present & mask:
+            if non_null & mask:
+                features[field], = struct.unpack_from('<I', record, position)
+                position += 4
+            else:
+                features[field] = None
+
+    return features
+
+def unpack_corpus(data):
+    """Распаковывает байты .rlc в корпус формата metadata.words"""
+    header, body_start = read_header(data)
+
+    sorted_words = read_string_table(data, header, body_start, 'word')
+    lemmas = read_string_table(data, header, body_start, 'lemma')
+    record_offsets = read_uint32_section(data, header, body_start, 'record_offsets')
+    records = bytes(read_section(data, header, body_start, 'records'))
+    order = read_uint32_section(data, header, body_start, 'order')
+
+    fields = header['fields']
+    numeric_fields = header['numeric_fields']
+    value_tables = header['values']
+    extras = header['extras']
+
+    words = {}
+    for index in order:
+        record = records[record_offsets[index]:record_offsets[index + 1]]
+        features = decode_record(record, fields, value_tables, lemmas, numeric_fields)
+        features.update(extras.get(str(index), {}))
+        words[sorted_words[index]] = features
+
+    metadata = {}
+    for key in header['metadata_keys']:
+        metadata[key] = words if key == 'words' else header['metadata'][key]
+
+    return {'metadata': metadata}
+
+class StringTable:
+    """Ленивая таблица строк поверх memoryview: декодирует только запрошенные строки"""
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return self.raw(index).tobytes().decode('utf-8')
+
+    def raw(self, index):
+        return self.data[self.offsets[index]:self.offsets[index + 1]]
+
+class CorpusReader:
+    """
+    Корпус .rlc только для чтения через mmap.
+
+    Открытие читает лишь заголовок; признаки слова декодируются при обращении,
+    поиск слова идет по хеш-таблице за O(1). Поддерживает интерфейс словаря
+    только для чтения: reader[word], word in reader, reader.get(word),
+    len(reader), перебор слов и items() в исходном порядке.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.header, body_start = read_header(self.mmap)
+        if 'hash_index' not in self.header['sections']:
+            self.mmap.close()
+            self.file.close()
+            raise ValueError(f"В корпусе {path} нет хеш-таблицы слов: перезапишите его write_corpus")
+        self.metadata = self.header['metadata']
+        self.fields = self.header['fields']
+        self.numeric_fields = self.header['numeric_fields']
+        self.value_tables = self.header['values']
+        self.extras = self.header['extras']
+
+        def section(name):
+            return read_section(self.mmap, self.header, body_start, name)
+
+        def uint32_section(name):
+            if sys.byteorder == 'big':
+                return read_uint32_section(self.mmap, self.header, body_start, name)
+            return section(name).cast('I')
+
+        self.words = StringTable(uint32_section('word_offsets'), section('word_data'))
+        self.lemmas = StringTable(uint32_section('lemma_offsets'), section('lemma_data'))
+        self.record_offsets = uint32_section('record_offsets')
+        self.records = section('records')
+        self.order = uint32_section('order')
+        self.hash_index = uint32_section('hash_index')
+
+    def close(self):
+        # memoryview нужно освободить до закрытия mmap
+        for view in (self.words.offsets, self.words.data, self.lemmas.offsets, self.lemmas.data,
+                     self.record_offsets, self.records, self.order, self.hash_index):
+            if isinstance(view, memoryview):
+                view.release()
+        self.mmap.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def index_of(self, word):
+        """Индекс слова в отсортированной таблице или -1"""
+        key = word.encode('utf-8')
+
+        mask = len(self.hash_index) - 1
+        slot = zlib.crc32(key) & mask
+        while True:
+            entry = self.hash_index[slot]
+            if not entry:
+                return -1
+            if self.words.raw(entry - 1) == key:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def features_at(self, index):
+        """Декодирует признаки слова по индексу в отсортированной таблице"""
+        record = self.records[self.record_offsets[index]:self.record_offsets[index + 1]]
+        features = decode_record(record, self.fields, self.value_tables, self.lemmas, self.numeric_fields)
+        features.update(self.extras.get(str(index), {}))
+        return features
+
+    def get(self, word, default=None):
+        index = self.index_of(word)
+        return default if index < 0 else self.features_at(index)
+
+    def __getitem__(self, word):
+        index = self.index_of(word)
+        if index < 0:
+            raise KeyError(word)
+        return self.features_at(index)
+
+    def __contains__(self, word):
+        return self.index_of(word) >= 0
+
+    def __len__(self):
+        return len(self.order)
+
+    def __iter__(self):
+        for index in self.order:
+            yield self.words[index]
+
+    def keys(self):
+        return iter(self)
+
+    def items(self):
+        for index in self.order:
+            yield self.words[index], self.features_at(index)
+
+def open_corpus_words(path):
+    """
+    Открывает словарь слов корпуса для поиска: .rlc - через CorpusReader
+    без полной загрузки, JSON - обычной загрузкой metadata.words.
+    """
+    if is_binary_corpus(path):
+        return CorpusReader(path)
+    return read_corpus(path)['metadata']['words']
+
+def convert(input_file, output_file):
+    """Преобразует корпус между JSON и .rlc и проверяет обратимость"""
+    corpus = read_corpus(input_file)
+    write_corpus(corpus, output_file)
+
+    if read_corpus(output_file) != corpus:
+        print("❌ Преобразование с потерями!")
+        return False
+
+    input_size = os.path.getsize(input_file) / 1024
+    output_size = os.path.getsize(output_file) / 1024
+    print(f"Слов: {len(corpus['metadata']['words'])}")
+    print(f"{input_file}: {input_size:.1f} KB")
+    print(f"{output_file}: {output_size:.1f} KB")
+    print("✅ Преобразование без потерь")
+    return True
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Использование: python corpus_format.py <input_file> <output_file>")
+        print("Пример: python corpus_format.py opencorpora.json opencorpora.rlc")
+        sys.exit(1)
+
+    if not convert(sys.argv[1], sys.argv[2]):
+        sys.exit(1)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Журнал исправлений корпуса
+
+Исправления из админ-панели не переписывают корпус целиком, а дописываются
+в конец журнала (JSON Lines, по записи в строке):
+
+    {"word": "тень", "field": "declension", "old": "1st", "new": "3rd",
+     "timestamp": "2025-01-10T12:00:00", "source": "admin_panel"}
+
+Если признака у слова не было (или исправление его удаляет), ключа old (new)
+в записи нет; "old": null означает, что признак был и равнялся null.
+
+Текущее состояние корпуса - базовый снимок (.rlc), поверх которого
+проигрываются записи журнала после смещения journal_offset из метаданных
+снимка. Запись исправления стоит O(1) операций ввода-вывода, точка
+восстановления - это просто смещение в журнале: откат к нему дописывает
+обратные записи (new → old) для всех исправлений после смещения, так что
+журнал остается только дописываемым и хранит всю историю.
+
+Сжатие (compact) проигрывает журнал в новый базовый снимок и сдвигает
+journal_offset, чтобы загрузка не проигрывала весь журнал с начала.
+Сам журнал не обрезается: смещения точек восстановления остаются верными.
+journal_offset - служебный ключ снимка, в опубликованный корпус он не попадает
+(public_corpus).
+
+Рядом со снимком лежит небольшой файл состояния публикации
+(<снимок>.published.json): хеш опубликованного корпуса (source_hash) и
+смещение журнала, до которого исправления в него вошли (source_offset).
+Публикация переписывает только этот файл, сам снимок меняется лишь при
+сжатии. Если корпус перегенерировали не через журнал (парсер,
+content_profiles.py, ...), снимок пересоздается из нового корпуса, и поверх
+него проигрываются записи после source_offset - иначе публикация молча
+затерла бы новый корпус старым.
+"""
+
+import hashlib
+import json
+import os
+
+from corpus_format import CorpusReader, is_binary_corpus, read_corpus, write_corpus
+
+# Служебные ключи метаданных базового снимка (source_* - у снимков до файла состояния публикации)
+JOURNAL_KEYS = ('journal_offset', 'source_hash', 'source_offset')
+
+# Значение old/new для признака, которого у слова нет (в отличие от null)
+ABSENT = object()
+
+# Файл состояния публикации рядом с базовым снимком
+PUBLISHED_STATE_SUFFIX = '.published.json'
+
+def make_record(word, field, old, new, timestamp, source='admin_panel'):
+    """Запись журнала об изменении признака field слова word; ABSENT - признака нет"""
+    record = {'word': word, 'field': field}
+    if old is not ABSENT:
+        record['old'] = old
+    if new is not ABSENT:
+        record['new'] = new
+    record['timestamp'] = timestamp
+    record['source'] = source
+    return record
+
+def journal_end(journal_path):
+    """Смещение конца последней полной записи журнала (0, если журнала еще нет)"""
+    try:
+        with open(journal_path, 'rb') as f:
+            end = f.seek(0, os.SEEK_END)
+            if not end:
+                return 0
+            f.seek(end - 1)
+            if f.read(1) == b'\n':
+                return end
+            f.seek(0)
+            return f.read().rfind(b'\n') + 1
+    except OSError:
+        return 0
+
+def is_record_start(journal_path, offset):
+    """Смещение - начало записи журнала: 0 или сразу после перевода строки"""
+    if offset == 0:
+        return True
+    with open(journal_path, 'rb') as f:
+        f.seek(offset - 1)
+        return f.read(1) == b'\n'
+
+def append_records(journal_path, records):
+    """
+    Дописывает записи в конец журнала, возвращает смещения (начало, конец).
+
+    Недописанная последняя строка (сбой во время прошлой записи) отбрасывается:
+    такая запись не была подтверждена.
+    """
+    with open(journal_path, 'ab+') as f:
+        end = f.seek(0, os.SEEK_END)
+        if end:
+            f.seek(end - 1)
+            if f.read(1) != b'\n':
+                f.seek(0)
+                f.truncate(f.read().rfind(b'\n') + 1)
+
+        start = f.seek(0, os.SEEK_END)
+        f.write(b''.join(json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+                         for record in records))
+        f.flush()
+        os.fsync(f.fileno())
+        return start, f.tell()
+
+def read_records(journal_path, start=0, end=None):
+    """Записи журнала между смещениями start и end (по умолчанию до конца)"""
+    if not os.path.exists(journal_path):
+        return []
+    with open(journal_path, 'rb') as f:
+        f.seek(start)
+        data = f.read() if end is None else f.read(end - start)
+
+    # Строка без перевода строки в конце - недописанная запись
+    return [json.loads(line) for line in data.split(b'\n')[:-1] if line.strip()]
+
+def replay_records(words_data, records):
+    """
+    Применяет записи журнала к словарю metadata.words на месте, возвращает
+    число примененных. Запись без new удаляет признак; записи для слов,
+    которых нет в корпусе, пропускаются.
+    """
+    applied = 0
+    for record in records:
+        features = words_data.get(record['word'])
+        if features is None:
+            continue
+        if 'new' not in record:
+            if record['field'] in features:
+                del features[record['field']]
+        else:
+            features[record['field']] = record['new']
+        features['last_corrected'] = record['timestamp']
+        features['correction_source'] = record['source']
+        applied += 1
+    return applied
+
+def inverse_records(records, timestamp, source='restore'):
+    """Обратные записи (new → old) в обратном порядке: отменяют records"""
+    return [make_record(record['word'], record['field'], record.get('new', ABSENT), record.get('old', ABSENT),
+                        timestamp, source)
+            for record in reversed(records)]
+
+def public_corpus(corpus):
+    """Корпус для публикации: метаданные без служебных ключей журнала"""
+    metadata = {key: value for key, value in corpus['metadata'].items() if key not in JOURNAL_KEYS}
+    return {**corpus, 'metadata': metadata}
+
+def file_hash(path):
+    """SHA1 содержимого файла"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def read_base_metadata(base_path):
+    """Метаданные снимка без слов (для .rlc читается только заголовок)"""
+    if is_binary_corpus(base_path):
+        with CorpusReader(base_path) as reader:
+            return dict(reader.metadata)
+    return read_corpus(base_path)['metadata']
+
+def published_state_path(base_path):
+    """Путь к файлу состояния публикации снимка base_path"""
+    return os.path.splitext(base_path)[0] + PUBLISHED_STATE_SUFFIX
+
+def read_published_state(base_path):
+    """
+    Хеш опубликованного корпуса и смещение журнала, вошедшее в него:
+    {'source_hash': ..., 'source_offset': ...} или None, если снимка нет
+    """
+    if not os.path.exists(base_path):
+        return None
+    try:
+        with open(published_state_path(base_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        pass
+    # Снимки до файла состояния хранили эти ключи в своих метаданных;
+    # у еще более старых есть только journal_offset
+    metadata = read_base_metadata(base_path)
+    return {'source_hash': metadata.get('source_hash'),
+            'source_offset': metadata.get('source_offset', metadata.get('journal_offset', 0))}
+
+def save_published_state(base_path, corpus_path, offset):
+    """
+    Запоминает, что в корпус corpus_path вошли записи журнала до смещения offset.
+    Снимок не переписывается: записи после его journal_offset проигрываются
+    при загрузке, пока compact не перенесет их в снимок.
+    """
+    path = published_state_path(base_path)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'source_hash': file_hash(corpus_path), 'source_offset': offset}, f)
+    os.replace(path + '.tmp', path)
+
+def create_base(base_path, corpus_path, journal_path):
+    """
+    Создает базовый снимок из корпуса, если снимка нет или корпус изменился
+    не через журнал. Новый снимок начинается с текущего конца журнала, а
+    пересозданный - с source_offset прошлой публикации: записи после него в
+    корпус еще не опубликованы. Возвращает 'created', 'rebased' или None.
+    """
+    state = read_published_state(base_path)
+    if state is not None:
+        if state['source_hash'] == file_hash(corpus_path):
+            return None
+        offset = state['source_offset']
+        result = 'rebased'
+    else:
+        offset = journal_end(journal_path)
+        result = 'created'
+
+    corpus = read_corpus(corpus_path)
+    for key in JOURNAL_KEYS:
+        corpus['metadata'].pop(key, None)
+    corpus['metadata']['journal_offset'] = offset
+    write_corpus(corpus, base_path)
+    save_published_state(base_path, corpus_path, offset)
+    return result
+
+def load_state(base_path, journal_path):
+    """
+    Текущее состояние корпуса: базовый снимок и записи журнала после его смещения.
+    Возвращает (корпус, число проигранных записей); journal_offset в метаданных -
+    конец журнала.
+    """
+    corpus = read_corpus(base_path)
+    metadata = corpus['metadata']
+    end = journal_end(journal_path)
+    records = read_records(journal_path, metadata.get('journal_offset', 0), end)
+    replay_records(metadata['words'], records)
+    metadata['journal_offset'] = end
+    return corpus, len(records)
+
+def compact(base_path, journal_path):
+    """Проигрывает журнал в базовый снимок; возвращает число записей, вошедших в снимок"""
+    corpus, replayed = load_state(base_path, journal_path)
+    if replayed:
+        write_corpus(corpus, base_path)
+    return replayed
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Конвейер исправления корпуса
+
+Загружает корпус один раз, последовательно применяет исправления из скриптов
+fix_*.py, comprehensive_corpus_check.py и remove_inappropriate_words.py
+как проходы по словарю в памяти и записывает результат один раз. По умолчанию
+неподходящие слова не удаляются, а размечаются масками профилей аудитории
+(content_profiles.py). В отчете -
+время и число изменений для каждого прохода.
+
+Результат каждого прохода кэшируется в каталоге .corpus_cache под ключом
+sha1(ключ предыдущего прохода, имя прохода, исходный код модуля прохода,
+всех модулей проекта, которые он импортирует прямо или косвенно, и самого
+конвейера);
+ключ первого прохода строится от хеша входного файла. Исходный код модуля
+включает и таблицы правил, поэтому при повторном запуске без изменений
+проходы берутся из кэша, а правка одного списка правил перезапускает только
+этот проход и следующие за ним.
+
+Статистика сохраняется для каждого прохода, а корпус - только после
+последнего и после самого долгого из выполненных проходов: промежуточный
+корпус занимает столько же места, сколько итоговый. Файлы с ключами, которых
+нет среди ключей текущего запуска, удаляются.
+
+Использование:
+    python3 correction_pipeline.py opencorpora.json opencorpora_fixed.json
+    python3 correction_pipeline.py in.json out.rlc --passes declensions,conjugations_final
+    python3 correction_pipeline.py in.json out.json --no-cache
+"""
+
+import argparse
+import ast
+import contextlib
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+
+from comprehensive_corpus_check import comprehensive_check_words
+from content_profiles import PROFILES_KEY, compile_profiles, mark_profiles_in_words
+from corpus_format import pack_corpus, read_corpus, write_corpus
+from fix_conjugations import fix_conjugations_in_words
+from fix_conjugations_advanced import fix_conjugations_advanced_in_words
+from fix_conjugations_correct import fix_conjugations_correct_in_words
+from fix_conjugations_final import fix_conjugations_final_in_words
+from fix_corpus_declensions import fix_declensions_in_words
+from fix_indeclinable import fix_indeclinable_in_words
+from fix_indeclinable_errors import fix_indeclinable_errors_in_words
+from remove_inappropriate_words import remove_inappropriate_from_words
+
+# Проходы конвейера: имя -> (функция прохода, число изменений по ее результату)
+PASSES = {
+    'declensions': (fix_declensions_in_words, lambda result: result['total']),
+    'indeclinable': (fix_indeclinable_in_words, int),
+    'indeclinable_errors': (fix_indeclinable_errors_in_words, lambda result: result[0]),
+    'conjugations': (fix_conjugations_in_words, int),
+    'conjugations_advanced': (fix_conjugations_advanced_in_words, int),
+    'conjugations_correct': (fix_conjugations_correct_in_words, int),
+    'conjugations_final': (fix_conjugations_final_in_words, int),
+    'comprehensive_check': (comprehensive_check_words, lambda result: result[0] + result[1]),
+    'remove_inappropriate': (remove_inappropriate_from_words, len),
+    'content_profiles': (mark_profiles_in_words, lambda result: result['changed']),
+}
+
+# Порядок по умолчанию: из вариантов исправления спряжений берется финальный
+DEFAULT_PASSES = [
+    'declensions',
+    'indeclinable',
+    'indeclinable_errors',
+    'conjugations_final',
+    'comprehensive_check',
+    'content_profiles',
+]
+
+DEFAULT_CACHE_DIR = '.corpus_cache'
+
+# Увеличивается при изменении формата кэша или самого конвейера
+CACHE_VERSION = 1
+
+def run_pass(words, name, verbose=False):
+    """Применяет один проход к словарю metadata.words на месте, возвращает (время, изменений)"""
+    function, count_changes = PASSES[name]
+    start = time.perf_counter()
+    if verbose:
+        print(f"\n=== {name} ===")
+        result = function(words)
+    else:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = function(words)
+    return time.perf_counter() - start, count_changes(result)
+
+def file_hash(path):
+    """SHA1 содержимого файла"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def project_imports(module_name, project_dir=PROJECT_DIR):
+    """Модули проекта, которые модуль импортирует (операторы import в его исходном коде)"""
+    with open(os.path.join(project_dir, module_name + '.py'), 'rb') as f:
+        tree = ast.parse(f.read())
+
+    # Зависимости берутся из операторов import: импортированные таблицы
+    # (списки, экземпляры SuffixRuleEngine) не знают, в каком модуле заданы
+    imports = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names = [node.module]
+        elif isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        else:
+            continue
+        imports.update(name for name in names if os.path.exists(os.path.join(project_dir, name + '.py')))
+    return imports
+
+def pass_code_hash(name, project_dir=PROJECT_DIR):
+    """
+    Хеш исходного кода прохода: модуль прохода с таблицами правил, все модули
+    проекта, которые он импортирует прямо или через другие модули (например,
+    conjugation_engine -> suffix_rules), и сам конвейер
+    """
+    modules = set()
+    pending = [PASSES[name][0].__module__]
+    while pending:
+        module_name = pending.pop()
+        if module_name not in modules:
+            modules.add(module_name)
+            pending.extend(project_imports(module_name, project_dir))
+
+    digest = hashlib.sha1()
+    for module_name in ['correction_pipeline'] + sorted(modules):
+        digest.update(f'{module_name}\n'.encode('utf-8'))
+        with open(os.path.join(project_dir, module_name + '.py'), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def stage_keys(input_hash, pass_names):
+    """Ключи кэша для результатов проходов: каждый зависит от всех предыдущих"""
+    keys = []
+    key = f'{CACHE_VERSION}:{input_hash}'
+    for name in pass_names:
+        key = hashlib.sha1(f'{key}:{name}:{pass_code_hash(name)}'.encode('utf-8')).hexdigest()
+        keys.append(key)
+    return keys
+
+def cache_paths(cache_dir, name, key):
+    """Пути к сохраненному корпусу и статистике прохода"""
+    base = os.path.join(cache_dir, f'{name}-{key}')
+    return base + '.rlc', base + '.json'
+
+def load_cached_stages(cache_dir, pass_names, keys, compact):
+    """
+    Ищет в кэше самый поздний сохраненный проход.
+
+    Возвращает (корпус или None, строки отчета для взятых из кэша проходов).
+    """
+    for index in range(len(pass_names) - 1, -1, -1):
+        corpus_path, stats_path = cache_paths(cache_dir, pass_names[index], keys[index])
+        if not (os.path.exists(corpus_path) and os.path.exists(stats_path)):
+            continue
+
+        report = []
+        for name, key in zip(pass_names[:index + 1], keys[:index + 1]):
+            stats_path = cache_paths(cache_dir, name, key)[1]
+            try:
+                with open(stats_path, 'r', encoding='utf-8') as f:
+                    stats = json.load(f)
+            except (OSError, ValueError):
+                stats = {'changes': 0, 'words': 0}
+            report.append((name, None, stats['changes'], stats['words']))
+
+        return read_corpus(corpus_path, compact=compact), report
+
+    return None, []
+
+def save_stage_stats(cache_dir, name, key, changes, words):
+    """Сохраняет статистику прохода в кэш"""
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cache_paths(cache_dir, name, key)[1], 'w', encoding='utf-8') as f:
+        json.dump({'changes': changes, 'words': words}, f)
+
+def save_stage_corpus(cache_dir, name, key, data):
+    """Сохраняет упакованный (.rlc) корпус после прохода в кэш"""
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cache_paths(cache_dir, name, key)[0], 'wb') as f:
+        f.write(data)
+
+def prune_cache(cache_dir, keys):
+    """Удаляет из кэша файлы проходов с ключами не из keys; возвращает число удаленных"""
+    pattern = re.compile(r'.+-([0-9a-f]{40})\.(?:rlc|json)')
+    keys = set(keys)
+    removed = 0
+    for name in os.listdir(cache_dir):
+        match = pattern.fullmatch(name)
+        if match and match.group(1) not in keys:
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+    return removed
+
+def print_report(report, load_time, save_time):
+    print(f"\n{'Проход':<24} {'Время, мс':>10} {'Изменений':>10} {'Слов':>8}")
+    print(f"{'загрузка':<24} {load_time * 1000:>10.1f}")
+    for name, elapsed, changes, words_after in report:
+        timing = 'кэш' if elapsed is None else f'{elapsed * 1000:.1f}'
+        print(f"{name:<24} {timing:>10} {changes:>10} {words_after:>8}")
+    print(f"{'запись':<24} {save_time * 1000:>10.1f}")
+
+    total_time = load_time + save_time + sum(row[1] or 0 for row in report)
+    total_changes = sum(row[2] for row in report)
+    print(f"{'ИТОГО':<24} {total_time * 1000:>10.1f} {total_changes:>10}")
+
+def run_pipeline(input_file, output_file, pass_names=None, verbose=False, compact=False,
+                 cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Загружает корпус, применяет проходы и сохраняет результат.
+
+    Если задан cache_dir, результаты проходов берутся из кэша и сохраняются в него.
+    """
+    pass_names = pass_names or DEFAULT_PASSES
+    print(f"Проходы: {', '.join(pass_names)}")
+
+    start = time.perf_counter()
+    corpus, report = None, []
+    if cache_dir:
+        keys = stage_keys(file_hash(input_file), pass_names)
+        corpus, report = load_cached_stages(cache_dir, pass_names, keys, compact)
+        if report:
+            print(f"Из кэша: {', '.join(row[0] for row in report)}")
+
+    if corpus is None:
+        print(f"Загружаем корпус из {input_file}...")
+        corpus = read_corpus(input_file, compact=compact)
+    load_time = time.perf_counter() - start
+
+    words = corpus['metadata']['words']
+    print(f"Всего слов в корпусе: {len(words)}")
+
+    save_time = 0
+    computed = len(pass_names) - len(report)
+    slowest = None  # (время, номер прохода, упакованный корпус после него)
+    for index in range(len(report), len(pass_names)):
+        name = pass_names[index]
+        elapsed, changes = run_pass(words, name, verbose)
+        corpus['metadata']['total_words'] = len(words)
+        report.append((name, elapsed, changes, len(words)))
+
+        if cache_dir:
+            start = time.perf_counter()
+            save_stage_stats(cache_dir, name, keys[index], changes, len(words))
+            # Из промежуточных корпусов в кэш попадает только корпус после самого долгого прохода
+            if index < len(pass_names) - 1 and (slowest is None or elapsed > slowest[0]):
+                slowest = (elapsed, index, pack_corpus(corpus))
+            save_time += time.perf_counter() - start
+
+    corpus['metadata']['total_words'] = len(words)
+    if cache_dir:
+        start = time.perf_counter()
+        if slowest is not None:
+            save_stage_corpus(cache_dir, pass_names[slowest[1]], keys[slowest[1]], slowest[2])
+        if computed:
+            save_stage_corpus(cache_dir, pass_names[-1], keys[-1], pack_corpus(corpus))
+        removed = prune_cache(cache_dir, keys)
+        save_time += time.perf_counter() - start
+        if removed:
+            print(f"Удалено устаревших файлов кэша: {removed}")
+
+    if 'content_profiles' in pass_names:
+        corpus['metadata'][PROFILES_KEY] = compile_profiles().names
+
+    start = time.perf_counter()
+    write_corpus(corpus, output_file)
+    save_time += time.perf_counter() - start
+
+    print_report(report, load_time, save_time)
+    print(f"\n✅ Исправленный корпус сохранен в {output_file}")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description='Конвейер исправления корпуса: одна загрузка, несколько проходов')
+    parser.add_argument('input_file')
+    parser.add_argument('output_file')
+    parser.add_argument('--passes', default=','.join(DEFAULT_PASSES),
+                        help=f"проходы через запятую, доступны: {', '.join(PASSES)}")
+    parser.add_argument('--verbose', action='store_true', help='печатать вывод каждого прохода')
+    parser.add_argument('--compact', action='store_true', help='хранить признаки слов как WordFeatures')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='каталог кэша результатов проходов')
+    parser.add_argument('--no-cache', action='store_true', help='не использовать кэш')
+    args = parser.parse_args()
+
+    pass_names = [name.strip() for name in args.passes.split(',') if name.strip()]
+    unknown = [name for name in pass_names if name not in PASSES]
+    if unknown:
+        print(f"❌ Неизвестные проходы: {', '.join(unknown)}")
+        print(f"Доступные проходы: {', '.join(PASSES)}")
+        sys.exit(1)
+
+    cache_dir = None if args.no_cache else args.cache_dir
+    run_pipeline(args.input_file, args.output_file, pass_names, args.verbose, args.compact, cache_dir)
+
+if __name__ == "__main__":
+    main()
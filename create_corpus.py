@@ -4,7 +4,7 @@
 Скрипт для создания исправленного корпуса с правильной классификацией склонений
 """
 
-import json
+from corpus_format import write_corpus
 
 def create_corrected_corpus():
     """
@@ -205,8 +205,7 @@ def create_corrected_corpus():
     }
     
     # Сохраняем корпус
-    with open('opencorpora.json', 'w', encoding='utf-8') as f:
-        json.dump(corpus, f, ensure_ascii=False, indent=2)
+    write_corpus(corpus, 'opencorpora.json')
     
     print(f"✅ Создан исправленный корпус: {len(words_data)} слов")
     
@@ -10,6 +10,9 @@ import shutil
 import sys
 from pathlib import Path
 
+from corpus_format import read_corpus
+from exercise_index import print_shards, write_exercise_shards
+
 def create_offline_package():
     """Создает папку с файлами для офлайн работы"""
     
@@ -51,6 +54,11 @@ def create_offline_package():
             print(f"  ❌ {file_name} - файл не найден!")
             return False
     
+    # Наборы слов упражнений и манифест для скопированного корпуса
+    print("\n📋 Создаем наборы слов упражнений:")
+    corpus_file = offline_dir / "opencorpora.json"
+    print_shards(write_exercise_shards(read_corpus(corpus_file), corpus_file))
+    
     # Копируем опциональные файлы
     print("\n📋 Копируем дополнительные файлы:")
     for file_name in optional_files:
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Определение склонения существительных по обратному суффиксному дереву
+
+Правила склонения (окончания, списки исключений, условия по роду) задаются
+упорядоченными таблицами и компилируются в SuffixRuleEngine (suffix_rules.py);
+условием правила служит род существительного.
+
+Таблицы повторяют правила прежних функций, поэтому результаты совпадают:
+    PARSER_DECLENSION  - parse_opencorpora.determine_declension
+    EXPAND_DECLENSION  - expand_corpus.determine_declension_correct
+    VERIFY_DECLENSION  - verify_corpus.determine_correct_declension
+    CHECK_DECLENSION   - comprehensive_corpus_check (проверка склонений)
+"""
+
+import re
+
+from suffix_rules import SuffixRuleEngine, suffix_rule, word_rule
+
+MASCULINE = frozenset({'MASCULINE'})
+FEMININE = frozenset({'FEMININE'})
+NEUTER = frozenset({'NEUTER'})
+
+# parse_opencorpora.determine_declension: по лемме и роду
+PARSER_DECLENSION = SuffixRuleEngine(
+    suffix_rule('ь', '3rd', FEMININE) +
+    suffix_rule(['а', 'я'], '1st') +
+    suffix_rule(['о', 'е'], '2nd') +
+    suffix_rule('', '2nd', NEUTER) +
+    suffix_rule('', '1st')
+)
+
+# expand_corpus.determine_declension_correct (слово в нижнем регистре)
+EXPAND_HETEROCLITIC_WORDS = [
+    'время', 'имя', 'племя', 'знамя', 'пламя', 'стремя', 'темя', 'семя', 'бремя', 'вымя'
+]
+
+EXPAND_INDECLINABLE_WORDS = [
+    'кофе', 'пальто', 'кино', 'такси', 'метро', 'кафе', 'меню',
+    'алоэ', 'какао', 'радио', 'шоу', 'казино', 'кабаре', 'бюро',
+    'депо', 'фойе', 'ателье', 'пенсне', 'колье', 'какаду', 'кенгуру',
+    'шимпанзе'
+]
+
+EXPAND_DECLENSION = SuffixRuleEngine(
+    word_rule(EXPAND_HETEROCLITIC_WORDS, 'heteroclitic') +
+    word_rule(EXPAND_INDECLINABLE_WORDS, 'indeclinable') +
+    suffix_rule(['а', 'я'], '1st') +
+    suffix_rule(['о', 'е'], '2nd') +
+    suffix_rule('ь', '3rd') +
+    # Мужской род без окончания - обычно 2-е склонение, по умолчанию 1-е
+    suffix_rule('', '2nd', MASCULINE) +
+    suffix_rule('', '1st')
+)
+
+# verify_corpus.determine_correct_declension (слово в нижнем регистре)
+VERIFY_HETEROCLITIC_WORDS = [
+    'путь', 'время', 'имя', 'племя', 'знамя', 'пламя',
+    'стремя', 'темя', 'семя', 'бремя', 'вымя'
+]
+
+VERIFY_INDECLINABLE_WORDS = [
+    'кофе', 'пальто', 'кино', 'метро', 'такси', 'меню', 'кафе',
+    'ателье', 'пенсне', 'кашне', 'пари', 'реле', 'шоссе', 'алоэ',
+    'какао', 'пианино', 'радио', 'видео', 'аудио', 'фото', 'авто',
+    'мото', 'домино', 'казино', 'лото', 'бюро', 'депо', 'фойе',
+    'манто', 'боа', 'кенгуру', 'шимпанзе', 'какаду', 'фламинго',
+    'самоа', 'манчестер', 'джозеф', 'кортни', 'ник', 'пабло',
+    'ариэль', 'ольга', 'елена', 'александрия', 'минниханов'
+]
+
+CYRILLIC_STEM_RE = re.compile('[а-я]+')
+
+def is_cyrillic_stem(word):
+    """Основа (все буквы, кроме последней) непустая и состоит из букв а-я"""
+    return CYRILLIC_STEM_RE.fullmatch(word, 0, len(word) - 1) is not None
+
+VERIFY_DECLENSION = SuffixRuleEngine(
+    # 1-е склонение: муж.р. и жен.р. на -а/-я
+    suffix_rule(['а', 'я'], '1st') +
+    # 3-е склонение: жен.р. на мягкий знак
+    suffix_rule('ь', '3rd', FEMININE) +
+    word_rule(VERIFY_HETEROCLITIC_WORDS, 'heteroclitic') +
+    word_rule(VERIFY_INDECLINABLE_WORDS, 'indeclinable') +
+    # Иностранные слова на -о, -е, -и, -у, -ю (прежде - регулярные выражения [а-я]+[оеиую]$)
+    suffix_rule(['о', 'е', 'и', 'у', 'ю'], 'indeclinable', when=is_cyrillic_stem) +
+    # 2-е склонение: муж.р. с нулевым окончанием, ср.р. на -о/-е и все неопределенные случаи
+    suffix_rule('', '2nd')
+)
+
+# comprehensive_corpus_check: слово в исходном регистре
+CHECK_HETEROCLITIC_WORDS = [
+    'путь', 'время', 'имя', 'племя', 'знамя', 'пламя', 'бремя', 'стремя', 'темя', 'семя'
+]
+
+CHECK_INDECLINABLE_WORDS = [
+    'кино', 'кафе', 'метро', 'такси', 'меню', 'пальто', 'кофе', 'какао', 'кашне',
+    'пенсне', 'монпансье', 'конферансье', 'атташе', 'портмоне', 'резюме', 'алоэ',
+    'какаду', 'кенгуру', 'шимпанзе', 'биеннале', 'радио', 'видео', 'аудио', 'фото',
+    'авто', 'депо', 'трио', 'фэнтези', 'регби', 'танго', 'маэстро', 'цунами',
+    'слово', 'дело', 'кольцо', 'пятно', 'тело', 'чудо', 'второе', 'яблочко',
+    'манчестер', 'бобби', 'томми', 'джонни', 'джозеф', 'прозвище', 'шереметьево',
+    'ооо', 'зимбабве', 'гиорги', 'мэтью', 'люси', 'нло', 'регги', 'внуково',
+    'лукашенко', 'авченко', 'барри', 'бадри', 'коби', 'уго', 'кадафи', 'канделаки',
+    'пабло', 'самоа', 'тэо', 'андре', 'пегги', 'терещенко', 'палермо', 'гаучо',
+    'сильвио', 'иржи', 'тимоти', 'грегори', 'хельсинки', 'саакашвили', 'минниханов',
+    'алехандро', 'бурджанадзе', 'зощенко', 'довженко', 'папандреу', 'эльдорадо'
+]
+
+# Подстроки заимствованных слов и аббревиатур (ищутся в любом месте слова)
+CHECK_INDECLINABLE_PATTERNS = ['ооо', 'ао', 'нло', 'вконтакте']
+
+CHECK_FOREIGN_NAMES = {
+    'джозеф', 'кортни', 'хиллари', 'джо', 'гарри', 'барри', 'пегги', 'сьюзи',
+    'томми', 'джонни', 'бобби', 'люси', 'маэстро', 'пабло', 'андре', 'педро',
+    'фернандо', 'алонсо', 'сильвио', 'иржи', 'гиви', 'бадри', 'коби', 'уго',
+    'тимоти', 'грегори', 'алехандро', 'миньиханов', 'саакашвили', 'гиорги',
+    'мэтью', 'бурджанадзе', 'терещенко', 'зощенко', 'довженко', 'лукашенко',
+    'авченко', 'папандреу', 'кадафи', 'канделаки', 'тэо', 'альдо', 'самоа',
+    'онтарио', 'малави', 'монако', 'чили', 'марокко', 'марти', 'зимбабве',
+    'хельсинки', 'шереметьево', 'внуково', 'эльдорадо', 'палермо', 'гаучо'
+}
+
+def has_zero_ending(word):
+    """Нет окончаний -а/-я/-о/-е/-ь"""
+    return not word.endswith(('а', 'я', 'о', 'е', 'ь'))
+
+def has_indeclinable_pattern(word):
+    lowered = word.lower()
+    return any(pattern in lowered for pattern in CHECK_INDECLINABLE_PATTERNS)
+
+def is_foreign_name(word):
+    """Имя собственное с заглавной буквы из списка иностранных имен"""
+    return word.istitle() and len(word) > 2 and word.lower() in CHECK_FOREIGN_NAMES
+
+CHECK_DECLENSION = SuffixRuleEngine(
+    # 1-е склонение: мужской и женский род на -а/-я
+    suffix_rule(['а', 'я'], '1st', MASCULINE | FEMININE) +
+    # 2-е склонение: средний род на -о/-е, мужской род с нулевым окончанием
+    suffix_rule(['о', 'е'], '2nd', NEUTER) +
+    suffix_rule('', '2nd', MASCULINE, when=has_zero_ending) +
+    # 3-е склонение: женский род на -ь
+    suffix_rule('ь', '3rd', FEMININE) +
+    word_rule(CHECK_HETEROCLITIC_WORDS, 'heteroclitic') +
+    suffix_rule('', 'indeclinable', when=has_indeclinable_pattern) +
+    word_rule(CHECK_INDECLINABLE_WORDS, 'indeclinable') +
+    suffix_rule('', 'indeclinable', when=is_foreign_name)
+)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Готовые наборы слов для упражнений приложения (index.html)
+
+Корпус раскладывается на небольшие файлы по упражнениям и правильным
+корзинам: в файле только подходящие слова одной корзины, например
+
+    opencorpora.declension.3rd.5d41402abc4b.json
+    {"exercise": "declension", "category": 2, "words": ["ночь", ...], "flags": {"слово": 1}}
+
+flags - маски content_flags (content_profiles.py) слов, у которых они есть.
+Манифест opencorpora.manifest.json перечисляет файлы каждого упражнения и
+копию корпуса:
+
+    {"revision": "...", "total_words": 4826, "content_profiles": [...],
+     "corpus": "opencorpora.7c4a8d09ca37.json",
+     "exercises": {"declension": {"categories": ["1st", ...],
+                                  "shards": ["opencorpora.declension.1st.aab3238922bc.json", ...],
+                                  "words": [1432, ...]}, ...}}
+
+В имени каждого файла, кроме манифеста, - хеш его содержимого: файл с таким
+именем никогда не меняется, и браузер может хранить его в кэше сколько
+угодно, а новое содержимое получает новое имя. Перепроверяется только
+маленький манифест. Файлы прошлого манифеста остаются (их еще может
+загружать открытая страница), более старые удаляются.
+
+Все файлы пишутся компактным JSON (копия корпуса тоже), и рядом с каждым
+кладутся сжатые варианты .gz и .br (precompress.py) для статического сервера.
+
+Страница загружает манифест и файлы только текущего упражнения, остальные
+упражнения и полный корпус (для своих слов) догружаются в фоне. Отбор слов и
+номера корзин повторяют filterWordsByMorphology и determineCorrectCategory
+в index.html; упражнение без файлов страница по-прежнему отбирает из корпуса.
+
+Использование:
+    python3 exercise_index.py opencorpora.json
+    python3 exercise_index.py opencorpora.json --output-dir russian_language_offline
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+
+from content_profiles import FLAGS_FIELD, PROFILES_KEY
+from corpus_format import is_binary_corpus, read_corpus
+from precompress import VARIANTS, print_variants_table, write_variants
+from word_features import features_to_json
+
+HASH_LENGTH = 12
+
+def is_base_noun(features):
+    return (features.get('pos') == 'NOUN' and features.get('case') == 'NOMINATIVE' and
+            features.get('number') == 'SINGULAR')
+
+def is_base_form(features):
+    pos = features.get('pos')
+    if pos in ('NOUN', 'ADJECTIVE'):
+        return features.get('case') == 'NOMINATIVE' and features.get('number') == 'SINGULAR'
+    if pos == 'VERB':
+        return features.get('mood') == 'INFINITIVE'
+    return pos in ('ADVERB', 'CONJUNCTION')
+
+def noun_declension(word, features):
+    declension = features.get('declension')
+    # Резервное правило страницы для старых корпусов: муж. р. без -а/-я не 1-го склонения
+    if (declension == '1st' and features.get('gender') == 'MASCULINE' and
+            not word.endswith('а') and not word.endswith('я')):
+        return '2nd'
+    return declension
+
+# Упражнение -> (подходит ли слово, ответ слова, корзины по порядку)
+EXERCISES = {
+    'declension': (is_base_noun, noun_declension,
+                   ['1st', '2nd', '3rd', 'indeclinable', 'heteroclitic']),
+    'conjugation': (lambda features: features.get('pos') == 'VERB' and features.get('mood') == 'INFINITIVE',
+                    lambda word, features: features.get('conjugation'),
+                    ['1st', '2nd']),
+    'parts-of-speech': (is_base_form, lambda word, features: features.get('pos'),
+                        ['NOUN', 'ADJECTIVE', 'VERB', 'ADVERB', 'CONJUNCTION']),
+}
+
+def corpus_stem(corpus_path):
+    return os.path.splitext(os.path.basename(corpus_path))[0]
+
+def manifest_path(corpus_path, output_dir=None):
+    """opencorpora.json -> opencorpora.manifest.json (рядом с корпусом или в output_dir)"""
+    return os.path.join(output_dir or os.path.dirname(corpus_path), f'{corpus_stem(corpus_path)}.manifest.json')
+
+def shard_name(corpus_path, exercise, category):
+    return f'{corpus_stem(corpus_path)}.{exercise}.{category.lower()}.json'
+
+def build_exercise_shards(corpus):
+    """
+    Наборы слов всех упражнений за один проход по корпусу:
+    {упражнение: [набор корзины 0, набор корзины 1, ...]}
+    """
+    buckets = {exercise: {answer: number for number, answer in enumerate(categories)}
+               for exercise, (_, _, categories) in EXERCISES.items()}
+    shards = {exercise: [{'exercise': exercise, 'category': number, 'words': [], 'flags': {}}
+                         for number in range(len(categories))]
+              for exercise, (_, _, categories) in EXERCISES.items()}
+
+    for word, features in corpus['metadata']['words'].items():
+        flags = features.get(FLAGS_FIELD)
+        for exercise, (eligible, answer, _) in EXERCISES.items():
+            if not eligible(features):
+                continue
+            # Слова без правильной корзины в упражнение не попадают
+            category = buckets[exercise].get(answer(word, features))
+            if category is None:
+                continue
+            shard = shards[exercise][category]
+            shard['words'].append(word)
+            if flags:
+                shard['flags'][word] = flags
+
+    return shards
+
+def json_bytes(data):
+    """Компактный JSON в UTF-8"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=features_to_json).encode('utf-8')
+
+def hashed_name(name, data):
+    """opencorpora.declension.1st.json -> opencorpora.declension.1st.<хеш содержимого>.json"""
+    stem, ext = os.path.splitext(name)
+    return f'{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}'
+
+def write_hashed(directory, name, data):
+    """
+    Записывает data и ее сжатые варианты в файлы с хешем содержимого в имени
+    (если их еще нет), возвращает имя
+    """
+    name = hashed_name(name, data)
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        with open(path + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(path + '.tmp', path)
+    write_variants(path, data)
+    return name
+
+def manifest_files(manifest):
+    """Имена всех файлов, на которые ссылается манифест"""
+    files = {manifest['corpus']} if manifest.get('corpus') else set()
+    for exercise in manifest.get('exercises', {}).values():
+        files.update(exercise['shards'])
+    return files
+
+def remove_stale_files(directory, stem, keep):
+    """
+    Удаляет наборы слов stem.<упражнение>.<корзина>.<хеш>.json, копии корпуса
+    stem.<хеш>.json и их сжатые варианты, которых нет в keep; возвращает число
+    удаленных. Другие файлы с тем же началом имени не трогаются.
+    """
+    # Между stem и хешем - только имя набора слов (shard_name) или ничего (копия корпуса)
+    shards = '|'.join(re.escape(f'{exercise}.{category.lower()}')
+                      for exercise, (_, _, categories) in EXERCISES.items() for category in categories)
+    pattern = re.compile(rf'({re.escape(stem)}\.(?:(?:{shards})\.)?[0-9a-f]{{{HASH_LENGTH}}}\.json)(?:\.gz|\.br)?')
+    removed = 0
+    for name in os.listdir(directory or '.'):
+        match = pattern.fullmatch(name)
+        if match and match.group(1) not in keep:
+            os.remove(os.path.join(directory, name))
+            removed += 1
+    return removed
+
+def write_exercise_shards(corpus, corpus_path, output_dir=None):
+    """
+    Записывает наборы слов упражнений и копию корпуса (JSON) под именами с хешем
+    содержимого, затем манифест; возвращает [(путь, слов)]. corpus уже должен
+    быть сохранен в corpus_path.
+    """
+    directory = output_dir or os.path.dirname(corpus_path)
+    metadata = corpus['metadata']
+    manifest = {
+        'revision': metadata.get('revision'),
+        'total_words': len(metadata['words']),
+        'content_profiles': metadata.get(PROFILES_KEY, []),
+        'corpus': None,
+        'exercises': {}
+    }
+
+    written = []
+    # Страница читает только JSON; для .rlc копия корпуса не нужна
+    if not is_binary_corpus(corpus_path):
+        manifest['corpus'] = write_hashed(directory, os.path.basename(corpus_path), json_bytes(corpus))
+        written.append((os.path.join(directory, manifest['corpus']), manifest['total_words']))
+
+    for exercise, exercise_shards in build_exercise_shards(corpus).items():
+        categories = EXERCISES[exercise][2]
+        names = []
+        for category, shard in zip(categories, exercise_shards):
+            name = write_hashed(directory, shard_name(corpus_path, exercise, category), json_bytes(shard))
+            names.append(name)
+            written.append((os.path.join(directory, name), len(shard['words'])))
+        manifest['exercises'][exercise] = {
+            'categories': categories,
+            'shards': names,
+            'words': [len(shard['words']) for shard in exercise_shards]
+        }
+
+    # Манифест заменяется последним и атомарно: он ссылается только на готовые файлы
+    path = manifest_path(corpus_path, output_dir)
+    keep = manifest_files(manifest)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            keep |= manifest_files(json.load(f))
+    except (OSError, ValueError):
+        pass
+    data = json_bytes(manifest)
+    with open(path + '.tmp', 'wb') as f:
+        f.write(data)
+    os.replace(path + '.tmp', path)
+    write_variants(path, data, force=True)
+    written.append((path, manifest['total_words']))
+
+    remove_stale_files(directory, corpus_stem(corpus_path), keep)
+    return written
+
+def print_shards(written):
+    for path, count in written:
+        print(f"  ✅ {os.path.basename(path)}: {count} слов ({os.path.getsize(path) / 1024:.1f} KB)")
+    print(f"\n  Сжатые варианты ({', '.join(VARIANTS)}):")
+    print_variants_table([path for path, _ in written])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Наборы слов упражнений и манифест для приложения')
+    parser.add_argument('corpus_file')
+    parser.add_argument('--output-dir', help='каталог для файлов (по умолчанию - каталог корпуса)')
+    args = parser.parse_args()
+
+    corpus = read_corpus(args.corpus_file)
+    print(f"Корпус {args.corpus_file}: {len(corpus['metadata']['words'])} слов")
+    print_shards(write_exercise_shards(corpus, args.corpus_file, args.output_dir))
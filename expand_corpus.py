@@ -2,27 +2,58 @@
 # -*- coding: utf-8 -*-
 """
 Скрипт для расширения корпуса слов и тщательной проверки склонений и спряжений
+
+Новые слова отбираются стратифицированной выборкой: у каждой части речи своя
+квота, внутри нее - доли склонений (существительные) и спряжений (глаголы).
+Выборка детерминирована: ключ слова - хеш от зерна и самого слова, в каждой
+страте держится резервуар из слов с наименьшими ключами (куча). Поэтому
+одно и то же зерно дает один и тот же корпус независимо от порядка слов в
+источнике, а источник .rlc читается потоком, без загрузки целиком.
+
+Использование:
+    python3 expand_corpus.py
+    python3 expand_corpus.py --seed 7 --source opencorpora_full.rlc --output opencorpora_extended.json
 """
 
-import json
-import random
-import re
+import argparse
+import hashlib
+import heapq
 from collections import defaultdict
 
+from corpus_format import open_corpus_words, read_corpus, write_corpus
+from conjugation_engine import EXPAND_CONJUGATION
+from declension_engine import EXPAND_DECLENSION
+
+DEFAULT_SEED = 42
+
+# Квоты новых слов по частям речи (всего 4000)
+SAMPLE_QUOTAS = {
+    'NOUN': 1800,
+    'VERB': 1000,
+    'ADJECTIVE': 700,
+    'ADVERB': 350,
+    'CONJUNCTION': 150
+}
+
+# Доли склонений и спряжений внутри квоты; недобор редких классов
+# добирается словами других классов той же части речи
+CLASS_SHARES = {
+    'NOUN': {'1st': 0.35, '2nd': 0.35, '3rd': 0.2, 'indeclinable': 0.05, 'heteroclitic': 0.05},
+    'VERB': {'1st': 0.6, '2nd': 0.4},
+}
+
 def load_corpus(filename):
-    """Загружает корпус из JSON файла"""
+    """Загружает корпус из JSON или .rlc файла"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return read_corpus(filename)
     except Exception as e:
         print(f"Ошибка загрузки {filename}: {e}")
         return None
 
 def save_corpus(corpus, filename):
-    """Сохраняет корпус в JSON файл"""
+    """Сохраняет корпус в JSON или .rlc файл (по расширению)"""
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(corpus, f, ensure_ascii=False, indent=2)
+        write_corpus(corpus, filename)
         print(f"✅ Корпус сохранен в {filename}")
         return True
     except Exception as e:
@@ -31,57 +62,11 @@ def save_corpus(corpus, filename):
 
 def determine_declension_correct(word, features):
     """Определяет правильное склонение для существительного"""
-    word_lower = word.lower()
-    
-    # Разносклоняемые существительные (на -мя)
-    heteroclitic_words = [
-        'время', 'имя', 'племя', 'знамя', 'пламя', 'стремя', 'темя', 
-        'семя', 'бремя', 'вымя', 'племя', 'время', 'имя', 'знамя'
-    ]
-    if word_lower in heteroclitic_words:
-        return 'heteroclitic'
-    
-    # Несклоняемые существительные
-    indeclinable_words = [
-        'кофе', 'пальто', 'кино', 'такси', 'метро', 'кафе', 'меню', 
-        'алоэ', 'какао', 'радио', 'шоу', 'казино', 'кабаре', 'бюро', 
-        'депо', 'фойе', 'ателье', 'пенсне', 'колье', 'какаду', 'кенгуру',
-        'шимпанзе', 'какао', 'радио', 'метро', 'кино', 'такси'
-    ]
-    if word_lower in indeclinable_words:
-        return 'indeclinable'
-    
-    # Определение по окончаниям
-    if word_lower.endswith('а') or word_lower.endswith('я'):
-        return '1st'
-    elif word_lower.endswith('о') or word_lower.endswith('е'):
-        return '2nd'
-    elif word_lower.endswith('ь'):
-        return '3rd'
-    else:
-        # Мужской род без окончания - обычно 2-е склонение
-        if features.get('gender') == 'MASCULINE':
-            return '2nd'
-        # По умолчанию 1-е склонение
-        return '1st'
+    return EXPAND_DECLENSION.classify(word.lower(), features.get('gender'))
 
 def determine_conjugation_correct(word, features):
     """Определяет правильное спряжение для глагола"""
-    word_lower = word.lower()
-    
-    # Исключения для 1-го спряжения
-    first_conjugation_exceptions = ['брить', 'стелить', 'зиждиться']
-    if word_lower in first_conjugation_exceptions:
-        return '1st'
-    
-    # 2-е спряжение по окончаниям
-    second_conjugation_endings = ['ить', 'ать', 'ять', 'еть', 'уть', 'оть']
-    for ending in second_conjugation_endings:
-        if word_lower.endswith(ending):
-            return '2nd'
-    
-    # По умолчанию 1-е спряжение
-    return '1st'
+    return EXPAND_CONJUGATION.classify(word.lower())
 
 def fix_word_features(word, features):
     """Исправляет морфологические признаки слова"""
@@ -106,72 +91,133 @@ def fix_word_features(word, features):
     
     return fixed_features
 
-def expand_corpus_with_verification():
+def is_exercise_form(features):
+    """Базовая форма, подходящая для упражнений"""
+    pos = features.get('pos')
+    if pos in ('NOUN', 'ADJECTIVE'):
+        return features.get('case') == 'NOMINATIVE' and features.get('number') == 'SINGULAR'
+    if pos == 'VERB':
+        return features.get('mood') == 'INFINITIVE'
+    return pos in ('ADVERB', 'CONJUNCTION')
+
+def sample_key(seed, word):
+    """Детерминированный псевдослучайный ключ слова для данного зерна"""
+    digest = hashlib.blake2b(word.encode('utf-8'), digest_size=8, key=str(seed).encode('utf-8')).digest()
+    return int.from_bytes(digest, 'big')
+
+def word_class(features):
+    """Класс слова внутри части речи: склонение или спряжение"""
+    pos = features.get('pos')
+    if pos == 'NOUN':
+        return features.get('declension')
+    if pos == 'VERB':
+        return features.get('conjugation')
+    return None
+
+class StratifiedSampler:
+    """
+    Стратифицированная выборка из потока слов с квотами.
+
+    Страта - (часть речи, класс). В каждой страте куча хранит не больше
+    квоты части речи слов с наименьшими ключами sample_key: это равномерная
+    выборка из всех слов страты, которая не зависит от порядка потока.
+    select() берет из каждого класса его долю квоты, а недобор заполняет
+    словами с наименьшими ключами из остальных классов той же части речи.
+    """
+
+    def __init__(self, quotas=SAMPLE_QUOTAS, class_shares=CLASS_SHARES, seed=DEFAULT_SEED):
+        self.quotas = quotas
+        self.class_shares = class_shares
+        self.seed = seed
+        self.reservoirs = defaultdict(list)  # страта -> куча (-ключ, слово, признаки)
+        self.seen = defaultdict(int)
+
+    def add(self, word, features):
+        pos = features.get('pos')
+        size = self.quotas.get(pos)
+        if not size:
+            return
+        stratum = (pos, word_class(features))
+        self.seen[stratum] += 1
+
+        entry = (-sample_key(self.seed, word), word, features)
+        reservoir = self.reservoirs[stratum]
+        if len(reservoir) < size:
+            heapq.heappush(reservoir, entry)
+        elif entry > reservoir[0]:
+            heapq.heapreplace(reservoir, entry)
+
+    def select(self):
+        """Отобранные слова: {слово: признаки} по частям речи и алфавиту, и {страта: отобрано}"""
+        selected = {}
+        taken_by_stratum = defaultdict(int)
+        for pos, quota in self.quotas.items():
+            shares = self.class_shares.get(pos, {})
+            taken = []
+            rest = []
+            for (stratum_pos, word_cls), reservoir in self.reservoirs.items():
+                if stratum_pos != pos:
+                    continue
+                entries = sorted(reservoir, reverse=True)  # по возрастанию ключа
+                count = min(len(entries), int(quota * shares.get(word_cls, 0)))
+                taken += entries[:count]
+                rest += entries[count:]
+            rest.sort(reverse=True)
+            taken += rest[:quota - len(taken)]
+
+            for _, word, features in sorted(taken, key=lambda entry: entry[1]):
+                selected[word] = features
+                taken_by_stratum[(pos, word_class(features))] += 1
+        return selected, taken_by_stratum
+
+def print_sample_stats(sampler, taken_by_stratum):
+    print(f"   {'Часть речи':<12} {'Класс':<14} {'Найдено':>8} {'Отобрано':>9}")
+    for pos in sampler.quotas:
+        for (stratum_pos, word_cls), seen in sorted(sampler.seen.items(), key=lambda item: str(item[0])):
+            if stratum_pos == pos:
+                print(f"   {pos:<12} {str(word_cls or '-'):<14} {seen:>8} {taken_by_stratum[(pos, word_cls)]:>9}")
+
+def expand_corpus_with_verification(current_file='opencorpora.json', source_file='opencorpora_fixed.json',
+                                    output_file='opencorpora_extended.json', seed=DEFAULT_SEED):
     """Расширяет корпус и проводит тщательную проверку"""
     print("🔄 Начинаем расширение корпуса...")
     
     # Загружаем текущий корпус
-    current_corpus = load_corpus('opencorpora.json')
+    current_corpus = load_corpus(current_file)
     if not current_corpus:
         print("❌ Не удалось загрузить текущий корпус")
         return False
     
-    # Загружаем большой корпус для расширения
-    large_corpus = load_corpus('opencorpora_fixed.json')
-    if not large_corpus:
-        print("❌ Не удалось загрузить большой корпус")
+    # Открываем большой корпус для расширения (.rlc читается потоком)
+    try:
+        source_words = open_corpus_words(source_file)
+    except Exception as e:
+        print(f"❌ Не удалось загрузить большой корпус: {e}")
         return False
     
     print(f"📊 Текущий корпус: {current_corpus['metadata']['total_words']} слов")
-    print(f"📊 Большой корпус: {large_corpus['metadata']['total_words']} слов")
+    print(f"📊 Большой корпус: {len(source_words)} слов")
     
     # Получаем существующие слова
     existing_words = set(current_corpus['metadata']['words'].keys())
     
-    # Фильтруем новые слова из большого корпуса
-    new_words = {}
-    words_by_type = defaultdict(list)
-    
-    for word, features in large_corpus['metadata']['words'].items():
-        if word not in existing_words:
-            # Проверяем, что это подходящее слово для упражнений
-            if (features.get('pos') in ['NOUN', 'VERB', 'ADJECTIVE', 'ADVERB', 'CONJUNCTION'] and
-                features.get('case') == 'NOMINATIVE' and 
-                features.get('number') == 'SINGULAR'):
-                
+    # Отбираем новые слова из потока слов большого корпуса
+    sampler = StratifiedSampler(seed=seed)
+    try:
+        for word, features in source_words.items():
+            # Проверяем, что это новое подходящее слово для упражнений
+            if word not in existing_words and is_exercise_form(features):
                 # Исправляем морфологические признаки
-                fixed_features = fix_word_features(word, features)
-                new_words[word] = fixed_features
-                
-                # Группируем по частям речи
-                words_by_type[fixed_features.get('pos')].append(word)
-    
-    print(f"📝 Найдено {len(new_words)} новых подходящих слов")
-    print(f"   - Существительные: {len(words_by_type['NOUN'])}")
-    print(f"   - Глаголы: {len(words_by_type['VERB'])}")
-    print(f"   - Прилагательные: {len(words_by_type['ADJECTIVE'])}")
-    print(f"   - Наречия: {len(words_by_type['ADVERB'])}")
-    print(f"   - Союзы: {len(words_by_type['CONJUNCTION'])}")
-    
-    # Выбираем 4000 лучших слов
-    target_count = 4000
-    selected_words = {}
-    
-    # Приоритет: существительные и глаголы для упражнений
-    priority_order = ['NOUN', 'VERB', 'ADJECTIVE', 'ADVERB', 'CONJUNCTION']
-    
-    for pos in priority_order:
-        if len(selected_words) >= target_count:
-            break
-        
-        words_of_type = words_by_type[pos]
-        random.shuffle(words_of_type)  # Случайный порядок
-        
-        for word in words_of_type:
-            if len(selected_words) >= target_count:
-                break
-            selected_words[word] = new_words[word]
+                sampler.add(word, fix_word_features(word, features))
+    finally:
+        # .rlc открыт через mmap (CorpusReader): после выборки он больше не нужен
+        if hasattr(source_words, 'close'):
+            source_words.close()
+    
+    selected_words, taken_by_stratum = sampler.select()
     
+    print(f"📝 Найдено {sum(sampler.seen.values())} новых подходящих слов (зерно выборки: {seed})")
+    print_sample_stats(sampler, taken_by_stratum)
     print(f"✅ Выбрано {len(selected_words)} слов для добавления")
     
     # Добавляем новые слова в корпус
@@ -222,14 +268,21 @@ def expand_corpus_with_verification():
         print("✅ Все склонения и спряжения корректны!")
     
     # Сохраняем расширенный корпус
-    if save_corpus(current_corpus, 'opencorpora_extended.json'):
+    if save_corpus(current_corpus, output_file):
         print(f"🎉 Корпус успешно расширен до {current_corpus['metadata']['total_words']} слов!")
         return True
     
     return False
 
 if __name__ == "__main__":
-    success = expand_corpus_with_verification()
+    parser = argparse.ArgumentParser(description='Расширение корпуса стратифицированной выборкой')
+    parser.add_argument('--current', default='opencorpora.json', help='текущий корпус')
+    parser.add_argument('--source', default='opencorpora_fixed.json', help='большой корпус (JSON или .rlc)')
+    parser.add_argument('--output', default='opencorpora_extended.json')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='зерно выборки')
+    args = parser.parse_args()
+
+    success = expand_corpus_with_verification(args.current, args.source, args.output, args.seed)
     if success:
         print("\n✅ Расширение корпуса завершено успешно!")
     else:
@@ -1,81 +1,53 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 import sys
 
-def fix_conjugations(input_json_path, output_json_path):
+from conjugation_engine import BASIC_CONJUGATION
+from corpus_format import read_corpus, write_corpus
+
+def fix_conjugations_in_words(words_data):
     """
     Исправляет спряжения глаголов согласно правилам русского языка
+    (словарь metadata.words изменяется на месте, возвращается число исправлений)
     """
-    print(f"Загружаем корпус из {input_json_path}...")
-    with open(input_json_path, 'r', encoding='utf-8') as f:
-        corpus = json.load(f)
-
-    words_data = corpus['metadata']['words']
-    total_words = len(words_data)
-    print(f"Всего слов в корпусе: {total_words}")
-
     fixed_count = 0
     
-    # Правила определения спряжения глаголов
-    # 1-е спряжение: глаголы на -ать, -ять, -еть (кроме исключений), -уть, -оть
-    # 2-е спряжение: глаголы на -ить (кроме исключений), -еть (исключения), -ать (исключения)
-    
-    # Исключения для 2-го спряжения (глаголы на -ать, -еть, которые спрягаются как 2-е)
-    second_conjugation_exceptions = {
-        'дышать', 'слышать', 'держать', 'гнать', 'терпеть', 'обидеть', 'зависеть', 
-        'ненавидеть', 'видеть', 'вертеть', 'обидеться', 'строить', 'любить', 
-        'ненавидеть', 'терпеть', 'обидеть', 'зависеть', 'ненавидеть', 'смотреть',
-        'говорить', 'слышать', 'дышать', 'держать', 'гнать', 'терпеть', 'обидеть',
-        'зависеть', 'ненавидеть', 'видеть', 'вертеть', 'обидеться', 'строить'
-    }
-    
-    # Исключения для 1-го спряжения (глаголы на -ить, которые спрягаются как 1-е)
-    first_conjugation_exceptions = {
-        'брить', 'стелить', 'зиждиться'
-    }
+    # Правила определения спряжения по окончанию инфинитива (с исключениями)
+    # собраны в conjugation_engine.BASIC_CONJUGATION
 
     print("Начинаем исправления спряжений...")
     
-    for word, features in words_data.items():
-        if features.get('pos') != 'VERB':
+    verbs = [(word, features) for word, features in words_data.items() if features.get('pos') == 'VERB']
+    conjugations = BASIC_CONJUGATION.classify_many((word, None) for word, _ in verbs)
+    
+    for (word, features), new_conjugation in zip(verbs, conjugations):
+        # Для остальных случаев оставляем как есть
+        if new_conjugation is None:
             continue
-            
-        original_conjugation = features.get('conjugation')
-        current_conjugation = original_conjugation
         
-        # Определяем спряжение по окончанию инфинитива
-        if word.endswith('ить'):
-            if word in first_conjugation_exceptions:
-                new_conjugation = '1st'
-            else:
-                new_conjugation = '2nd'
-        elif word.endswith(('ать', 'ять', 'еть', 'уть', 'оть')):
-            if word in second_conjugation_exceptions:
-                new_conjugation = '2nd'
-            else:
-                new_conjugation = '1st'
-        elif word.endswith('чь'):  # глаголы на -чь обычно 1-е спряжение
-            new_conjugation = '1st'
-        elif word.endswith('чься'):  # возвратные глаголы на -чься
-            new_conjugation = '1st'
-        else:
-            # Для остальных случаев оставляем как есть или определяем по контексту
-            continue
+        original_conjugation = features.get('conjugation')
         
         # Применяем исправление только если оно отличается от текущего
-        if current_conjugation != new_conjugation:
+        if original_conjugation != new_conjugation:
             features['conjugation'] = new_conjugation
             print(f"  {word}: {original_conjugation} -> {new_conjugation}")
             fixed_count += 1
-            current_conjugation = new_conjugation
-        
-        # Если спряжение не было определено (None), устанавливаем его
-        elif current_conjugation is None:
-            features['conjugation'] = new_conjugation
-            print(f"  {word}: None -> {new_conjugation}")
-            fixed_count += 1
+
+    return fixed_count
+
+def fix_conjugations(input_json_path, output_json_path):
+    """
+    Исправляет спряжения глаголов согласно правилам русского языка
+    """
+    print(f"Загружаем корпус из {input_json_path}...")
+    corpus = read_corpus(input_json_path)
+
+    words_data = corpus['metadata']['words']
+    total_words = len(words_data)
+    print(f"Всего слов в корпусе: {total_words}")
+
+    fixed_count = fix_conjugations_in_words(words_data)
 
     print(f"\nИсправления завершены!")
     print(f"Исправлено спряжений: {fixed_count}")
@@ -91,14 +63,12 @@ def fix_conjugations(input_json_path, output_json_path):
         }
     }
 
-    with open(output_json_path, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    write_corpus(output_data, output_json_path)
     print(f"Исправленный корпус сохранен в {output_json_path}")
 
     # Проверяем результаты
     print(f"\nПроверяем результаты в {output_json_path}...")
-    with open(output_json_path, 'r', encoding='utf-8') as f:
-        fixed_corpus = json.load(f)
+    fixed_corpus = read_corpus(output_json_path)
     
     conjugation_counts = {}
     for word, features in fixed_corpus['metadata']['words'].items():
@@ -1,76 +1,31 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 import sys
 
-def fix_conjugations_advanced(input_json_path, output_json_path):
+from conjugation_engine import FORMS_CONJUGATION, FORMS_DEFAULT
+from corpus_format import read_corpus, write_corpus
+
+def fix_conjugations_advanced_in_words(words_data):
     """
     Исправляет спряжения глаголов, определяя их по формам
+    (словарь metadata.words изменяется на месте, возвращается число исправлений)
     """
-    print(f"Загружаем корпус из {input_json_path}...")
-    with open(input_json_path, 'r', encoding='utf-8') as f:
-        corpus = json.load(f)
-
-    words_data = corpus['metadata']['words']
-    total_words = len(words_data)
-    print(f"Всего слов в корпусе: {total_words}")
-
     fixed_count = 0
     
-    # Правила определения спряжения по формам глаголов
+    # Правила определения спряжения по формам глаголов (conjugation_engine.FORMS_CONJUGATION)
     # 1-е спряжение: окончания -у/-ю, -ешь/-ёшь, -ет/-ёт, -ем/-ём, -ете/-ёте, -ут/-ют
     # 2-е спряжение: окончания -у/-ю, -ишь, -ит, -им, -ите, -ат/-ят
     
     print("Начинаем исправления спряжений по формам...")
     
-    for word, features in words_data.items():
-        if features.get('pos') != 'VERB':
-            continue
-            
+    verbs = [(word, features) for word, features in words_data.items() if features.get('pos') == 'VERB']
+    conjugations = FORMS_CONJUGATION.classify_many((word, features.get('mood')) for word, features in verbs)
+    
+    for (word, features), conjugation in zip(verbs, conjugations):
         original_conjugation = features.get('conjugation')
         mood = features.get('mood')
         
-        # Определяем спряжение по окончаниям форм
-        conjugation = None
-        
-        # Инфинитивы
-        if mood == 'INFINITIVE':
-            if word.endswith('ить'):
-                conjugation = '2nd'
-            elif word.endswith(('ать', 'ять', 'еть', 'уть', 'оть')):
-                # Исключения для 2-го спряжения
-                second_conj_exceptions = {
-                    'дышать', 'слышать', 'держать', 'гнать', 'терпеть', 'обидеть', 
-                    'зависеть', 'ненавидеть', 'видеть', 'вертеть', 'обидеться', 'строить'
-                }
-                if word in second_conj_exceptions:
-                    conjugation = '2nd'
-                else:
-                    conjugation = '1st'
-            elif word.endswith('чь'):
-                conjugation = '1st'
-        
-        # Формы настоящего времени (изъявительное наклонение)
-        elif mood == 'INDICATIVE':
-            # 2-е спряжение: окончания -ит, -ат/-ят, -ишь, -ите, -им
-            if (word.endswith(('ит', 'ат', 'ят', 'ишь', 'ите', 'им')) or 
-                word.endswith(('ится', 'атся', 'ятся', 'ишься', 'итесь', 'имся'))):
-                conjugation = '2nd'
-            # 1-е спряжение: окончания -ет/-ёт, -ут/-ют, -ешь/-ёшь, -ете/-ёте, -ем/-ём
-            elif (word.endswith(('ет', 'ёт', 'ут', 'ют', 'ешь', 'ёшь', 'ете', 'ёте', 'ем', 'ём')) or
-                  word.endswith(('ется', 'ётся', 'утся', 'ются', 'ешься', 'ёшься', 'етесь', 'ётесь', 'емся', 'ёмся'))):
-                conjugation = '1st'
-        
-        # Повелительное наклонение
-        elif mood == 'IMPERATIVE':
-            # 2-е спряжение: окончания -и, -ите
-            if word.endswith(('и', 'ите')):
-                conjugation = '2nd'
-            # 1-е спряжение: окончания -й, -йте
-            elif word.endswith(('й', 'йте')):
-                conjugation = '1st'
-        
         # Применяем исправление
         if conjugation and original_conjugation != conjugation:
             features['conjugation'] = conjugation
@@ -78,15 +33,27 @@ def fix_conjugations_advanced(input_json_path, output_json_path):
             fixed_count += 1
         elif conjugation is None and original_conjugation is None:
             # Для глаголов, которые не удалось классифицировать, попробуем по общим правилам
-            if word.endswith(('ать', 'ять', 'еть', 'уть', 'оть')):
-                features['conjugation'] = '1st'
-                print(f"  {word}: None -> 1st (по умолчанию)")
-                fixed_count += 1
-            elif word.endswith('ить'):
-                features['conjugation'] = '2nd'
-                print(f"  {word}: None -> 2nd (по умолчанию)")
+            conjugation = FORMS_DEFAULT.classify(word)
+            if conjugation:
+                features['conjugation'] = conjugation
+                print(f"  {word}: None -> {conjugation} (по умолчанию)")
                 fixed_count += 1
 
+    return fixed_count
+
+def fix_conjugations_advanced(input_json_path, output_json_path):
+    """
+    Исправляет спряжения глаголов, определяя их по формам
+    """
+    print(f"Загружаем корпус из {input_json_path}...")
+    corpus = read_corpus(input_json_path)
+
+    words_data = corpus['metadata']['words']
+    total_words = len(words_data)
+    print(f"Всего слов в корпусе: {total_words}")
+
+    fixed_count = fix_conjugations_advanced_in_words(words_data)
+
     print(f"\nИсправления завершены!")
     print(f"Исправлено спряжений: {fixed_count}")
 
@@ -101,14 +68,12 @@ def fix_conjugations_advanced(input_json_path, output_json_path):
         }
     }
 
-    with open(output_json_path, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    write_corpus(output_data, output_json_path)
     print(f"Исправленный корпус сохранен в {output_json_path}")
 
     # Проверяем результаты
     print(f"\nПроверяем результаты в {output_json_path}...")
-    with open(output_json_path, 'r', encoding='utf-8') as f:
-        fixed_corpus = json.load(f)
+    fixed_corpus = read_corpus(output_json_path)
     
     conjugation_counts = {}
     for word, features in fixed_corpus['metadata']['words'].items():
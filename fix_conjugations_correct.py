@@ -1,92 +1,35 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 import sys
 
-def fix_conjugations_correct(input_json_path, output_json_path):
+from conjugation_engine import CORRECT_CONJUGATION, INFINITIVE_DEFAULT
+from corpus_format import read_corpus, write_corpus
+
+def fix_conjugations_correct_in_words(words_data):
     """
     Исправляет спряжения глаголов согласно точному алгоритму русского языка
+    (словарь metadata.words изменяется на месте, возвращается число исправлений)
     """
-    print(f"Загружаем корпус из {input_json_path}...")
-    with open(input_json_path, 'r', encoding='utf-8') as f:
-        corpus = json.load(f)
-
-    words_data = corpus['metadata']['words']
-    total_words = len(words_data)
-    print(f"Всего слов в корпусе: {total_words}")
-
     fixed_count = 0
     
     # Алгоритм определения спряжения согласно правилам русского языка
-    
-    # 1-е спряжение: инфинитивы на -ать, -ять, -ыть, -уть, -оть, -ти, -чь
-    # + исключения: брить, стелить (стлать), зиждиться
-    first_conjugation_endings = ['ать', 'ять', 'ыть', 'уть', 'оть', 'ти', 'чь']
-    first_conjugation_exceptions = ['брить', 'стелить', 'стлать', 'зиждиться']
-    
-    # 2-е спряжение: инфинитивы на -ить (кроме исключений из 1-го)
-    # + исключения: слышать, дышать, держать, гнать, терпеть, вертеть, 
-    # обидеть, зависеть, ненавидеть, видеть, смотреть
-    second_conjugation_exceptions = [
-        'слышать', 'дышать', 'держать', 'гнать', 'терпеть', 'вертеть',
-        'обидеть', 'зависеть', 'ненавидеть', 'видеть', 'смотреть'
-    ]
-    
-    # Разноспрягаемые глаголы
-    heteroclitic_verbs = ['есть', 'дать', 'хотеть', 'бежать', 'брезжить']
+    # (conjugation_engine.CORRECT_CONJUGATION):
+    # 1-2. ударные окончания 3-го лица: Е(Ё), У, Ю - 1 спр., И, А, Я - 2 спр.
+    # 3-4. безударные - по инфинитиву: -ать, -ять, -ыть, -уть, -оть, -ти, -чь - 1 спр.,
+    #      -ить - 2 спр., с исключениями (брить, стелить; слышать, дышать, ...)
+    # 5. приставка вы- отбрасывается
+    # 6. разноспрягаемые глаголы
 
     print("Начинаем исправления спряжений по точному алгоритму...")
     
-    for word, features in words_data.items():
-        if features.get('pos') != 'VERB':
-            continue
-            
+    verbs = [(word, features) for word, features in words_data.items() if features.get('pos') == 'VERB']
+    conjugations = CORRECT_CONJUGATION.classify_many((word, features.get('mood')) for word, features in verbs)
+    
+    for (word, features), conjugation in zip(verbs, conjugations):
         original_conjugation = features.get('conjugation')
         mood = features.get('mood')
         
-        # Определяем спряжение по алгоритму
-        conjugation = None
-        
-        # Шаг 1-2: Проверяем ударные окончания в 3 лице
-        if mood == 'INDICATIVE' and word.endswith(('ет', 'ёт', 'ит', 'ат', 'ят', 'ут', 'ют')):
-            # Ударные окончания: Е(Ё), У, Ю – 1 спр., И, А, Я – 2 спр.
-            if word.endswith(('ет', 'ёт', 'ут', 'ют')):
-                conjugation = '1st'
-            elif word.endswith(('ит', 'ат', 'ят')):
-                conjugation = '2nd'
-        
-        # Шаг 3-4: Если окончание безударное, проверяем инфинитив
-        elif mood == 'INFINITIVE':
-            # 4А: 1-е спряжение
-            if (any(word.endswith(ending) for ending in first_conjugation_endings) or 
-                word in first_conjugation_exceptions):
-                conjugation = '1st'
-            # 4Б: 2-е спряжение
-            elif (word.endswith('ить') or word in second_conjugation_exceptions):
-                conjugation = '2nd'
-        
-        # Шаг 5: Учитываем приставку вы-
-        elif word.startswith('вы') and len(word) > 3:
-            # Отбрасываем приставку вы- и проверяем корень
-            root = word[2:]  # убираем "вы"
-            if root.endswith(('ет', 'ёт', 'ут', 'ют')):
-                conjugation = '1st'
-            elif root.endswith(('ит', 'ат', 'ят')):
-                conjugation = '2nd'
-        
-        # Шаг 6: Разноспрягаемые глаголы
-        elif word in heteroclitic_verbs:
-            conjugation = 'heteroclitic'
-        
-        # Дополнительная проверка по формам
-        else:
-            # Проверяем по окончаниям форм
-            if word.endswith(('ет', 'ёт', 'ут', 'ют', 'ешь', 'ёшь', 'ете', 'ёте', 'ем', 'ём')):
-                conjugation = '1st'
-            elif word.endswith(('ит', 'ат', 'ят', 'ишь', 'ите', 'им')):
-                conjugation = '2nd'
-        
         # Применяем исправление
         if conjugation and original_conjugation != conjugation:
             features['conjugation'] = conjugation
@@ -94,15 +37,27 @@ def fix_conjugations_correct(input_json_path, output_json_path):
             fixed_count += 1
         elif conjugation is None and original_conjugation is None:
             # Для глаголов, которые не удалось классифицировать
-            if word.endswith(('ать', 'ять', 'ыть', 'уть', 'оть', 'ти', 'чь')):
-                features['conjugation'] = '1st'
-                print(f"  {word}: None -> 1st (по умолчанию)")
-                fixed_count += 1
-            elif word.endswith('ить'):
-                features['conjugation'] = '2nd'
-                print(f"  {word}: None -> 2nd (по умолчанию)")
+            conjugation = INFINITIVE_DEFAULT.classify(word)
+            if conjugation:
+                features['conjugation'] = conjugation
+                print(f"  {word}: None -> {conjugation} (по умолчанию)")
                 fixed_count += 1
 
+    return fixed_count
+
+def fix_conjugations_correct(input_json_path, output_json_path):
+    """
+    Исправляет спряжения глаголов согласно точному алгоритму русского языка
+    """
+    print(f"Загружаем корпус из {input_json_path}...")
+    corpus = read_corpus(input_json_path)
+
+    words_data = corpus['metadata']['words']
+    total_words = len(words_data)
+    print(f"Всего слов в корпусе: {total_words}")
+
+    fixed_count = fix_conjugations_correct_in_words(words_data)
+
     print(f"\nИсправления завершены!")
     print(f"Исправлено спряжений: {fixed_count}")
 
@@ -117,14 +72,12 @@ def fix_conjugations_correct(input_json_path, output_json_path):
         }
     }
 
-    with open(output_json_path, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    write_corpus(output_data, output_json_path)
     print(f"Исправленный корпус сохранен в {output_json_path}")
 
     # Проверяем результаты
     print(f"\nПроверяем результаты в {output_json_path}...")
-    with open(output_json_path, 'r', encoding='utf-8') as f:
-        fixed_corpus = json.load(f)
+    fixed_corpus = read_corpus(output_json_path)
     
     conjugation_counts = {}
     for word, features in fixed_corpus['metadata']['words'].items():
@@ -4,23 +4,14 @@
 Скрипт для исправления ошибок классификации склонений в корпусе OpenCorpora
 """
 
-import json
 import sys
 
-def fix_declensions(input_file, output_file):
+from corpus_format import read_corpus, write_corpus
+
+def fix_declensions_in_words(words):
     """
-    Исправляет ошибки классификации склонений в корпусе
+    Исправляет склонения в словаре metadata.words на месте и возвращает статистику
     """
-    print(f"Загружаем корпус из {input_file}...")
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
-        corpus = json.load(f)
-    
-    words = corpus['metadata']['words']
-    total_words = len(words)
-    
-    print(f"Всего слов в корпусе: {total_words}")
-    
     # Статистика исправлений
     corrections = {
         'masculine_to_2nd': 0,  # Мужские слова с нулевым окончанием -> 2-е склонение
@@ -92,6 +83,23 @@ def fix_declensions(input_file, output_file):
             if corrections['feminine_3rd'] <= 10:  # Показываем только первые 10
                 print(f"  {word}: {original_declension} -> 3rd (жен.р. на -ь)")
     
+    return corrections
+
+def fix_declensions(input_file, output_file):
+    """
+    Исправляет ошибки классификации склонений в корпусе
+    """
+    print(f"Загружаем корпус из {input_file}...")
+    
+    corpus = read_corpus(input_file)
+    
+    words = corpus['metadata']['words']
+    total_words = len(words)
+    
+    print(f"Всего слов в корпусе: {total_words}")
+    
+    corrections = fix_declensions_in_words(words)
+    
     print(f"\nИсправления завершены!")
     print(f"Статистика исправлений:")
     print(f"  Мужские слова с нулевым окончанием -> 2-е склонение: {corrections['masculine_to_2nd']}")
@@ -102,8 +110,7 @@ def fix_declensions(input_file, output_file):
     
     # Сохраняем исправленный корпус
     print(f"\nСохраняем исправленный корпус в {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(corpus, f, ensure_ascii=False, indent=2)
+    write_corpus(corpus, output_file)
     
     print(f"Готово! Исправленный корпус сохранен в {output_file}")
     
@@ -115,8 +122,7 @@ def verify_corrections(corpus_file):
     """
     print(f"\nПроверяем результаты в {corpus_file}...")
     
-    with open(corpus_file, 'r', encoding='utf-8') as f:
-        corpus = json.load(f)
+    corpus = read_corpus(corpus_file)
     
     words = corpus['metadata']['words']
     
@@ -4,37 +4,30 @@
 Скрипт для исправления ошибок в корпусе и добавления корзинки ошибок
 """
 
-import json
 import re
 
+from corpus_format import read_corpus, write_corpus
+
 def load_corpus(filename):
-    """Загружает корпус из JSON файла"""
+    """Загружает корпус из JSON или .rlc файла"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return read_corpus(filename)
     except Exception as e:
         print(f"Ошибка загрузки {filename}: {e}")
         return None
 
 def save_corpus(corpus, filename):
-    """Сохраняет корпус в JSON файл"""
+    """Сохраняет корпус в JSON или .rlc файл (по расширению)"""
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(corpus, f, ensure_ascii=False, indent=2)
+        write_corpus(corpus, filename)
         print(f"✅ Корпус сохранен в {filename}")
         return True
     except Exception as e:
         print(f"❌ Ошибка сохранения {filename}: {e}")
         return False
 
-def fix_indeclinable_words():
-    """Исправляет несклоняемые слова в корпусе"""
-    print("🔧 Исправляем несклоняемые слова...")
-    
-    corpus = load_corpus('opencorpora.json')
-    if not corpus:
-        return False
-    
+def fix_indeclinable_in_words(words):
+    """Исправляет несклоняемые слова в словаре metadata.words на месте, возвращает число исправлений"""
     # Расширенный список несклоняемых слов
     indeclinable_patterns = [
         # Иностранные слова на -е
@@ -57,15 +50,15 @@ def fix_indeclinable_words():
     fixes_made = 0
     
     for word in indeclinable_patterns:
-        if word in corpus['metadata']['words']:
-            features = corpus['metadata']['words'][word]
+        if word in words:
+            features = words[word]
             if features.get('declension') != 'indeclinable':
                 print(f"🔧 Исправляем {word}: {features.get('declension')} → indeclinable")
                 features['declension'] = 'indeclinable'
                 fixes_made += 1
     
     # Также проверяем по паттернам окончаний
-    for word, features in corpus['metadata']['words'].items():
+    for word, features in words.items():
         word_lower = word.lower()
         
         # Слова на -е, которые часто несклоняемые
@@ -80,6 +73,18 @@ def fix_indeclinable_words():
                 features['declension'] = 'indeclinable'
                 fixes_made += 1
     
+    return fixes_made
+
+def fix_indeclinable_words():
+    """Исправляет несклоняемые слова в корпусе"""
+    print("🔧 Исправляем несклоняемые слова...")
+    
+    corpus = load_corpus('opencorpora.json')
+    if not corpus:
+        return False
+    
+    fixes_made = fix_indeclinable_in_words(corpus['metadata']['words'])
+    
     print(f"✅ Исправлено {fixes_made} несклоняемых слов")
     
     # Сохраняем исправленный корпус
@@ -1,18 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 import sys
 
-def fix_indeclinable_errors(input_json_path, output_json_path):
-    print(f"Загружаем корпус из {input_json_path}...")
-    with open(input_json_path, 'r', encoding='utf-8') as f:
-        corpus = json.load(f)
-
-    words_data = corpus['metadata']['words']
-    total_words = len(words_data)
-    print(f"Всего слов в корпусе: {total_words}")
+from corpus_format import read_corpus, write_corpus
 
+def fix_indeclinable_errors_in_words(words_data):
+    """Снимает ошибочную пометку indeclinable на месте, возвращает (исправлено, оставлено)"""
     # Слова, которые ошибочно помечены как несклоняемые, но должны быть 2-го склонения
     words_to_fix = {
         'правительство': '2nd',  # средний род на -ство
@@ -61,13 +55,24 @@ def fix_indeclinable_errors(input_json_path, output_json_path):
                 else:
                     print(f"❓ Неопределено: {word} (оставляем несклоняемым)")
 
+    return fixed_count, kept_indeclinable
+
+def fix_indeclinable_errors(input_json_path, output_json_path):
+    print(f"Загружаем корпус из {input_json_path}...")
+    corpus = read_corpus(input_json_path)
+
+    words_data = corpus['metadata']['words']
+    total_words = len(words_data)
+    print(f"Всего слов в корпусе: {total_words}")
+
+    fixed_count, kept_indeclinable = fix_indeclinable_errors_in_words(words_data)
+
     print(f"\nИсправления завершены!")
     print(f"Исправлено слов: {fixed_count}")
     print(f"Оставлено несклоняемыми: {kept_indeclinable}")
 
     # Сохраняем исправленный корпус
-    with open(output_json_path, 'w', encoding='utf-8') as f:
-        json.dump(corpus, f, ensure_ascii=False, indent=2)
+    write_corpus(corpus, output_json_path)
     
     print(f"Исправленный корпус сохранен в {output_json_path}")
 
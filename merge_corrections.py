@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Объединение всех экспортов ошибок из админ-панели (lexicon_errors_*.json)
+
+Файлы читаются по одному: из каждого берутся исправленные ошибки, после чего
+файл больше не держится в памяти. Одна и та же ошибка (одинаковый id),
+попавшая в несколько экспортов одного преподавателя, учитывается один раз -
+в версии с самым поздним correctedAt (ошибку могли исправить повторно).
+Затем исправления сводятся по ключу (слово, признак). Если преподаватели
+исправили слово по-разному, конфликт решается стратегией:
+    latest - побеждает исправление с самым поздним correctedAt;
+    votes  - побеждает значение, за которое больше исправлений
+             (при равенстве - более позднее).
+
+Результат - список исправлений в формате админ-панели (одно на слово и
+признак), который apply_corrections.py применяет за одну запись корпуса.
+"""
+
+import json
+import os
+import time
+
+# Признаки, которые исправляет админ-панель: ключ в экспорте -> признак корпуса
+CORRECTION_FIELDS = {
+    'correctedDeclension': 'declension',
+    'correctedConjugation': 'conjugation',
+}
+
+STRATEGIES = ('latest', 'votes')
+
+def find_export_files(directory='.'):
+    """Файлы экспорта ошибок в каталоге, по имени"""
+    return sorted(os.path.join(directory, f) for f in os.listdir(directory)
+                  if f.startswith('lexicon_errors_') and f.endswith('.json'))
+
+def read_export(path):
+    """Исправленные ошибки из одного файла экспорта"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [error for error in data.get('errors', []) if error.get('status') == 'corrected']
+
+def choose(candidates, strategy):
+    """Выбирает исправление из кандидатов (значение, correctedAt) по стратегии"""
+    if strategy == 'votes':
+        votes = {}
+        for value, corrected_at in candidates:
+            count, latest = votes.get(value, (0, ''))
+            votes[value] = (count + 1, max(latest, corrected_at))
+        value = max(votes, key=votes.get)
+        return value, votes[value][1]
+    return max(candidates, key=lambda candidate: candidate[1])
+
+def merge_exports(paths, strategy='latest'):
+    """
+    Объединяет исправления из файлов экспорта.
+
+    Возвращает (исправления, статистика); статистика содержит строки по файлам
+    (файл, байт, исправленных ошибок, секунд) и итоговые счетчики.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Неизвестная стратегия: {strategy}")
+
+    latest_by_id = {}  # id -> (correctedAt, слово, {ключ исправления: значение})
+    without_id = []
+    stats = {'files': [], 'errors': 0, 'duplicates': 0, 'failed': []}
+
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            errors = read_export(path)
+        except (OSError, ValueError) as e:
+            stats['failed'].append((path, str(e)))
+            continue
+
+        for error in errors:
+            entry = (error.get('correctedAt') or '', error['word'],
+                     {key: error[key] for key in CORRECTION_FIELDS if error.get(key)})
+            error_id = error.get('id')
+            if error_id is None:
+                without_id.append(entry)
+            elif error_id not in latest_by_id:
+                latest_by_id[error_id] = entry
+            else:
+                stats['duplicates'] += 1
+                if entry[0] > latest_by_id[error_id][0]:
+                    latest_by_id[error_id] = entry
+
+        stats['errors'] += len(errors)
+        stats['files'].append((path, os.path.getsize(path), len(errors), time.perf_counter() - start))
+
+    candidates = {}  # (слово, ключ исправления) -> [(значение, correctedAt)]
+    for corrected_at, word, values in list(latest_by_id.values()) + without_id:
+        for key, value in values.items():
+            candidates.setdefault((word, key), []).append((value, corrected_at))
+
+    corrections = []
+    conflicts = 0
+    for (word, key), values in candidates.items():
+        if len({value for value, _ in values}) > 1:
+            conflicts += 1
+        value, corrected_at = choose(values, strategy)
+        correction = {'word': word, 'status': 'corrected', key: value}
+        if corrected_at:
+            correction['correctedAt'] = corrected_at
+        corrections.append(correction)
+
+    stats['conflicts'] = conflicts
+    return corrections, stats
+
+def print_merge_stats(stats):
+    """Таблица пропускной способности по файлам и итог"""
+    print(f"\n  {'Файл':<36} {'КБ':>8} {'Исправлений':>12} {'мс':>8} {'исправлений/с':>14} {'МБ/с':>7}")
+    total_size = total_time = 0
+    for path, size, errors, elapsed in stats['files']:
+        total_size += size
+        total_time += elapsed
+        rate = errors / elapsed if elapsed else 0
+        print(f"  {os.path.basename(path):<36} {size / 1024:>8.1f} {errors:>12} {elapsed * 1000:>8.1f} "
+              f"{rate:>14,.0f} {size / 1024 / 1024 / elapsed if elapsed else 0:>7.1f}")
+
+    rate = stats['errors'] / total_time if total_time else 0
+    print(f"  {'ИТОГО':<36} {total_size / 1024:>8.1f} {stats['errors']:>12} {total_time * 1000:>8.1f} "
+          f"{rate:>14,.0f} {total_size / 1024 / 1024 / total_time if total_time else 0:>7.1f}")
+
+    for path, message in stats['failed']:
+        print(f"  ❌ {os.path.basename(path)}: {message}")
+    print(f"\n  Повторов одной ошибки в разных экспортах: {stats['duplicates']}, "
+          f"конфликтующих исправлений: {stats['conflicts']}")
@@ -1,16 +1,78 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
+import heapq
+import os
 import sys
 
+from corpus_format import read_corpus, write_corpus
+from exercise_index import print_shards, write_exercise_shards
+
+# Сколько слов каждой части речи оставить в оптимизированном корпусе
+MAX_WORDS_PER_POS = {
+    'NOUN': 2000,
+    'VERB': 1000,
+    'ADJECTIVE': 800,
+    'ADVERB': 400,
+    'CONJUNCTION': 200
+}
+
+def priority_score(word, features):
+    """Приоритет слова для упражнений: базовые формы и короткие слова"""
+    pos = features.get('pos')
+    score = 0
+
+    # Базовые формы получают приоритет
+    if (pos == 'NOUN' and features.get('case') == 'NOMINATIVE' and features.get('number') == 'SINGULAR'):
+        score += 100
+    elif (pos == 'VERB' and features.get('mood') == 'INFINITIVE'):
+        score += 100
+    elif (pos == 'ADJECTIVE' and features.get('case') == 'NOMINATIVE' and features.get('number') == 'SINGULAR'):
+        score += 100
+    elif pos in ['ADVERB', 'CONJUNCTION']:
+        score += 100
+
+    # Короткие слова получают приоритет
+    score += max(0, 10 - len(word))
+    return score
+
+def select_top_words(words, max_words_per_pos=MAX_WORDS_PER_POS):
+    """
+    Отбирает для каждой части речи K лучших слов за O(n log K).
+
+    Ранг слова: базовая форма, затем частота в текстах (frequency из
+    parse_opencorpora.py; без нее все слова равны), затем краткость; при
+    равенстве - более раннее слово корпуса. Для каждой части речи держится
+    куча из K лучших, худшее слово вытесняется heappushpop. Возвращает
+    отобранные слова в порядке корпуса.
+    """
+    heaps = {pos: [] for pos in max_words_per_pos}
+
+    for index, (word, features) in enumerate(words.items()):
+        heap = heaps.get(features.get('pos'))
+        if heap is None:
+            continue
+
+        score = priority_score(word, features)
+        entry = (score >= 100, features.get('frequency') or 0, score % 100, -index, word)
+        if len(heap) < max_words_per_pos[features['pos']]:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heappushpop(heap, entry)
+
+    selected = sorted((-entry[3], entry[4]) for heap in heaps.values() for entry in heap)
+    return [word for _, word in selected]
+
 def optimize_corpus(input_file, output_file):
     """Создает оптимизированную версию корпуса для веб-хостинга"""
     
     print(f"Загрузка корпуса из {input_file}...")
     
-    with open(input_file, 'r', encoding='utf-8') as f:
-        full_corpus = json.load(f)
+    full_corpus = read_corpus(input_file)
+    words = full_corpus['metadata']['words']
+    
+    # Отбираем наиболее частотные и полезные слова
+    selected = select_top_words(words)
     
     # Создаем оптимизированную версию
     optimized_corpus = {
@@ -18,53 +80,14 @@ def optimize_corpus(input_file, output_file):
             'source': 'OpenCorpora (Optimized)',
             'version': full_corpus['metadata']['version'],
             'revision': full_corpus['metadata']['revision'],
-            'total_words': 0,
-            'words': {}
+            'total_words': len(selected),
+            'words': {word: words[word] for word in selected}
         }
     }
     
-    # Отбираем наиболее частотные и полезные слова
-    word_priority = {
-        'NOUN': 0.4,      # 40% существительных
-        'VERB': 0.25,     # 25% глаголов
-        'ADJECTIVE': 0.2, # 20% прилагательных
-        'ADVERB': 0.1,    # 10% наречий
-        'CONJUNCTION': 0.05 # 5% союзов
-    }
-    
-    word_counts = {pos: 0 for pos in word_priority}
-    max_words_per_pos = {
-        'NOUN': 2000,
-        'VERB': 1000,
-        'ADJECTIVE': 800,
-        'ADVERB': 400,
-        'CONJUNCTION': 200
-    }
-    
-    # Сортируем слова по приоритету
-    for word, features in full_corpus['metadata']['words'].items():
-        pos = features.get('pos')
-        if pos in word_priority and word_counts[pos] < max_words_per_pos[pos]:
-            # Приоритет: базовые формы, короткие слова, частотные
-            priority_score = 0
-            
-            # Базовые формы получают приоритет
-            if (pos == 'NOUN' and features.get('case') == 'NOMINATIVE' and features.get('number') == 'SINGULAR'):
-                priority_score += 100
-            elif (pos == 'VERB' and features.get('mood') == 'INFINITIVE'):
-                priority_score += 100
-            elif (pos == 'ADJECTIVE' and features.get('case') == 'NOMINATIVE' and features.get('number') == 'SINGULAR'):
-                priority_score += 100
-            elif pos in ['ADVERB', 'CONJUNCTION']:
-                priority_score += 100
-                
-            # Короткие слова получают приоритет
-            priority_score += max(0, 10 - len(word))
-            
-            # Добавляем слово с приоритетом
-            optimized_corpus['metadata']['words'][word] = features
-            word_counts[pos] += 1
-            optimized_corpus['metadata']['total_words'] += 1
+    word_counts = {pos: 0 for pos in MAX_WORDS_PER_POS}
+    for word in selected:
+        word_counts[words[word]['pos']] += 1
     
     print(f'Создан оптимизированный корпус: {optimized_corpus["metadata"]["total_words"]} слов')
     print('Распределение по частям речи:')
@@ -72,13 +95,15 @@ def optimize_corpus(input_file, output_file):
         print(f'  {pos}: {count} слов')
     
     # Сохраняем оптимизированный корпус
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(optimized_corpus, f, ensure_ascii=False, indent=2)
+    write_corpus(optimized_corpus, output_file)
     
     print(f'Оптимизированный корпус сохранен в {output_file}')
+
+    # Наборы слов упражнений и манифест для страницы
+    print('Наборы слов упражнений:')
+    print_shards(write_exercise_shards(optimized_corpus, output_file))
     
     # Показываем размер файлов
-    import os
     original_size = os.path.getsize(input_file) / (1024 * 1024)
     optimized_size = os.path.getsize(output_file) / (1024 * 1024)
     compression_ratio = (1 - optimized_size / original_size) * 100
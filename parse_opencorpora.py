@@ -1,160 +1,199 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import argparse
+import hashlib
+import io
+import multiprocessing
+import os
 import xml.etree.ElementTree as ET
 import json
 import sys
 import re
 from collections import defaultdict
 
-def extract_morphological_features(lemma_element):
+from conjugation_engine import PARSER_CONJUGATION
+from declension_engine import PARSER_DECLENSION
+
+# Параметры деления файла на части для параллельного парсинга
+TEXT_START_RE = re.compile(rb'<text[\s>]')
+TEXT_END = b'</text>'
+TEXT_ID_RE = re.compile(rb'\sid="([^"]*)"')
+FILE_BLOCK_SIZE = 1024 * 1024
+SHARD_MIN_SIZE = 256 * 1024
+SHARDS_PER_WORKER = 4
+
+# Граммемы OpenCorpora -> присваивания признаков (поле, значение).
+# Порядок граммем в токене сохраняется: при конфликте побеждает последняя.
+GRAMMEME_FEATURES = {
+    'NOUN': (('pos', 'NOUN'),),
+    'VERB': (('pos', 'VERB'),),
+    'INFN': (('pos', 'VERB'), ('mood', 'INFINITIVE')),
+    'ADJF': (('pos', 'ADJECTIVE'),),
+    'ADJS': (('pos', 'ADJECTIVE'), ('degree', 'SHORT')),
+    'COMP': (('pos', 'ADJECTIVE'), ('degree', 'COMPARATIVE')),
+    'ADVB': (('pos', 'ADVERB'),),
+    'CONJ': (('pos', 'CONJUNCTION'),),
+    'PRCL': (('pos', 'PARTICLE'),),
+    'PREP': (('pos', 'PREPOSITION'),),
+    'NPRO': (('pos', 'PRONOUN'),),
+    'NUMR': (('pos', 'NUMERAL'),),
+    'INTJ': (('pos', 'INTERJECTION'),),
+    'masc': (('gender', 'MASCULINE'),),
+    'femn': (('gender', 'FEMININE'),),
+    'neut': (('gender', 'NEUTER'),),
+    'sing': (('number', 'SINGULAR'),),
+    'plur': (('number', 'PLURAL'),),
+    'nomn': (('case', 'NOMINATIVE'),),
+    'gent': (('case', 'GENITIVE'),),
+    'datv': (('case', 'DATIVE'),),
+    'accs': (('case', 'ACCUSATIVE'),),
+    'ablt': (('case', 'INSTRUMENTAL'),),
+    'loct': (('case', 'PREPOSITIONAL'),),
+    'loc1': (('case', 'PREPOSITIONAL'),),
+    'loc2': (('case', 'PREPOSITIONAL'),),
+    'anim': (('animacy', 'ANIMATE'),),
+    'inan': (('animacy', 'INANIMATE'),),
+    'perf': (('aspect', 'PERFECTIVE'),),
+    'impf': (('aspect', 'IMPERFECTIVE'),),
+    'tran': (('transitivity', 'TRANSITIVE'),),
+    'intr': (('transitivity', 'INTRANSITIVE'),),
+    'indc': (('mood', 'INDICATIVE'),),
+    'impr': (('mood', 'IMPERATIVE'),),
+    'pres': (('tense', 'PRESENT'),),
+    'past': (('tense', 'PAST'),),
+    'futr': (('tense', 'FUTURE'),),
+    '1per': (('person', '1'),),
+    '2per': (('person', '2'),),
+    '3per': (('person', '3'),),
+}
+
+# Поля записи признаков в порядке вывода в JSON
+FEATURE_FIELDS = (
+    'lemma', 'pos', 'gender', 'number', 'case', 'declension', 'conjugation',
+    'aspect', 'transitivity', 'mood', 'tense', 'person', 'animacy', 'degree'
+)
+
+# Скомпилированные наборы граммем: кортеж граммем -> шаблон записи признаков
+_compiled_grammemes = {}
+
+def compile_grammemes(grammemes):
+    """Превращает кортеж граммем в шаблон записи признаков за один проход"""
+    template = _compiled_grammemes.get(grammemes)
+    if template is None:
+        template = dict.fromkeys(FEATURE_FIELDS)
+        for grammeme in grammemes:
+            for field, value in GRAMMEME_FEATURES.get(grammeme, ()):
+                template[field] = value
+        _compiled_grammemes[grammemes] = template
+    return template
+
+def extract_morphological_features(lemma_element, grammemes=None):
     """Извлекает морфологические признаки из элемента леммы"""
-    features = {
-        'lemma': lemma_element.get('t', ''),
-        'pos': None,
-        'gender': None,
-        'number': None,
-        'case': None,
-        'declension': None,
-        'conjugation': None,
-        'aspect': None,
-        'transitivity': None,
-        'mood': None,
-        'tense': None,
-        'person': None,
-        'animacy': None,
-        'degree': None
-    }
+    if grammemes is None:
+        grammemes = [g.get('v', '') for g in lemma_element.findall('g')]
     
-    # Получаем грамматические признаки
-    grammemes = []
-    for g in lemma_element.findall('g'):
-        grammemes.append(g.get('v', ''))
-    
-    # Обрабатываем грамматические признаки
-    for grammeme in grammemes:
-        if grammeme == 'NOUN':
-            features['pos'] = 'NOUN'
-        elif grammeme == 'VERB':
-            features['pos'] = 'VERB'
-        elif grammeme == 'INFN':
-            features['pos'] = 'VERB'
-            features['mood'] = 'INFINITIVE'
-        elif grammeme == 'ADJF':
-            features['pos'] = 'ADJECTIVE'
-        elif grammeme == 'ADJS':
-            features['pos'] = 'ADJECTIVE'
-            features['degree'] = 'SHORT'
-        elif grammeme == 'COMP':
-            features['pos'] = 'ADJECTIVE'
-            features['degree'] = 'COMPARATIVE'
-        elif grammeme == 'ADVB':
-            features['pos'] = 'ADVERB'
-        elif grammeme == 'CONJ':
-            features['pos'] = 'CONJUNCTION'
-        elif grammeme == 'PRCL':
-            features['pos'] = 'PARTICLE'
-        elif grammeme == 'PREP':
-            features['pos'] = 'PREPOSITION'
-        elif grammeme == 'NPRO':
-            features['pos'] = 'PRONOUN'
-        elif grammeme == 'NUMR':
-            features['pos'] = 'NUMERAL'
-        elif grammeme == 'INTJ':
-            features['pos'] = 'INTERJECTION'
-        elif grammeme == 'masc':
-            features['gender'] = 'MASCULINE'
-        elif grammeme == 'femn':
-            features['gender'] = 'FEMININE'
-        elif grammeme == 'neut':
-            features['gender'] = 'NEUTER'
-        elif grammeme == 'sing':
-            features['number'] = 'SINGULAR'
-        elif grammeme == 'plur':
-            features['number'] = 'PLURAL'
-        elif grammeme == 'nomn':
-            features['case'] = 'NOMINATIVE'
-        elif grammeme == 'gent':
-            features['case'] = 'GENITIVE'
-        elif grammeme == 'datv':
-            features['case'] = 'DATIVE'
-        elif grammeme == 'accs':
-            features['case'] = 'ACCUSATIVE'
-        elif grammeme == 'ablt':
-            features['case'] = 'INSTRUMENTAL'
-        elif grammeme in ['loct', 'loc1', 'loc2']:
-            features['case'] = 'PREPOSITIONAL'
-        elif grammeme == 'anim':
-            features['animacy'] = 'ANIMATE'
-        elif grammeme == 'inan':
-            features['animacy'] = 'INANIMATE'
-        elif grammeme == 'perf':
-            features['aspect'] = 'PERFECTIVE'
-        elif grammeme == 'impf':
-            features['aspect'] = 'IMPERFECTIVE'
-        elif grammeme == 'tran':
-            features['transitivity'] = 'TRANSITIVE'
-        elif grammeme == 'intr':
-            features['transitivity'] = 'INTRANSITIVE'
-        elif grammeme == 'indc':
-            features['mood'] = 'INDICATIVE'
-        elif grammeme == 'impr':
-            features['mood'] = 'IMPERATIVE'
-        elif grammeme == 'pres':
-            features['tense'] = 'PRESENT'
-        elif grammeme == 'past':
-            features['tense'] = 'PAST'
-        elif grammeme == 'futr':
-            features['tense'] = 'FUTURE'
-        elif grammeme == '1per':
-            features['person'] = '1'
-        elif grammeme == '2per':
-            features['person'] = '2'
-        elif grammeme == '3per':
-            features['person'] = '3'
+    return features_from_grammemes(lemma_element.get('t', ''), grammemes)
+
+def features_from_grammemes(lemma, grammemes):
+    """Строит запись признаков по лемме и списку граммем"""
+    features = compile_grammemes(tuple(grammemes)).copy()
+    features['lemma'] = lemma
     
     # Определяем склонение для существительных
     if features['pos'] == 'NOUN' and features['case'] == 'NOMINATIVE' and features['number'] == 'SINGULAR':
-        features['declension'] = determine_declension(features['lemma'], features['gender'])
+        features['declension'] = determine_declension(lemma, features['gender'])
     
     # Определяем спряжение для глаголов
     if features['pos'] == 'VERB' and features['mood'] == 'INFINITIVE':
-        features['conjugation'] = determine_conjugation(features['lemma'])
+        features['conjugation'] = determine_conjugation(lemma)
     
     return features
 
 def determine_declension(lemma, gender):
     """Определяет склонение существительного"""
-    if gender == 'FEMININE' and lemma.endswith('ь'):
-        return '3rd'
-    elif lemma.endswith('а') or lemma.endswith('я'):
-        return '1st'
-    elif lemma.endswith('о') or lemma.endswith('е') or gender == 'NEUTER':
-        return '2nd'
-    elif lemma.endswith('мя'):
-        return 'heteroclitic'
-    elif lemma.endswith('о') and not lemma.endswith('мя'):
-        # Проверяем несклоняемые
-        indeclinable_endings = ['кофе', 'какао', 'радио', 'метро', 'кино', 'кабаре', 'бюро', 'депо', 'фойе', 'ателье', 'кафе', 'пенсне', 'колье']
-        if lemma in indeclinable_endings:
-            return 'indeclinable'
-        return '2nd'
-    else:
-        return '1st'
+    return PARSER_DECLENSION.classify(lemma, gender)
 
 def determine_conjugation(lemma):
     """Определяет спряжение глагола"""
-    second_conjugation_endings = ['ить', 'ать', 'ять', 'еть', 'уть', 'оть']
-    second_conjugation_exceptions = ['брить', 'стелить', 'зиждиться']
+    return PARSER_CONJUGATION.classify(lemma)
+
+def create_parse_stats():
+    """Создает счетчики токенов для отчета парсера"""
+    return {
+        'tokens_scanned': 0,      # Всего просмотрено токенов
+        'duplicates_skipped': 0,  # Отброшено как уже известные словоформы
+        'tokens_decoded': 0       # Передано в extract_morphological_features
+    }
+
+def print_parse_stats(stats):
+    """Печатает счетчики токенов"""
+    print(f"Просмотрено токенов: {stats['tokens_scanned']}")
+    print(f"Пропущено повторов: {stats['duplicates_skipped']}")
+    print(f"Декодировано токенов: {stats['tokens_decoded']}")
+
+def process_token(token, unique_words, words, stats, token_counts):
+    """
+    Обрабатывает элемент <token>; возвращает True, если слово добавлено в словарь.
+    token_counts считает токены каждой словоформы (частоты для set_frequencies).
+    """
+    stats['tokens_scanned'] += 1
+    
+    # Быстрый путь: уже добавленная словоформа не может быть добавлена повторно,
+    # поэтому отбрасываем ее до разбора граммем
+    word = token.get('text', '').lower()
+    token_counts[word] = token_counts.get(word, 0) + 1
+    if word in unique_words:
+        stats['duplicates_skipped'] += 1
+        return False
     
-    if lemma in second_conjugation_exceptions:
-        return '2nd'
+    tfr = token.find('tfr')
+    if tfr is None:
+        return False
     
-    for ending in second_conjugation_endings:
-        if lemma.endswith(ending):
-            return '2nd'
+    v = tfr.find('v')
+    if v is None:
+        return False
     
-    return '1st'
+    l = v.find('l')
+    if l is None:
+        return False
+    
+    # Пропускаем знаки препинания и служебные слова
+    grammemes = [g.get('v', '') for g in l.findall('g')]
+    if any(g in ['PNCT', 'PREP', 'PRCL'] for g in grammemes):
+        return False
+    
+    # Извлекаем морфологические признаки
+    stats['tokens_decoded'] += 1
+    features = extract_morphological_features(l, grammemes)
+    
+    if features and features['pos']:
+        unique_words.add(word)
+        words[word] = features
+        return True
+    
+    return False
+
+def set_frequencies(words, token_counts):
+    """
+    Записывает в признаки слов частоту frequency - число токенов словоформы
+    в текстах (включая токены до первого разобранного вхождения)
+    """
+    for word, features in words.items():
+        features['frequency'] = token_counts.get(word, 0)
+
+def create_morphology_data(version, revision):
+    """Создает пустую структуру результата парсинга"""
+    return {
+        'metadata': {
+            'source': 'OpenCorpora',
+            'version': version,
+            'revision': revision,
+            'total_words': 0,
+            'words': {}
+        }
+    }
 
 def parse_opencorpora_xml(xml_file_path):
     """Парсит XML файл OpenCorpora и извлекает морфологические данные"""
@@ -164,18 +203,13 @@ def parse_opencorpora_xml(xml_file_path):
         tree = ET.parse(xml_file_path)
         root = tree.getroot()
         
-        morphology_data = {
-            'metadata': {
-                'source': 'OpenCorpora',
-                'version': root.get('version', ''),
-                'revision': root.get('revision', ''),
-                'total_words': 0,
-                'words': {}
-            }
-        }
+        morphology_data = create_morphology_data(root.get('version', ''), root.get('revision', ''))
+        words = morphology_data['metadata']['words']
         
         word_count = 0
         unique_words = set()
+        token_counts = {}
+        stats = create_parse_stats()
         
         # Обрабатываем тексты
         for text in root.findall('text'):
@@ -190,56 +224,425 @@ def parse_opencorpora_xml(xml_file_path):
                         continue
                     
                     for token in tokens.findall('token'):
-                        tfr = token.find('tfr')
-                        if tfr is None:
-                            continue
-                        
-                        v = tfr.find('v')
-                        if v is None:
-                            continue
-                        
-                        l = v.find('l')
-                        if l is None:
-                            continue
-                        
-                        word = token.get('text', '').lower()
-                        
-                        # Пропускаем знаки препинания и служебные слова
-                        grammemes = [g.get('v', '') for g in l.findall('g')]
-                        if any(g in ['PNCT', 'PREP', 'PRCL'] for g in grammemes):
-                            continue
-                        
-                        # Извлекаем морфологические признаки
-                        features = extract_morphological_features(l)
-                        
-                        if features and word not in unique_words and features['pos']:
-                            unique_words.add(word)
-                            morphology_data['metadata']['words'][word] = features
+                        if process_token(token, unique_words, words, stats, token_counts):
                             word_count += 1
                             
                             if word_count % 1000 == 0:
                                 print(f"Обработано {word_count} слов...")
         
+        set_frequencies(words, token_counts)
+        morphology_data['metadata']['total_words'] = word_count
+        
+        print(f"Извлечено {word_count} уникальных слов")
+        print_parse_stats(stats)
+        return morphology_data
+        
+    except Exception as e:
+        print(f"Ошибка парсинга XML: {e}")
+        return None
+
+def iter_stream_tokens(context, root):
+    """
+    Перебирает элементы <token> из iterparse-контекста.
+    
+    Учитываются только токены по пути text/paragraphs/paragraph/sentence/tokens,
+    как и в parse_opencorpora_xml. Каждый <token>/<sentence> очищается сразу
+    после обработки, а завершенные тексты удаляются из корня.
+    """
+    path = []
+    token_path = ['text', 'paragraphs', 'paragraph', 'sentence', 'tokens']
+    
+    for event, elem in context:
+        if event == 'start':
+            path.append(elem.tag)
+            continue
+        
+        if elem is root:
+            break
+        
+        path.pop()
+        
+        if elem.tag == 'token':
+            if path == token_path:
+                yield elem
+            elem.clear()
+        elif elem.tag == 'sentence':
+            elem.clear()
+        elif elem.tag == 'text' and not path:
+            # Освобождаем обработанные тексты, накопленные в корне
+            root.clear()
+
+def parse_opencorpora_xml_streaming(xml_file_path):
+    """
+    Потоково парсит XML файл OpenCorpora через iterparse.
+    
+    Потребление памяти не зависит от размера файла (подходит для полного
+    annot.opcorpora.xml). Результат совпадает с parse_opencorpora_xml.
+    """
+    print(f"Потоковый парсинг файла: {xml_file_path}")
+    
+    try:
+        context = ET.iterparse(xml_file_path, events=('start', 'end'))
+        _, root = next(context)
+        
+        morphology_data = create_morphology_data(root.get('version', ''), root.get('revision', ''))
+        words = morphology_data['metadata']['words']
+        
+        word_count = 0
+        unique_words = set()
+        token_counts = {}
+        stats = create_parse_stats()
+        
+        for token in iter_stream_tokens(context, root):
+            if process_token(token, unique_words, words, stats, token_counts):
+                word_count += 1
+                
+                if word_count % 1000 == 0:
+                    print(f"Обработано {word_count} слов...")
+        
+        set_frequencies(words, token_counts)
         morphology_data['metadata']['total_words'] = word_count
         
         print(f"Извлечено {word_count} уникальных слов")
+        print_parse_stats(stats)
+        return morphology_data
+        
+    except Exception as e:
+        print(f"Ошибка парсинга XML: {e}")
+        return None
+
+def read_root_attributes(xml_file_path):
+    """Читает атрибуты version и revision из открывающего тега корня"""
+    with open(xml_file_path, 'rb') as f:
+        _, root = next(ET.iterparse(f, events=('start',)))
+        return root.get('version', ''), root.get('revision', '')
+
+def find_text_shards(xml_file_path, shard_count):
+    """
+    Делит файл на диапазоны байтов (start, end), границы которых совпадают
+    с границами элементов <text>. Возвращает атрибуты корня и список диапазонов.
+    """
+    file_size = os.path.getsize(xml_file_path)
+    
+    version, revision = read_root_attributes(xml_file_path)
+    
+    with open(xml_file_path, 'rb') as f:
+        first_text = find_in_file(f, TEXT_START_RE, 0)
+        if first_text is None:
+            return version, revision, []
+        
+        last_text_end = rfind_in_file(f, TEXT_END, file_size)
+        shard_size = max(SHARD_MIN_SIZE, (last_text_end - first_text) // shard_count + 1)
+        
+        shards = []
+        start = first_text
+        while start < last_text_end:
+            end = find_in_file(f, TEXT_END, start + shard_size)
+            if end is None or end >= last_text_end:
+                end = last_text_end
+            shards.append((start, end))
+            start = end
+    
+    return version, revision, shards
+
+def find_in_file(f, pattern, offset):
+    """
+    Ищет шаблон в файле начиная с offset. Для bytes возвращает позицию конца
+    вхождения, для регулярного выражения - позицию начала.
+    """
+    overlap = 16
+    position = offset
+    while True:
+        f.seek(position)
+        block = f.read(FILE_BLOCK_SIZE)
+        if not block:
+            return None
+        
+        if isinstance(pattern, bytes):
+            index = block.find(pattern)
+            if index >= 0:
+                return position + index + len(pattern)
+        else:
+            match = pattern.search(block)
+            if match:
+                return position + match.start()
+        
+        if len(block) < FILE_BLOCK_SIZE:
+            return None
+        position += len(block) - overlap
+
+def rfind_in_file(f, pattern, file_size):
+    """Ищет последнее вхождение шаблона; возвращает позицию его конца"""
+    overlap = len(pattern)
+    position = file_size
+    while position > 0:
+        start = max(0, position - FILE_BLOCK_SIZE)
+        f.seek(start)
+        block = f.read(min(position + overlap, file_size) - start)
+        index = block.rfind(pattern)
+        if index >= 0:
+            return start + index + len(pattern)
+        position = start
+    return 0
+
+def parse_shard(shard):
+    """Парсит диапазон байтов с элементами <text> в отдельном процессе"""
+    xml_file_path, start, end = shard
+    
+    with open(xml_file_path, 'rb') as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+    
+    return parse_text_chunk(chunk)
+
+def parse_text_chunk(chunk):
+    """
+    Парсит байты с одним или несколькими элементами <text>; возвращает слова,
+    счетчики и число токенов каждой словоформы
+    """
+    context = ET.iterparse(io.BytesIO(b'<annotation>' + chunk + b'</annotation>'), events=('start', 'end'))
+    _, root = next(context)
+    
+    words = {}
+    unique_words = set()
+    token_counts = {}
+    stats = create_parse_stats()
+    for token in iter_stream_tokens(context, root):
+        process_token(token, unique_words, words, stats, token_counts)
+    
+    return words, stats, token_counts
+
+def parse_opencorpora_xml_parallel(xml_file_path, workers):
+    """
+    Парсит XML файл OpenCorpora в нескольких процессах.
+    
+    Файл делится на части по границам <text>, части обрабатываются в пуле
+    процессов и объединяются по порядку: побеждает первое вхождение слова,
+    частоты складываются, поэтому результат совпадает с однопроцессным парсингом.
+    """
+    print(f"Параллельный парсинг файла: {xml_file_path} ({workers} процессов)")
+    
+    try:
+        version, revision, shards = find_text_shards(xml_file_path, workers * SHARDS_PER_WORKER)
+        print(f"Файл разделен на {len(shards)} частей")
+        
+        morphology_data = create_morphology_data(version, revision)
+        words = morphology_data['metadata']['words']
+        
+        stats = create_parse_stats()
+        token_counts = defaultdict(int)
+        
+        tasks = [(xml_file_path, start, end) for start, end in shards]
+        with multiprocessing.Pool(workers) as pool:
+            for shard_number, (shard_words, shard_stats, shard_counts) in enumerate(pool.imap(parse_shard, tasks), 1):
+                for word, features in shard_words.items():
+                    if word not in words:
+                        words[word] = features
+                for key, value in shard_stats.items():
+                    stats[key] += value
+                for word, count in shard_counts.items():
+                    token_counts[word] += count
+                print(f"Обработано частей: {shard_number}/{len(shards)}, слов: {len(words)}")
+        
+        set_frequencies(words, token_counts)
+        morphology_data['metadata']['total_words'] = len(words)
+        
+        print(f"Извлечено {len(words)} уникальных слов")
+        print_parse_stats(stats)
         return morphology_data
         
     except Exception as e:
         print(f"Ошибка парсинга XML: {e}")
         return None
 
+def iter_text_segments(xml_file_path):
+    """
+    Перебирает элементы <text> файла как сырые байты без разбора XML.
+    Возвращает пары (id текста, байты элемента).
+    """
+    with open(xml_file_path, 'rb') as f:
+        buffer = b''
+        position = 0
+        while True:
+            match = TEXT_START_RE.search(buffer, position)
+            if match:
+                end = buffer.find(TEXT_END, match.end())
+                if end >= 0:
+                    end += len(TEXT_END)
+                    start_tag = buffer[match.start():buffer.find(b'>', match.start()) + 1]
+                    id_match = TEXT_ID_RE.search(start_tag)
+                    text_id = id_match.group(1).decode('utf-8') if id_match else str(match.start())
+                    yield text_id, buffer[match.start():end]
+                    position = end
+                    continue
+                position = match.start()
+            else:
+                # Сохраняем хвост на случай, если тег разрезан границей блока
+                position = max(position, len(buffer) - len(TEXT_END))
+            
+            block = f.read(FILE_BLOCK_SIZE)
+            if not block:
+                break
+            buffer = buffer[position:] + block
+            position = 0
+
+def text_state_path(output_file):
+    """Путь к файлу с хешами текстов рядом с выходным JSON"""
+    return os.path.splitext(output_file)[0] + '.texts.json'
+
+def load_text_state(output_file):
+    """Загружает сохраненные хеши текстов и предыдущий результат парсинга"""
+    from corpus_format import read_corpus
+    
+    state_file = text_state_path(output_file)
+    if not (os.path.exists(state_file) and os.path.exists(output_file)):
+        return None, None
+    
+    with open(state_file, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    previous = read_corpus(output_file)
+    return state, previous
+
+def save_text_state(output_file, version, revision, texts):
+    """Сохраняет хеши текстов, списки их слов и частоты рядом с выходным JSON"""
+    state = {
+        'version': version,
+        'revision': revision,
+        'texts': texts
+    }
+    with open(text_state_path(output_file), 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
+
+def parse_opencorpora_xml_incremental(xml_file_path, output_file):
+    """
+    Инкрементально обновляет результат парсинга под новую ревизию OpenCorpora.
+    
+    Рядом с выходным JSON хранятся хеши содержимого каждого <text>, списки
+    слов, которые дает текст, и число токенов каждой словоформы в тексте. Заново разбираются только
+    новые и измененные тексты, а также неизмененные тексты, ставшие первым
+    вхождением слова после изменения более ранних текстов (и тексты из
+    состояния без частот). Результат совпадает с полным парсингом.
+    
+    Результат записывается в output_file здесь же, а состояние - только после
+    него: иначе при ошибке записи новые хеши описывали бы старый результат.
+    """
+    from corpus_format import write_corpus
+    
+    version, revision = read_root_attributes(xml_file_path)
+    state, previous = load_text_state(output_file)
+    
+    if state is None:
+        print("Сохраненное состояние не найдено, выполняется полный парсинг по текстам")
+        old_texts = {}
+        old_words = {}
+    else:
+        print(f"Ревизия OpenCorpora: {state['revision']} -> {revision}")
+        # Состояние прежних версий не хранит частоты: такие тексты разбираются заново
+        old_texts = {entry[0]: (entry[1], entry[2], entry[3] if len(entry) > 3 else None)
+                     for entry in state['texts']}
+        old_words = previous['metadata']['words']
+    
+    # Текст, из которого каждое слово попало в предыдущий результат
+    old_sources = {}
+    for text_id, (_, text_words, _) in old_texts.items():
+        for word in text_words:
+            old_sources.setdefault(word, text_id)
+    
+    morphology_data = create_morphology_data(version, revision)
+    words = morphology_data['metadata']['words']
+    stats = create_parse_stats()
+    counts = {'unchanged': 0, 'changed': 0, 'added': 0, 'reparsed': 0}
+    token_counts = defaultdict(int)
+    texts = []
+    
+    try:
+        for text_id, segment in iter_text_segments(xml_file_path):
+            text_hash = hashlib.sha1(segment).hexdigest()
+            old_text = old_texts.pop(text_id, None)
+            
+            if old_text is not None and old_text[0] == text_hash:
+                counts['unchanged'] += 1
+                text_words, text_counts = old_text[1], old_text[2]
+                new_words = [word for word in text_words if word not in words]
+                
+                if text_counts is not None and all(old_sources.get(word) == text_id and word in old_words
+                                                   for word in new_words):
+                    for word in new_words:
+                        words[word] = old_words[word]
+                    for word, count in text_counts.items():
+                        token_counts[word] += count
+                    texts.append([text_id, text_hash, text_words, text_counts])
+                    continue
+                
+                # Слово теперь берется из этого текста, а его признаки не сохранены
+                counts['reparsed'] += 1
+            elif old_text is not None:
+                counts['changed'] += 1
+            else:
+                counts['added'] += 1
+            
+            text_words, text_stats, text_counts = parse_text_chunk(segment)
+            for key, value in text_stats.items():
+                stats[key] += value
+            for word, features in text_words.items():
+                if word not in words:
+                    words[word] = features
+            for word, count in text_counts.items():
+                token_counts[word] += count
+            texts.append([text_id, text_hash, list(text_words), text_counts])
+        
+    except Exception as e:
+        print(f"Ошибка парсинга XML: {e}")
+        return None
+    
+    # Признаки слов могли прийти из предыдущего результата: частоты - по всем текстам
+    set_frequencies(words, token_counts)
+    
+    morphology_data['metadata']['total_words'] = len(words)
+    write_corpus(morphology_data, output_file)
+    save_text_state(output_file, version, revision, texts)
+    
+    print(f"Текстов без изменений: {counts['unchanged']}")
+    print(f"Измененных текстов: {counts['changed']}")
+    print(f"Новых текстов: {counts['added']}")
+    print(f"Удаленных текстов: {len(old_texts)}")
+    print(f"Повторно разобрано неизмененных текстов: {counts['reparsed']}")
+    print(f"Извлечено {len(words)} уникальных слов")
+    print_parse_stats(stats)
+    return morphology_data
+
 def main():
-    input_file = sys.argv[1] if len(sys.argv) > 1 else 'annot.opcorpora.no_ambig.xml'
-    output_file = sys.argv[2] if len(sys.argv) > 2 else 'opencorpora_morphology.json'
+    from corpus_format import write_corpus
+    
+    parser = argparse.ArgumentParser(description='Парсер XML файлов OpenCorpora')
+    parser.add_argument('input_file', nargs='?', default='annot.opcorpora.no_ambig.xml')
+    parser.add_argument('output_file', nargs='?', default='opencorpora_morphology.json')
+    parser.add_argument('--stream', action='store_true',
+                        help='потоковый парсинг (iterparse) для полного annot.opcorpora.xml')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='число процессов для параллельного парсинга по элементам <text>')
+    parser.add_argument('--incremental', action='store_true',
+                        help='разобрать только новые и измененные тексты по сохраненным хешам')
+    args = parser.parse_args()
+    
+    input_file = args.input_file
+    output_file = args.output_file
     
     print(f"Парсинг {input_file}...")
     
-    morphology_data = parse_opencorpora_xml(input_file)
+    if args.incremental:
+        morphology_data = parse_opencorpora_xml_incremental(input_file, output_file)
+    elif args.workers > 1:
+        morphology_data = parse_opencorpora_xml_parallel(input_file, args.workers)
+    elif args.stream:
+        morphology_data = parse_opencorpora_xml_streaming(input_file)
+    else:
+        morphology_data = parse_opencorpora_xml(input_file)
     
     if morphology_data:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(morphology_data, f, ensure_ascii=False, indent=2)
+        # Инкрементальный парсинг сам записывает результат перед своим состоянием
+        if not args.incremental:
+            write_corpus(morphology_data, output_file)
         print(f"Результат сохранен в {output_file}")
         print(f"Всего слов: {morphology_data['metadata']['total_words']}")
     else:
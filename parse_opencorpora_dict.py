@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Парсер словаря OpenCorpora (dict.opcorpora.xml)
+
+Потоково читает записи <lemma>/<f> и пишет компактный индекс
+лемма -> формы/граммемы в формате JSON Lines: одна строка на парадигму.
+Граммемы леммы хранятся один раз, у форм - только собственные граммемы,
+пустые признаки не записываются. Дерево XML не строится, поэтому потребление
+памяти не зависит от размера словаря.
+
+Формат индекса:
+    {"metadata": {"source": ..., "version": ..., "revision": ...}}
+    {"id": "1", "lemma": "ёж", "grammemes": "NOUN,anim,masc", "forms": [["ёж", "sing,nomn"], ...]}
+    ...
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+import xml.etree.ElementTree as ET
+
+from parse_opencorpora import FILE_BLOCK_SIZE, features_from_grammemes, read_root_attributes
+
+class LemmaCollector:
+    """
+    Цель XMLParser, собирающая только записи <lemma>/<l>/<f>/<g>.
+
+    Дерево элементов не строится, поэтому память не зависит от размера словаря.
+    Готовые леммы складываются в список lemmas в виде
+    (id, лемма, граммемы леммы, [(форма, граммемы формы), ...]).
+    """
+
+    def __init__(self):
+        self.lemmas = []
+        self.lemma = None
+        self.grammemes = None
+
+    def start(self, tag, attrib):
+        if tag == 'g':
+            if self.grammemes is not None:
+                self.grammemes.append(attrib.get('v', ''))
+        elif tag == 'f':
+            if self.lemma is not None:
+                self.grammemes = []
+                self.lemma[3].append((attrib.get('t', ''), self.grammemes))
+        elif tag == 'l':
+            if self.lemma is not None:
+                self.lemma[1] = attrib.get('t', '')
+                self.grammemes = self.lemma[2]
+        elif tag == 'lemma':
+            self.lemma = [attrib.get('id', ''), None, [], []]
+
+    def end(self, tag):
+        if tag == 'lemma':
+            if self.lemma[1] is not None:
+                self.lemmas.append(tuple(self.lemma))
+            self.lemma = None
+            self.grammemes = None
+        elif tag in ('l', 'f'):
+            self.grammemes = None
+
+    def close(self):
+        return None
+
+def iter_dictionary_lemmas(xml_file_path):
+    """
+    Потоково перебирает леммы словаря OpenCorpora.
+
+    Возвращает кортежи (id, лемма, граммемы леммы, [(форма, граммемы формы), ...]).
+    """
+    collector = LemmaCollector()
+    parser = ET.XMLParser(target=collector)
+
+    with open(xml_file_path, 'rb') as f:
+        while True:
+            block = f.read(FILE_BLOCK_SIZE)
+            if not block:
+                break
+            parser.feed(block)
+            yield from collector.lemmas
+            collector.lemmas.clear()
+
+    parser.close()
+    yield from collector.lemmas
+
+def write_words_header(words, version, revision):
+    """Начинает потоковую запись корпуса базовых форм в формате metadata.words"""
+    words.write('{\n  "metadata": {\n')
+    words.write('    "source": "OpenCorpora Dictionary",\n')
+    words.write(f'    "version": {json.dumps(version, ensure_ascii=False)},\n')
+    words.write(f'    "revision": {json.dumps(revision, ensure_ascii=False)},\n')
+    words.write('    "words": {')
+
+def write_words_footer(words, total_words):
+    """Завершает потоковую запись корпуса базовых форм"""
+    words.write(f'\n    }},\n    "total_words": {total_words}\n  }}\n}}\n')
+
+def parse_opencorpora_dict(xml_file_path, index_file, words_file=None):
+    """
+    Строит индекс лемма -> парадигма и, при необходимости, корпус базовых форм
+    в формате metadata.words для построения упражнений.
+    """
+    print(f"Потоковый парсинг словаря: {xml_file_path}")
+
+    stats = {'lemmas': 0, 'forms': 0, 'words': 0}
+    seen_words = set()
+
+    try:
+        version, revision = read_root_attributes(xml_file_path)
+
+        with contextlib.ExitStack() as files:
+            index = files.enter_context(open(index_file, 'w', encoding='utf-8'))
+            metadata = {'source': 'OpenCorpora Dictionary', 'version': version, 'revision': revision}
+            index.write(json.dumps({'metadata': metadata}, ensure_ascii=False) + '\n')
+
+            words = None
+            if words_file:
+                words = files.enter_context(open(words_file, 'w', encoding='utf-8'))
+                write_words_header(words, version, revision)
+
+            for lemma_id, lemma, lemma_grammemes, forms in iter_dictionary_lemmas(xml_file_path):
+                record = {
+                    'id': lemma_id,
+                    'lemma': lemma,
+                    'grammemes': ','.join(lemma_grammemes),
+                    'forms': [[form, ','.join(form_grammemes)] for form, form_grammemes in forms]
+                }
+                index.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+                stats['lemmas'] += 1
+                stats['forms'] += len(forms)
+
+                # Базовая форма - первая форма парадигмы; побеждает первая лемма
+                if words is not None and forms:
+                    form, form_grammemes = forms[0]
+                    word = form.lower()
+                    features = features_from_grammemes(lemma, lemma_grammemes + form_grammemes)
+                    if features['pos'] and word not in seen_words:
+                        seen_words.add(word)
+                        separator = ',' if stats['words'] else ''
+                        words.write(f'{separator}\n      {json.dumps(word, ensure_ascii=False)}: '
+                                    f'{json.dumps(features, ensure_ascii=False)}')
+                        stats['words'] += 1
+
+                if stats['lemmas'] % 50000 == 0:
+                    print(f"Обработано {stats['lemmas']} лемм...")
+
+            if words is not None:
+                write_words_footer(words, stats['words'])
+
+    except Exception as e:
+        print(f"Ошибка парсинга словаря: {e}")
+        return None
+
+    print(f"Лемм: {stats['lemmas']}")
+    print(f"Форм: {stats['forms']}")
+    if words_file:
+        print(f"Базовых форм в корпусе: {stats['words']}")
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description='Парсер словаря OpenCorpora (dict.opcorpora.xml)')
+    parser.add_argument('input_file', nargs='?', default='dict.opcorpora.xml')
+    parser.add_argument('index_file', nargs='?', default='opencorpora_dict.jsonl')
+    parser.add_argument('--words', dest='words_file',
+                        help='также записать базовые формы лемм в формате metadata.words')
+    args = parser.parse_args()
+
+    stats = parse_opencorpora_dict(args.input_file, args.index_file, args.words_file)
+
+    if stats is None:
+        print("Ошибка парсинга")
+        sys.exit(1)
+
+    print(f"Индекс сохранен в {args.index_file}")
+    if args.words_file:
+        print(f"Корпус базовых форм сохранен в {args.words_file}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Заранее сжатые варианты файлов корпуса (.gz и .br)
+
+Рядом с каждым файлом корпуса и наборов слов сборка кладет сжатые копии
+file.json.gz (gzip, уровень 9) и file.json.br (brotli, качество 11), чтобы
+статический сервер отдавал готовые байты и не сжимал файл на каждый запрос.
+Brotli - необязательная зависимость (pip install brotli): без нее .br не
+создается. gzip пишется без времени в заголовке, поэтому одинаковое
+содержимое дает одинаковые байты. Вариант, записанный раньше последнего
+изменения исходного файла, считается устаревшим и пересоздается.
+
+Использование:
+    python3 precompress.py opencorpora.json opencorpora.manifest.json
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Расширение варианта -> (сжатие, распаковка); brotli - если установлен
+VARIANTS = {'.gz': (lambda data: gzip.compress(data, compresslevel=9, mtime=0), gzip.decompress)}
+if brotli is not None:
+    VARIANTS['.br'] = (lambda data: brotli.compress(data, quality=11), brotli.decompress)
+
+def is_fresh(path, variant):
+    """Вариант есть и записан не раньше последнего изменения исходного файла"""
+    try:
+        return os.stat(variant).st_mtime_ns >= os.stat(path).st_mtime_ns
+    except OSError:
+        return False
+
+def write_variants(path, data=None, force=False):
+    """
+    Записывает сжатые варианты файла path (data - его содержимое, если уже
+    прочитано); варианты не старше исходного файла пропускаются, если не
+    force. Вариант не больше исходного файла не нужен и удаляется.
+    Возвращает пути вариантов.
+    """
+    paths = []
+    for ext, (compress, _) in VARIANTS.items():
+        variant = path + ext
+        if force or not is_fresh(path, variant):
+            if data is None:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            compressed = compress(data)
+            if len(compressed) >= len(data):
+                if os.path.exists(variant):
+                    os.remove(variant)
+                continue
+            with open(variant + '.tmp', 'wb') as f:
+                f.write(compressed)
+            os.replace(variant + '.tmp', variant)
+        paths.append(variant)
+    return paths
+
+def measure_variants(path, repeat=5):
+    """
+    Строки таблицы для файла и его вариантов:
+    [(вариант, байт, мс распаковки, мс разбора JSON)] - лучшее из repeat замеров
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    rows = []
+    for ext, decompress in [('', None)] + [(ext, funcs[1]) for ext, funcs in VARIANTS.items()]:
+        variant = path + ext
+        if not os.path.exists(variant):
+            continue
+        with open(variant, 'rb') as f:
+            data = f.read()
+
+        best_decode = best_parse = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            decoded = decompress(data) if decompress else data
+            decoded_at = time.perf_counter()
+            json.loads(decoded)
+            best_decode = min(best_decode, decoded_at - start)
+            best_parse = min(best_parse, time.perf_counter() - decoded_at)
+        if decoded != raw:
+            raise ValueError(f"{variant} не совпадает с {path}")
+        rows.append((ext or 'json', len(data), best_decode * 1000, best_parse * 1000))
+    return rows
+
+def print_variants_table(paths):
+    """
+    Таблица размеров и времени распаковки вариантов каждого файла; False,
+    если какой-то вариант не совпадает со своим файлом
+    """
+    ok = True
+    print(f"  {'Файл':<58} {'Вариант':>7} {'KB':>9} {'%':>6} {'распаковка, мс':>15} {'JSON, мс':>9}")
+    for path in paths:
+        try:
+            rows = measure_variants(path)
+        except ValueError as e:
+            print(f"  ❌ {e} (пересоздайте с --force)")
+            ok = False
+            continue
+        raw_size = rows[0][1]
+        for variant, size, decode_ms, parse_ms in rows:
+            print(f"  {os.path.basename(path):<58} {variant:>7} {size / 1024:>9.1f} {size / raw_size * 100:>6.1f} "
+                  f"{decode_ms:>15.2f} {parse_ms:>9.2f}")
+    if brotli is None:
+        print("  ⚠️ brotli не установлен (pip install brotli), варианты .br не создаются")
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Сжатые варианты (.gz, .br) файлов корпуса')
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--force', action='store_true', help='пересоздать все варианты, даже свежие')
+    args = parser.parse_args()
+
+    for path in args.files:
+        write_variants(path, force=args.force)
+    if not print_variants_table(args.files):
+        sys.exit(1)
@@ -1,79 +1,143 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
-import sys
+import argparse
 
-def remove_inappropriate_words(input_json_path, output_json_path):
+from blocklist_filter import BlocklistFilter, exact_entries, load_blocklist, substring_entries
+from corpus_format import read_corpus, write_corpus
+
+# Неподходящие для детей слова по категориям (категории используют профили content_profiles.py)
+INAPPROPRIATE_CATEGORIES = {
+    # Порнография и секс
+    'sex': ['порнограф', 'порнография', 'секс', 'сексуальный', 'проститутка', 'проституция'],
+
+    # Наркотики
+    'drugs': ['наркотик', 'наркотики', 'кокаин', 'героин', 'марихуана', 'гашиш', 'наркота'],
+
+    # Алкоголь
+    'alcohol': ['алкоголь', 'водка', 'пиво', 'вино', 'пьяный', 'пьянство'],
+
+    # Насилие и смерть
+    'violence': ['убийство', 'убийца', 'самоубийство', 'самоубийца', 'смерть', 'труп',
+                 'насилие', 'изнасилование', 'изнасиловать', 'насиловать'],
+
+    # Терроризм и оружие
+    'terrorism': ['терроризм', 'террорист', 'бомба', 'взрыв', 'убивать'],
+
+    # Преступления
+    'crime': ['вор', 'кража', 'украсть', 'грабеж', 'грабитель',
+              'преступление', 'преступник', 'тюрьма', 'арест', 'арестовать'],
+
+    # Курение
+    'smoking': ['курение', 'сигарета', 'табак', 'курить'],
+
+    # Азартные игры
+    'gambling': ['азарт', 'казино', 'ставка', 'ставки'],
+
+    # Коррупция
+    'corruption': ['коррупция', 'взятка', 'взятки', 'коррумпированный'],
+
+    # Психические расстройства
+    'mental_health': ['суицид', 'суицидальный', 'депрессия', 'психиатрия'],
+}
+
+# Подстроки подозрительных слов: проверяются в слове в нижнем регистре
+SUSPICIOUS_CATEGORIES = {
+    'sex': ['порн', 'секс'],
+    'drugs': ['нарк'],
+    'alcohol': ['алког'],
+    'violence': ['убий', 'насил'],
+    'terrorism': ['терр', 'взрыв', 'бомб'],
+    'mental_health': ['суицид'],
+}
+
+# Список неподходящих слов для детей
+INAPPROPRIATE_WORDS = [word for words in INAPPROPRIATE_CATEGORIES.values() for word in words]
+SUSPICIOUS_PATTERNS = [pattern for patterns in SUSPICIOUS_CATEGORIES.values() for pattern in patterns]
+
+DEFAULT_BLOCKLIST = (
+    [entry for category, words in INAPPROPRIATE_CATEGORIES.items() for entry in exact_entries(words, category)] +
+    [entry for category, patterns in SUSPICIOUS_CATEGORIES.items() for entry in substring_entries(patterns, category)]
+)
+
+_default_filter = None
+
+def default_filter():
+    """Встроенный список, скомпилированный один раз"""
+    global _default_filter
+    if _default_filter is None:
+        _default_filter = BlocklistFilter(DEFAULT_BLOCKLIST)
+    return _default_filter
+
+def remove_inappropriate_from_words(words_data, blocklist=None):
     """
-    Удаляет неподходящие для детей слова из корпуса
+    Удаляет неподходящие для детей слова из словаря metadata.words на месте,
+    возвращает список удаленных слов.
+
+    blocklist - скомпилированный BlocklistFilter (по умолчанию встроенный список).
+    Сначала удаляются слова, совпавшие целиком (в порядке списка), затем
+    подозрительные слова, содержащие подстроку из списка (в порядке корпуса).
     """
+    matcher = blocklist or default_filter()
+
+    exact_matches = []
+    suspicious_matches = []
+    for word in words_data:
+        entry = matcher.match(word)
+        if entry is None:
+            continue
+        if entry[1]:
+            exact_matches.append(word)
+        else:
+            suspicious_matches.append((word, entry[0]))
+
+    order = {}
+    for position, pattern in enumerate(matcher.exact_words()):
+        order.setdefault(pattern, position)
+    exact_matches.sort(key=order.__getitem__)
+
+    removed_words = []
+    for word in exact_matches:
+        del words_data[word]
+        removed_words.append(word)
+        print(f"  Удалено: {word}")
+
+    for word, pattern in suspicious_matches:
+        del words_data[word]
+        removed_words.append(word)
+        print(f"  Удалено (подозрительное, '{pattern}'): {word}")
+
+    return removed_words
+
+def remove_inappropriate_words(input_json_path, output_json_path, blocklist_path=None, profile=None):
+    """
+    Удаляет неподходящие для детей слова из корпуса.
+    blocklist_path - файл со списком слов и подстрок вместо встроенного;
+    profile - удалять только категории профиля аудитории (content_profiles.py).
+    """
+    if profile:
+        # Локальный импорт: content_profiles берет списки из этого модуля
+        from content_profiles import compile_profiles
+        profiles = compile_profiles(blocklist_path)
+        if profile not in profiles.names:
+            print(f"❌ Неизвестный профиль: {profile}. Доступные профили: {', '.join(profiles.names)}")
+            return
+        matcher = profiles.profile_filter(profile)
+        print(f"Профиль: {profile} ({len(matcher.entries)} записей)")
+    elif blocklist_path:
+        matcher = BlocklistFilter(load_blocklist(blocklist_path))
+        print(f"Список запрещенных слов: {blocklist_path} ({len(matcher.entries)} записей)")
+    else:
+        matcher = default_filter()
+
     print(f"Загружаем корпус из {input_json_path}...")
-    with open(input_json_path, 'r', encoding='utf-8') as f:
-        corpus = json.load(f)
+    corpus = read_corpus(input_json_path)
 
     words_data = corpus['metadata']['words']
     total_words_before = len(words_data)
     print(f"Всего слов в корпусе: {total_words_before}")
 
-    # Список неподходящих слов для детей
-    inappropriate_words = [
-        # Порнография и секс
-        'порнограф', 'порнография', 'секс', 'сексуальный', 'проститутка', 'проституция',
-        
-        # Наркотики
-        'наркотик', 'наркотики', 'кокаин', 'героин', 'марихуана', 'гашиш', 'наркота',
-        
-        # Алкоголь
-        'алкоголь', 'водка', 'пиво', 'вино', 'пьяный', 'пьянство',
-        
-        # Насилие и смерть
-        'убийство', 'убийца', 'самоубийство', 'самоубийца', 'смерть', 'труп',
-        'насилие', 'изнасилование', 'изнасиловать', 'насиловать',
-        
-        # Терроризм и оружие
-        'терроризм', 'террорист', 'бомба', 'взрыв', 'убивать',
-        
-        # Преступления
-        'вор', 'кража', 'украсть', 'грабеж', 'грабитель',
-        'преступление', 'преступник', 'тюрьма', 'арест', 'арестовать',
-        
-        # Курение
-        'курение', 'сигарета', 'табак', 'курить',
-        
-        # Азартные игры
-        'азарт', 'казино', 'ставка', 'ставки',
-        
-        # Коррупция
-        'коррупция', 'взятка', 'взятки', 'коррумпированный',
-        
-        # Психические расстройства
-        'суицид', 'суицидальный', 'депрессия', 'психиатрия'
-    ]
-
-    # Удаляем неподходящие слова
-    removed_words = []
-    for word in inappropriate_words:
-        if word in words_data:
-            del words_data[word]
-            removed_words.append(word)
-            print(f"  Удалено: {word}")
-
-    # Дополнительная проверка на подозрительные слова
-    suspicious_patterns = ['порн', 'секс', 'нарк', 'алког', 'убий', 'насил', 'терр', 'взрыв', 'бомб', 'суицид']
-    
-    words_to_remove = []
-    for word in list(words_data.keys()):
-        for pattern in suspicious_patterns:
-            if pattern in word.lower():
-                words_to_remove.append(word)
-                break
-    
-    for word in words_to_remove:
-        if word not in removed_words:  # не удаляем повторно
-            del words_data[word]
-            removed_words.append(word)
-            print(f"  Удалено (подозрительное): {word}")
+    remove_inappropriate_from_words(words_data, matcher)
 
     total_words_after = len(words_data)
     removed_count = total_words_before - total_words_after
@@ -87,24 +151,22 @@ def remove_inappropriate_words(input_json_path, output_json_path):
         "metadata": {
             "source": "OpenCorpora (Очищенный от неподходящих слов)",
             "version": corpus['metadata']['version'],
-            "revision": "child_safe",
+            "revision": f"{profile}_safe" if profile else "child_safe",
             "total_words": total_words_after,
             "words": words_data
         }
     }
 
-    with open(output_json_path, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+    write_corpus(output_data, output_json_path)
     print(f"Очищенный корпус сохранен в {output_json_path}")
 
     # Проверяем результат
     print(f"\nПроверяем результат в {output_json_path}...")
-    with open(output_json_path, 'r', encoding='utf-8') as f:
-        clean_corpus = json.load(f)
+    clean_corpus = read_corpus(output_json_path)
     
     # Проверяем, что неподходящие слова удалены
     still_present = []
-    for word in inappropriate_words:
+    for word in matcher.exact_words():
         if word in clean_corpus['metadata']['words']:
             still_present.append(word)
     
@@ -116,10 +178,12 @@ def remove_inappropriate_words(input_json_path, output_json_path):
     print(f"\n✅ Корпус очищен! Удалено {removed_count} неподходящих слов.")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Использование: python remove_inappropriate_words.py <input_json_file> <output_json_file>")
-        sys.exit(1)
-    
-    input_json = sys.argv[1]
-    output_json = sys.argv[2]
-    remove_inappropriate_words(input_json, output_json)
+    parser = argparse.ArgumentParser(description='Удаление неподходящих для детей слов из корпуса')
+    parser.add_argument('input_json_file')
+    parser.add_argument('output_json_file')
+    parser.add_argument('--blocklist', metavar='FILE',
+                        help='файл со списком: слово целиком в строке, *подстрока*, [категория], # комментарий')
+    parser.add_argument('--profile', help='удалять только слова, не подходящие профилю (child, teen, adult)')
+    args = parser.parse_args()
+
+    remove_inappropriate_words(args.input_json_file, args.output_json_file, args.blocklist, args.profile)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Локальный сервер приложения для класса
+
+Отдает index.html, russian_language_practice.html и файлы корпуса так, чтобы
+браузеры учеников не скачивали корпус повторно:
+    - ETag (хеш содержимого) и Last-Modified; If-None-Match и
+      If-Modified-Since дают 304 без тела;
+    - заранее сжатые варианты file.json.br и file.json.gz (precompress.py)
+      отдаются с Content-Encoding, если клиент их принимает и вариант не
+      старше самого файла;
+    - Cache-Control: файлы с хешем содержимого в имени (exercise_index.py)
+      кэшируются навсегда (immutable), остальные перепроверяются (no-cache);
+    - запросы диапазона (Range: bytes=...) получают 206 Partial Content.
+
+Файлы до 16 MB держатся в памяти вместе с ETag и перечитываются, только если
+изменились время изменения или размер, поэтому сервер не читает диск и не
+сжимает ответ на каждый запрос. Каждое соединение обслуживается в своем
+потоке, соединения не закрываются между запросами (HTTP/1.1 keep-alive).
+
+Использование:
+    python3 serve_app.py                                  # http://localhost:8000/
+    python3 serve_app.py --port 8080 --directory russian_language_offline
+"""
+
+import argparse
+import email.utils
+import hashlib
+import os
+import re
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from exercise_index import HASH_LENGTH
+from precompress import is_fresh
+
+HASHED_FILE = re.compile(rf'\.[0-9a-f]{{{HASH_LENGTH}}}\.json$')
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'
+
+# Кодирование -> расширение заранее сжатого варианта, по предпочтению
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+MAX_CACHED_SIZE = 16 * 1024 * 1024
+BYTE_RANGE = re.compile(r'bytes=(\d*)-(\d*)')
+
+class FileCache:
+    """Содержимое файлов в памяти: путь -> ((время, размер), байты, ETag, время изменения)"""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, path):
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        entry = self.entries.get(path)
+        if entry is None or entry[0] != key:
+            with open(path, 'rb') as f:
+                data = f.read()
+            entry = (key, data, f'"{hashlib.sha256(data).hexdigest()[:16]}"', stat.st_mtime)
+            self.entries[path] = entry
+        return entry
+
+def accepted_encodings(header):
+    """Кодирования из Accept-Encoding с ненулевым весом"""
+    accepted = set()
+    for item in (header or '').split(','):
+        name, _, params = item.strip().partition(';')
+        weight = params.strip()
+        if weight.startswith('q='):
+            try:
+                if float(weight[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+def parse_range(header, size):
+    """
+    (начало, конец включительно) для Range: bytes=...; None - заголовок не
+    поддерживается (несколько диапазонов) и отдается весь файл; ValueError -
+    диапазон за пределами файла (416)
+    """
+    match = BYTE_RANGE.fullmatch(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-N: последние N байт
+        length = int(last)
+        if not length:
+            raise ValueError(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(header)
+    return start, end
+
+class AppRequestHandler(SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Заголовки и тело уходят отдельными записями: без TCP_NODELAY тело ждет
+    # подтверждения заголовков (~40 мс на каждый ответ при keep-alive)
+    disable_nagle_algorithm = True
+    cache = FileCache()
+    log_requests = True
+    extensions_map = {**SimpleHTTPRequestHandler.extensions_map,
+                      '.json': 'application/json', '.rlc': 'application/octet-stream'}
+
+    def do_GET(self):
+        self.send_file(with_body=True)
+
+    def do_HEAD(self):
+        self.send_file(with_body=False)
+
+    def log_message(self, format, *args):
+        if self.log_requests:
+            super().log_message(format, *args)
+
+    def send_file(self, with_body):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and urlsplit(self.path).path.endswith('/'):
+            path = os.path.join(path, 'index.html')
+        if not os.path.isfile(path) or os.path.getsize(path) > MAX_CACHED_SIZE:
+            # Каталоги, отсутствующие и слишком большие файлы - как у http.server
+            return super().do_GET() if with_body else super().do_HEAD()
+
+        encoding, variant = None, path
+        accepted = accepted_encodings(self.headers.get('Accept-Encoding'))
+        for name, ext in ENCODINGS:
+            # Вариант старше исходного файла устарел: отдается сам файл
+            if (name in accepted or '*' in accepted) and is_fresh(path, path + ext):
+                encoding, variant = name, path + ext
+                break
+
+        _, data, etag, mtime = self.cache.get(variant)
+        cache_control = IMMUTABLE_CACHE if HASHED_FILE.search(path) else REVALIDATE_CACHE
+
+        if self.not_modified(etag, mtime):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_common_headers(etag, mtime, cache_control, encoding)
+            self.end_headers()
+            return
+
+        status = HTTPStatus.OK
+        start, end = 0, len(data) - 1
+        range_header = self.headers.get('Range')
+        if range_header and self.headers.get('If-Range', etag) == etag:
+            try:
+                byte_range = parse_range(range_header, len(data))
+            except ValueError:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header('Content-Range', f'bytes */{len(data)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            if byte_range:
+                status = HTTPStatus.PARTIAL_CONTENT
+                start, end = byte_range
+
+        self.send_response(status)
+        self.send_common_headers(etag, mtime, cache_control, encoding)
+        self.send_header('Content-Type', self.guess_type(path))
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(data)}')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+        if with_body:
+            self.wfile.write(memoryview(data)[start:end + 1])
+
+    def send_common_headers(self, etag, mtime, cache_control, encoding):
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', email.utils.formatdate(mtime, usegmt=True))
+        self.send_header('Cache-Control', cache_control)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Vary', 'Accept-Encoding')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+
+    def not_modified(self, etag, mtime):
+        """Условный запрос: If-None-Match важнее If-Modified-Since"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or any(tag.removeprefix('W/') == etag for tag in tags)
+
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
+
+def make_server(directory='.', host='', port=8000, quiet=False):
+    """HTTP сервер приложения (еще не запущенный)"""
+    handler = partial(AppRequestHandler, directory=directory)
+    AppRequestHandler.log_requests = not quiet
+    return ThreadingHTTPServer((host, port), handler)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Локальный сервер приложения с кэшированием корпуса')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--bind', default='', help='адрес (по умолчанию - все интерфейсы)')
+    parser.add_argument('--directory', default=os.path.dirname(os.path.abspath(__file__)),
+                        help='каталог приложения (по умолчанию - каталог скрипта)')
+    parser.add_argument('--quiet', action='store_true', help='не печатать запросы')
+    args = parser.parse_args()
+
+    server = make_server(args.directory, args.bind, args.port, args.quiet)
+    host, port = server.server_address[:2]
+    print(f"🌐 Приложение: http://{'localhost' if host in ('', '0.0.0.0') else host}:{port}/")
+    print(f"📁 Каталог: {args.directory}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Сервер остановлен")
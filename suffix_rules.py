@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Классификация слов по окончаниям с помощью обратного суффиксного дерева
+
+Правила (окончания, слова-исключения, условие на признак слова вроде рода
+или наклонения) задаются упорядоченными таблицами и компилируются в дерево
+по перевернутым словам: узел дерева соответствует окончанию, в узле лежат
+правила для этого окончания и для слов-исключений, которые целиком совпадают
+с путем от корня. Слово классифицируется одним проходом по его окончанию
+справа налево, за O(длина слова); из подошедших правил побеждает то, что
+стоит в таблице раньше.
+
+Используется в declension_engine.py и conjugation_engine.py.
+"""
+
+def suffix_rule(suffixes, result, tags=None, when=None):
+    """
+    Правила для окончаний ('' - любое слово).
+
+    tags - допустимые значения признака (род, наклонение) или None для любого;
+    when - дополнительное условие на слово. Правило с результатом None
+    останавливает поиск: следующие по таблице правила уже не применяются.
+    """
+    if isinstance(suffixes, str):
+        suffixes = [suffixes]
+    return [(suffix, False, result, tags, when) for suffix in suffixes]
+
+def word_rule(words, result, tags=None, when=None):
+    """Правила для слов-исключений: слово должно совпасть целиком"""
+    return [(word, True, result, tags, when) for word in words]
+
+class TrieNode:
+    """Узел обратного суффиксного дерева"""
+
+    __slots__ = ('children', 'suffix_rules', 'word_rules', 'rules', 'exact_rules')
+
+    def __init__(self):
+        self.children = {}
+        self.suffix_rules = []  # (приоритет, результат, признаки, условие) для окончания узла
+        self.word_rules = []    # то же для слова, совпадающего с путем целиком
+        self.rules = {}         # признак -> правила для окончаний на пути от корня, по приоритету
+        self.exact_rules = {}   # то же вместе с word_rules узла
+
+class SuffixRuleEngine:
+    """
+    Скомпилированный набор правил.
+
+    При компиляции каждому узлу дерева для каждого значения признака
+    приписывается отсортированный список правил, окончания которых лежат
+    на пути от корня, поэтому classify(word, tag) спускается по окончанию
+    слова до самого глубокого узла и просматривает один короткий список.
+    Возвращает результат первого подошедшего правила или default;
+    classify_many - то же для списка пар (слово, признак).
+    """
+
+    def __init__(self, rules, default=None):
+        self.default = default
+        self.root = TrieNode()
+
+        # Значения признака, упомянутые в правилах; None - любое другое значение
+        self.tags = {None}
+        for priority, (pattern, exact, result, tags, when) in enumerate(rules):
+            node = self.root
+            for char in reversed(pattern):
+                node = node.children.setdefault(char, TrieNode())
+            target = node.word_rules if exact else node.suffix_rules
+            target.append((priority, result, tags, when))
+            if tags is not None:
+                self.tags.update(tags)
+
+        self.compile(self.root, [])
+
+    def select(self, rules, tag):
+        """
+        Правила, применимые к значению признака tag, в виде (результат, условие).
+        Список обрезается после первого безусловного правила: дальше поиск не дойдет.
+        """
+        selected = []
+        for priority, result, tags, when in sorted(rules, key=lambda rule: rule[0]):
+            if tags is not None and tag not in tags:
+                continue
+            selected.append((result, when))
+            if when is None:
+                break
+        return tuple(selected)
+
+    def compile(self, node, inherited):
+        """Приписывает узлам списки правил, унаследованных от окончаний на пути от корня"""
+        inherited = inherited + node.suffix_rules
+        exact = inherited + node.word_rules
+        node.rules = {tag: self.select(inherited, tag) for tag in self.tags}
+        node.exact_rules = {tag: self.select(exact, tag) for tag in self.tags}
+        for child in node.children.values():
+            self.compile(child, inherited)
+
+    def classify(self, word, tag=None):
+        node = self.root
+        position = len(word)
+        while position:
+            child = node.children.get(word[position - 1])
+            if child is None:
+                break
+            node = child
+            position -= 1
+
+        rules = node.rules if position else node.exact_rules
+        for result, when in rules.get(tag) or rules[None]:
+            if when is None or when(word):
+                return result
+        return self.default
+
+    def classify_many(self, items):
+        """
+        Классифицирует список пар (слово, признак).
+
+        Тот же спуск, что и в classify, но без вызова метода на каждое слово.
+        """
+        root = self.root
+        default = self.default
+        results = []
+        append = results.append
+
+        for word, tag in items:
+            node = root
+            position = len(word)
+            while position:
+                child = node.children.get(word[position - 1])
+                if child is None:
+                    break
+                node = child
+                position -= 1
+
+            rules = node.rules if position else node.exact_rules
+            for result, when in rules.get(tag) or rules[None]:
+                if when is None or when(word):
+                    append(result)
+                    break
+            else:
+                append(default)
+
+        return results
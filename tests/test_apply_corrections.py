@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Применение исправлений через журнал и публикация корпуса (apply_corrections.py)"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from apply_corrections import (BASE_SNAPSHOT, CORPUS_FILE, JOURNAL_FILE, OFFLINE_CORPUS_FILE, process_errors_file,
+                               restore)
+from correction_journal import file_hash, journal_end, published_state_path
+
+def noun(declension, **features):
+    return {'lemma': None, 'pos': 'NOUN', 'case': 'NOMINATIVE', 'number': 'SINGULAR',
+            'declension': declension, **features}
+
+class ApplyCorrectionsTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(directory)
+        os.makedirs(os.path.dirname(OFFLINE_CORPUS_FILE))
+
+        self.write_json(CORPUS_FILE, {'metadata': {'revision': 'test', 'total_words': 2, 'words': {
+            'путь': noun('1st'), 'тень': noun('1st')}}})
+
+    def write_json(self, path, data):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def read_json(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def export(self, name, corrections):
+        self.write_json(name, {'errors': [
+            {'id': f'{name}-{word}', 'word': word, 'status': 'corrected', 'correctedDeclension': declension,
+             'correctedAt': '2026-03-01T10:00:00'} for word, declension in corrections]})
+
+    def run_quietly(self, function, *args):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            result = function(*args)
+        return result, output.getvalue()
+
+    def test_published_corpus_has_no_journal_state(self):
+        self.export('lexicon_errors_1.json', [('тень', '3rd')])
+        self.assertTrue(self.run_quietly(process_errors_file)[0])
+        for path in (CORPUS_FILE, OFFLINE_CORPUS_FILE):
+            metadata = self.read_json(path)['metadata']
+            self.assertEqual(metadata['words']['тень']['declension'], '3rd')
+            self.assertNotIn('journal_offset', metadata)
+
+    def regenerate_corpus(self):
+        """Перегенерация opencorpora.json не через журнал (например, content_profiles.py)"""
+        corpus = self.read_json(CORPUS_FILE)
+        corpus['metadata']['words']['ночь'] = noun('3rd')
+        corpus['metadata']['content_profiles'] = ['child_safe']
+        self.write_json(CORPUS_FILE, corpus)
+
+    def test_regenerated_corpus_is_not_overwritten(self):
+        self.export('lexicon_errors_1.json', [('тень', '3rd')])
+        self.run_quietly(process_errors_file)
+        self.regenerate_corpus()
+
+        self.export('lexicon_errors_2.json', [('путь', 'heteroclitic')])
+        result, output = self.run_quietly(process_errors_file)
+        self.assertTrue(result)
+        self.assertIn('пересоздан', output)
+
+        metadata = self.read_json(CORPUS_FILE)['metadata']
+        self.assertEqual(metadata['content_profiles'], ['child_safe'])
+        self.assertEqual({word: features['declension'] for word, features in metadata['words'].items()},
+                         {'путь': 'heteroclitic', 'тень': '3rd', 'ночь': '3rd'})
+
+    def test_unpublished_corrections_survive_rebase(self):
+        self.export('lexicon_errors_1.json', [('тень', '3rd')])
+        self.run_quietly(process_errors_file, False)
+        self.regenerate_corpus()
+        os.remove('lexicon_errors_1.json')
+
+        self.export('lexicon_errors_2.json', [('путь', 'heteroclitic')])
+        self.run_quietly(process_errors_file)
+        words = self.read_json(CORPUS_FILE)['metadata']['words']
+        self.assertEqual(words['тень']['declension'], '3rd')
+        self.assertIn('ночь', words)
+
+    def test_publish_keeps_base_snapshot(self):
+        self.export('lexicon_errors_1.json', [('тень', '3rd')])
+        self.run_quietly(process_errors_file)
+        with open(BASE_SNAPSHOT, 'rb') as f:
+            base = f.read()
+
+        self.export('lexicon_errors_2.json', [('путь', 'heteroclitic')])
+        result, output = self.run_quietly(process_errors_file)
+        self.assertTrue(result)
+        self.assertNotIn('пересоздан', output)
+        with open(BASE_SNAPSHOT, 'rb') as f:
+            self.assertEqual(f.read(), base)
+
+        self.assertEqual(self.read_json(published_state_path(BASE_SNAPSHOT)),
+                         {'source_hash': file_hash(CORPUS_FILE), 'source_offset': journal_end(JOURNAL_FILE)})
+        words = self.read_json(CORPUS_FILE)['metadata']['words']
+        self.assertEqual((words['тень']['declension'], words['путь']['declension']), ('3rd', 'heteroclitic'))
+
+    def test_restore_rejects_offset_inside_record(self):
+        self.export('lexicon_errors_1.json', [('тень', '3rd')])
+        self.run_quietly(process_errors_file)
+        result, output = self.run_quietly(restore, journal_end(JOURNAL_FILE) - 5)
+        self.assertFalse(result)
+        self.assertIn('внутрь записи', output)
+
+        self.assertTrue(self.run_quietly(restore, 0)[0])
+        self.assertEqual(self.read_json(CORPUS_FILE)['metadata']['words']['тень']['declension'], '1st')
+
+if __name__ == "__main__":
+    unittest.main()
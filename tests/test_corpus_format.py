@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Формат .rlc: числовые признаки и хеш-таблица слов (corpus_format.py)"""
+
+import json
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from corpus_format import MAGIC, CorpusReader, pack_corpus, read_header, unpack_corpus, write_corpus
+
+def make_corpus(words):
+    return {'metadata': {'source': 'test', 'total_words': len(words), 'words': words}}
+
+class FrequencyColumnTest(unittest.TestCase):
+    def setUp(self):
+        self.words = {
+            'школа': {'lemma': 'школа', 'pos': 'NOUN', 'case': 'NOMINATIVE', 'frequency': 1100},
+            'читать': {'lemma': 'читать', 'pos': 'VERB', 'frequency': 0},
+            'и': {'lemma': None, 'pos': 'CONJUNCTION', 'frequency': None},
+            'очень': {'pos': 'ADVERB'},
+        }
+
+    def test_frequency_round_trip_outside_extras(self):
+        data = pack_corpus(make_corpus(self.words))
+        header, _ = read_header(data)
+        self.assertEqual(header['extras'], {})
+        self.assertEqual(unpack_corpus(data), make_corpus(self.words))
+
+    def test_reader_decodes_frequency(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'corpus.rlc')
+        write_corpus(make_corpus(self.words), path)
+        with CorpusReader(path) as reader:
+            self.assertEqual(reader['школа']['frequency'], 1100)
+            self.assertIsNone(reader['и']['frequency'])
+            self.assertNotIn('frequency', reader['очень'])
+
+    def test_values_outside_uint32_go_to_extras(self):
+        self.words['школа']['frequency'] = 2 ** 32
+        self.words['читать']['frequency'] = True
+        data = pack_corpus(make_corpus(self.words))
+        self.assertEqual(len(read_header(data)[0]['extras']), 2)
+        self.assertEqual(unpack_corpus(data), make_corpus(self.words))
+
+class HashIndexTest(unittest.TestCase):
+    def test_reader_rejects_file_without_hash_index(self):
+        data = pack_corpus(make_corpus({'школа': {'lemma': 'школа', 'pos': 'NOUN'}}))
+        header, body_start = read_header(data)
+        del header['sections']['hash_index']
+        header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        header_bytes += b' ' * (body_start - len(MAGIC) - 4 - len(header_bytes))
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'corpus.rlc')
+        with open(path, 'wb') as f:
+            f.write(MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes + data[body_start:])
+        with self.assertRaises(ValueError):
+            CorpusReader(path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Журнал исправлений корпуса (correction_journal.py)"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from correction_journal import ABSENT, append_records, inverse_records, make_record, read_records, replay_records
+
+class RestoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.journal = os.path.join(self.directory, 'corrections.jsonl')
+        self.words = {
+            'кофе': {'pos': 'NOUN', 'declension': None},
+            'путь': {'pos': 'NOUN'},
+        }
+
+    def correct_and_restore(self, word, field, corrected):
+        features = self.words[word]
+        original = dict(features)
+        records = [make_record(word, field, features.get(field, ABSENT), corrected, '2026-03-01T10:00:00')]
+        replay_records(self.words, records)
+        start, _ = append_records(self.journal, records)
+
+        inverse = inverse_records(read_records(self.journal, start), '2026-03-02T10:00:00')
+        append_records(self.journal, inverse)
+        replay_records(self.words, read_records(self.journal, start)[1:])
+        for key in ('last_corrected', 'correction_source'):
+            features.pop(key)
+        return original
+
+    def test_restore_keeps_null_value(self):
+        original = self.correct_and_restore('кофе', 'declension', 'indeclinable')
+        self.assertIn('declension', self.words['кофе'])
+        self.assertEqual(self.words['кофе'], original)
+
+    def test_restore_removes_absent_key(self):
+        original = self.correct_and_restore('путь', 'declension', 'heteroclitic')
+        self.assertNotIn('declension', self.words['путь'])
+        self.assertEqual(self.words['путь'], original)
+
+    def test_null_and_absent_records_differ(self):
+        self.assertEqual(make_record('кофе', 'declension', None, '3rd', 't')['old'], None)
+        self.assertNotIn('old', make_record('путь', 'declension', ABSENT, '3rd', 't'))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Ключи и содержимое кэша конвейера исправлений (correction_pipeline.py)"""
+
+import contextlib
+import glob
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from correction_pipeline import (DEFAULT_PASSES, PROJECT_DIR, cache_paths, file_hash, pass_code_hash,
+                                 project_imports, run_pipeline, stage_keys)
+from corpus_format import write_corpus
+
+class PassCodeHashTest(unittest.TestCase):
+    def setUp(self):
+        # Копия модулей проекта, которую можно править
+        self.project_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.project_dir)
+        for path in glob.glob(os.path.join(PROJECT_DIR, '*.py')):
+            shutil.copy(path, self.project_dir)
+
+    def edit(self, module_name):
+        with open(os.path.join(self.project_dir, module_name + '.py'), 'a', encoding='utf-8') as f:
+            f.write('\n# правка\n')
+
+    def hashes(self):
+        return {name: pass_code_hash(name, self.project_dir) for name in DEFAULT_PASSES}
+
+    def test_direct_imports_only_cover_engines(self):
+        self.assertIn('declension_engine', project_imports('comprehensive_corpus_check', self.project_dir))
+        self.assertNotIn('suffix_rules', project_imports('comprehensive_corpus_check', self.project_dir))
+
+    def test_transitive_import_changes_key(self):
+        # suffix_rules импортируется только через declension_engine и conjugation_engine
+        before = self.hashes()
+        self.edit('suffix_rules')
+        after = self.hashes()
+        self.assertNotEqual(before['conjugations_final'], after['conjugations_final'])
+        self.assertNotEqual(before['comprehensive_check'], after['comprehensive_check'])
+
+    def test_other_pass_module_keeps_key(self):
+        before = self.hashes()
+        self.edit('blocklist_filter')
+        after = self.hashes()
+        self.assertNotEqual(before['content_profiles'], after['content_profiles'])
+        self.assertEqual(before['conjugations_final'], after['conjugations_final'])
+
+    def test_pipeline_changes_every_key(self):
+        before = self.hashes()
+        self.edit('correction_pipeline')
+        after = self.hashes()
+        for name in DEFAULT_PASSES:
+            self.assertNotEqual(before[name], after[name], name)
+
+    def test_unrelated_module_keeps_keys(self):
+        before = self.hashes()
+        self.edit('serve_app')
+        self.assertEqual(before, self.hashes())
+
+class StageCacheTest(unittest.TestCase):
+    PASSES = ['declensions', 'conjugations_final', 'comprehensive_check']
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cache_dir = os.path.join(self.directory, 'cache')
+        self.input = os.path.join(self.directory, 'in.json')
+        self.output = os.path.join(self.directory, 'out.json')
+        write_corpus({'metadata': {'total_words': 3, 'words': {
+            'ночь': {'lemma': 'ночь', 'pos': 'NOUN', 'gender': 'FEMININE', 'declension': '1st'},
+            'школа': {'lemma': 'школа', 'pos': 'NOUN', 'gender': 'FEMININE', 'declension': '1st'},
+            'читать': {'lemma': 'читать', 'pos': 'VERB', 'mood': 'INFINITIVE'}}}}, self.input)
+
+    def run_quietly(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return run_pipeline(self.input, self.output, self.PASSES, cache_dir=self.cache_dir)
+
+    def cached(self, extension):
+        return sorted(name for name in os.listdir(self.cache_dir) if name.endswith(extension))
+
+    def test_caches_final_and_slowest_stage_only(self):
+        report = self.run_quietly()
+        keys = stage_keys(file_hash(self.input), self.PASSES)
+        self.assertEqual(len(self.cached('.json')), len(self.PASSES))
+
+        slowest = max(range(len(self.PASSES) - 1), key=lambda index: report[index][1])
+        expected = {os.path.basename(cache_paths(self.cache_dir, self.PASSES[index], keys[index])[0])
+                    for index in (slowest, len(self.PASSES) - 1)}
+        self.assertEqual(set(self.cached('.rlc')), expected)
+
+        self.assertTrue(all(row[1] is None for row in self.run_quietly()))
+
+    def test_prunes_entries_of_other_runs(self):
+        self.run_quietly()
+        stale = cache_paths(self.cache_dir, 'declensions', '0' * 40)
+        for path in stale:
+            open(path, 'wb').close()
+        current = self.cached('')
+
+        with open(self.input, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        self.run_quietly()
+        self.assertFalse(set(current) & set(self.cached('')))
+
+if __name__ == "__main__":
+    unittest.main()
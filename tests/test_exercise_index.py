@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Удаление устаревших наборов слов упражнений (exercise_index.py)"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from exercise_index import remove_stale_files
+
+class RemoveStaleFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def create(self, *names):
+        for name in names:
+            open(os.path.join(self.directory, name), 'wb').close()
+
+    def test_removes_only_generated_files(self):
+        keep = {'opencorpora.declension.3rd.5d41402abc4b.json', 'opencorpora.7c4a8d09ca37.json'}
+        stale = ['opencorpora.declension.3rd.aab3238922bc.json', 'opencorpora.declension.3rd.aab3238922bc.json.gz',
+                 'opencorpora.parts-of-speech.noun.aab3238922bc.json.br', 'opencorpora.aab3238922bc.json']
+        foreign = ['opencorpora.backup.aab3238922bc.json', 'opencorpora.2025.01.aab3238922bc.json',
+                   'opencorpora.declension.aab3238922bc.json', 'opencorpora_fixed.aab3238922bc.json']
+        self.create(*keep, *stale, *foreign)
+
+        self.assertEqual(remove_stale_files(self.directory, 'opencorpora', keep), len(stale))
+        self.assertEqual(set(os.listdir(self.directory)), keep | set(foreign))
+
+if __name__ == "__main__":
+    unittest.main()
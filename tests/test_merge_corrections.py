@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Объединение экспортов админ-панели (merge_corrections.py)"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from merge_corrections import merge_exports
+
+def error(error_id, word, declension, corrected_at):
+    return {'id': error_id, 'word': word, 'status': 'corrected',
+            'correctedDeclension': declension, 'correctedAt': corrected_at}
+
+class MergeExportsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def export(self, name, errors):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'errors': errors}, f, ensure_ascii=False)
+        return path
+
+    def test_recorrected_error_keeps_latest_version(self):
+        paths = [
+            self.export('lexicon_errors_1.json', [error(7, 'путь', '1st', '2026-03-01T10:00:00Z')]),
+            self.export('lexicon_errors_2.json', [error(7, 'путь', '3rd', '2026-03-05T10:00:00Z')]),
+        ]
+        for strategy in ('latest', 'votes'):
+            corrections, stats = merge_exports(paths, strategy)
+            self.assertEqual([c['correctedDeclension'] for c in corrections], ['3rd'], strategy)
+            self.assertEqual(stats['duplicates'], 1)
+            self.assertEqual(stats['conflicts'], 0)
+
+    def test_order_of_files_does_not_matter(self):
+        paths = [
+            self.export('lexicon_errors_1.json', [error(7, 'путь', 'heteroclitic', '2026-03-09T10:00:00Z')]),
+            self.export('lexicon_errors_2.json', [error(7, 'путь', '1st', '2026-03-01T10:00:00Z')]),
+        ]
+        corrections, _ = merge_exports(paths)
+        self.assertEqual(corrections[0]['correctedDeclension'], 'heteroclitic')
+        self.assertEqual(corrections[0]['correctedAt'], '2026-03-09T10:00:00Z')
+
+    def test_distinct_ids_still_vote(self):
+        paths = [self.export('lexicon_errors_1.json', [
+            error(1, 'путь', '3rd', '2026-03-01T10:00:00Z'),
+            error(2, 'путь', '3rd', '2026-03-02T10:00:00Z'),
+            error(3, 'путь', '1st', '2026-03-03T10:00:00Z'),
+        ])]
+        self.assertEqual(merge_exports(paths, 'votes')[0][0]['correctedDeclension'], '3rd')
+        self.assertEqual(merge_exports(paths, 'latest')[0][0]['correctedDeclension'], '1st')
+
+if __name__ == "__main__":
+    unittest.main()
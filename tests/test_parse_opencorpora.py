@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Инкрементальный парсинг OpenCorpora (parse_opencorpora.py)"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from parse_opencorpora import parse_opencorpora_xml_incremental, text_state_path
+
+def token(text, lemma, grammemes):
+    tags = ''.join(f'<g v="{grammeme}"/>' for grammeme in grammemes)
+    return f'<token text="{text}"><tfr t="{text}"><v><l t="{lemma}">{tags}</l></v></tfr></token>'
+
+def text(text_id, tokens):
+    return (f'<text id="{text_id}"><paragraphs><paragraph><sentence><tokens>{"".join(tokens)}'
+            f'</tokens></sentence></paragraph></paragraphs></text>')
+
+class IncrementalStateTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.xml = os.path.join(self.directory, 'annot.xml')
+        self.output = os.path.join(self.directory, 'morphology.json')
+
+    def write_xml(self, revision, texts):
+        with open(self.xml, 'w', encoding='utf-8') as f:
+            f.write(f'<?xml version="1.0" encoding="utf-8"?>'
+                    f'<annotation version="0.12" revision="{revision}">{"".join(texts)}</annotation>')
+
+    def parse(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return parse_opencorpora_xml_incremental(self.xml, self.output)
+
+    def read_state(self):
+        with open(text_state_path(self.output), 'rb') as f:
+            return f.read()
+
+    def test_state_is_kept_when_output_write_fails(self):
+        self.write_xml('1', [text('1', [token('школа', 'школа', ['NOUN', 'femn', 'sing', 'nomn'])])])
+        self.assertIsNotNone(self.parse())
+        state = self.read_state()
+
+        self.write_xml('2', [text('1', [token('школа', 'школа', ['NOUN', 'femn', 'sing', 'nomn'])]),
+                             text('2', [token('читать', 'читать', ['INFN', 'impf'])])])
+        with mock.patch('corpus_format.write_corpus', side_effect=OSError('диск заполнен')):
+            with self.assertRaises(OSError):
+                self.parse()
+        self.assertEqual(self.read_state(), state)
+
+        result = self.parse()
+        self.assertEqual(set(result['metadata']['words']), {'школа', 'читать'})
+        self.assertNotEqual(self.read_state(), state)
+
+if __name__ == "__main__":
+    unittest.main()
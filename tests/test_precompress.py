@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Свежесть сжатых вариантов (precompress.py)"""
+
+import contextlib
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from precompress import is_fresh, print_variants_table, write_variants
+
+def touch(path, mtime_ns):
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+class WriteVariantsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'corpus.json')
+        self.write(b'{"revision": "old", "words": [' + b'"word", ' * 100 + b'"end"]}')
+
+    def write(self, data):
+        with open(self.path, 'wb') as f:
+            f.write(data)
+
+    def read_gzip(self):
+        with open(self.path + '.gz', 'rb') as f:
+            return gzip.decompress(f.read())
+
+    def test_stale_variant_is_rewritten(self):
+        write_variants(self.path)
+        touch(self.path + '.gz', 1_000_000_000_000_000_000)
+
+        changed = b'{"revision": "CHANGED", "words": [' + b'"word", ' * 100 + b'"end"]}'
+        self.write(changed)
+        touch(self.path, 1_500_000_000_000_000_000)
+        self.assertFalse(is_fresh(self.path, self.path + '.gz'))
+
+        write_variants(self.path)
+        self.assertEqual(self.read_gzip(), changed)
+        self.assertTrue(is_fresh(self.path, self.path + '.gz'))
+
+    def test_fresh_variant_is_kept(self):
+        write_variants(self.path)
+        touch(self.path, 1_000_000_000_000_000_000)
+        touch(self.path + '.gz', 2_000_000_000_000_000_000)
+        write_variants(self.path)
+        self.assertEqual(os.stat(self.path + '.gz').st_mtime_ns, 2_000_000_000_000_000_000)
+
+    def test_mismatch_is_reported_without_traceback(self):
+        write_variants(self.path)
+        with open(self.path + '.gz', 'wb') as f:
+            f.write(gzip.compress(b'{"revision": "other"}'))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertFalse(print_variants_table([self.path]))
+        self.assertIn('не совпадает', output.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Сжатые варианты в локальном сервере (serve_app.py)"""
+
+import gzip
+import http.client
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from serve_app import make_server
+
+class CompressedVariantTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'opencorpora.json')
+
+        self.server = make_server(self.directory, '127.0.0.1', 0, quiet=True)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def write(self, path, data, mtime_ns):
+        with open(path, 'wb') as f:
+            f.write(data)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def get(self, headers):
+        connection = http.client.HTTPConnection(*self.server.server_address[:2], timeout=10)
+        self.addCleanup(connection.close)
+        connection.request('GET', '/opencorpora.json', headers=headers)
+        response = connection.getresponse()
+        return response.getheader('Content-Encoding'), response.read()
+
+    def test_fresh_variant_is_served(self):
+        self.write(self.path, b'{"revision": "new"}', 1_000_000_000_000_000_000)
+        self.write(self.path + '.gz', gzip.compress(b'{"revision": "new"}'), 1_000_000_000_000_000_000)
+        encoding, body = self.get({'Accept-Encoding': 'gzip'})
+        self.assertEqual(encoding, 'gzip')
+        self.assertEqual(gzip.decompress(body), b'{"revision": "new"}')
+
+    def test_stale_variant_falls_back_to_source(self):
+        self.write(self.path + '.gz', gzip.compress(b'{"revision": "old"}'), 1_000_000_000_000_000_000)
+        self.write(self.path, b'{"revision": "CHANGED"}', 1_500_000_000_000_000_000)
+        for headers in ({'Accept-Encoding': 'gzip'}, {}):
+            encoding, body = self.get(headers)
+            self.assertIsNone(encoding)
+            self.assertEqual(body, b'{"revision": "CHANGED"}')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,8 +4,8 @@
 Скрипт для точной проверки и исправления классификации склонений в корпусе
 """
 
-import json
-import re
+from corpus_format import open_corpus_words, read_corpus, write_corpus
+from declension_engine import VERIFY_DECLENSION
 
 def determine_correct_declension(word, gender, pos):
     """
@@ -14,62 +14,7 @@ def determine_correct_declension(word, gender, pos):
     if pos != 'NOUN':
         return None
     
-    word_lower = word.lower()
-    
-    # 1-е склонение: муж.р. и жен.р. на -а/-я
-    if word_lower.endswith(('а', 'я')):
-        return '1st'
-    
-    # 3-е склонение: жен.р. на мягкий знак
-    if word_lower.endswith('ь') and gender == 'FEMININE':
-        return '3rd'
-    
-    # Разносклоняемые существительные
-    heteroclitic_words = {
-        'путь', 'время', 'имя', 'племя', 'знамя', 'пламя', 
-        'стремя', 'темя', 'семя', 'бремя', 'вымя'
-    }
-    if word_lower in heteroclitic_words:
-        return 'heteroclitic'
-    
-    # Несклоняемые существительные
-    indeclinable_patterns = [
-        # Иностранные слова на -о, -е, -и, -у, -ю
-        r'[а-я]+[оеиую]$',
-        # Слова на -и (многие иностранные)
-        r'[а-я]+и$',
-        # Слова на -у (некоторые иностранные)
-        r'[а-я]+у$',
-        # Слова на -ю (некоторые иностранные)
-        r'[а-я]+ю$'
-    ]
-    
-    indeclinable_words = {
-        'кофе', 'пальто', 'кино', 'метро', 'такси', 'меню', 'кафе',
-        'ателье', 'пенсне', 'кашне', 'пари', 'реле', 'шоссе', 'алоэ',
-        'какао', 'пианино', 'радио', 'видео', 'аудио', 'фото', 'авто',
-        'мото', 'домино', 'казино', 'лото', 'бюро', 'депо', 'фойе',
-        'манто', 'боа', 'кенгуру', 'шимпанзе', 'какаду', 'фламинго',
-        'самоа', 'манчестер', 'джозеф', 'кортни', 'ник', 'пабло',
-        'ариэль', 'ольга', 'елена', 'александрия', 'минниханов'
-    }
-    
-    if word_lower in indeclinable_words:
-        return 'indeclinable'
-    
-    # Проверяем паттерны несклоняемых
-    for pattern in indeclinable_patterns:
-        if re.match(pattern, word_lower):
-            return 'indeclinable'
-    
-    # 2-е склонение: муж.р. с нулевым окончанием и ср.р. на -о/-е
-    if gender == 'MASCULINE' and not word_lower.endswith(('а', 'я', 'ь')):
-        return '2nd'
-    elif gender == 'NEUTER' and word_lower.endswith(('о', 'е')):
-        return '2nd'
-    
-    # По умолчанию для неопределенных случаев
-    return '2nd'
+    return VERIFY_DECLENSION.classify(word.lower(), gender)
 
 def verify_and_fix_corpus(input_file, output_file):
     """
@@ -77,8 +22,7 @@ def verify_and_fix_corpus(input_file, output_file):
     """
     print(f"Загружаем корпус из {input_file}...")
     
-    with open(input_file, 'r', encoding='utf-8') as f:
-        corpus = json.load(f)
+    corpus = read_corpus(input_file)
     
     words = corpus['metadata']['words']
     total_words = len(words)
@@ -121,8 +65,7 @@ def verify_and_fix_corpus(input_file, output_file):
     
     # Сохраняем исправленный корпус
     print(f"\nСохраняем исправленный корпус в {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(corpus, f, ensure_ascii=False, indent=2)
+    write_corpus(corpus, output_file)
     
     print(f"Готово! Исправленный корпус сохранен в {output_file}")
     
@@ -134,10 +77,8 @@ def check_specific_words(corpus_file, words_to_check):
     """
     print(f"\nПроверяем конкретные слова в {corpus_file}...")
     
-    with open(corpus_file, 'r', encoding='utf-8') as f:
-        corpus = json.load(f)
-    
-    words = corpus['metadata']['words']
+    # Для .rlc слова ищутся через mmap без загрузки всего корпуса
+    words = open_corpus_words(corpus_file)
     
     for word in words_to_check:
         if word in words:
@@ -150,6 +91,9 @@ def check_specific_words(corpus_file, words_to_check):
             print(f"{word}: {features.get('gender')} {features.get('declension')} -> должно быть {correct_declension}")
         else:
             print(f"{word}: не найдено в корпусе")
+    
+    if hasattr(words, 'close'):
+        words.close()
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Компактное представление признаков слова
+
+WordFeatures хранит признаки в __slots__ вместо отдельного словаря на каждое
+слово и интернирует строковые значения, поэтому одинаковые 'NOUN', 'FEMININE'
+и т.п. существуют в памяти в одном экземпляре. Интерфейс совпадает с тем,
+как скрипты исправления работают со словарем признаков:
+
+    features.get('gender'), features['declension'] = '3rd',
+    'pos' in features, features.items(), features == {...}
+
+Отсутствующий признак - это незаданный слот, поэтому набор ключей и их
+порядок сохраняются при записи обратно в JSON. Ключи вне FEATURE_FIELDS
+(например, corrected из apply_corrections.py) хранятся в отдельном словаре.
+"""
+
+import sys
+
+from parse_opencorpora import FEATURE_FIELDS
+
+FEATURE_FIELD_SET = frozenset(FEATURE_FIELDS)
+
+class WordFeatures:
+    """Признаки одного слова с интерфейсом словаря"""
+
+    __slots__ = FEATURE_FIELDS + ('extra',)
+
+    def __init__(self, features=None):
+        self.extra = None
+        if features:
+            for key, value in features.items():
+                self[key] = value
+
+    def __getitem__(self, key):
+        if key in FEATURE_FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        if isinstance(value, str):
+            value = sys.intern(value)
+        if key in FEATURE_FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key in FEATURE_FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self.extra is not None and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        for field in FEATURE_FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self.extra:
+            yield from self.extra
+
+    def items(self):
+        for key in self.keys():
+            yield key, self[key]
+
+    def values(self):
+        for key in self.keys():
+            yield self[key]
+
+    def update(self, features):
+        for key, value in features.items():
+            self[key] = value
+
+    def __iter__(self):
+        return self.keys()
+
+    def __len__(self):
+        return sum(1 for _ in self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, (WordFeatures, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self):
+        return f"WordFeatures({dict(self.items())!r})"
+
+    def to_dict(self):
+        return dict(self.items())
+
+def compact_words(words):
+    """Заменяет словари признаков в metadata.words на WordFeatures (на месте)"""
+    for word, features in words.items():
+        words[word] = WordFeatures(features)
+    return words
+
+def features_to_json(value):
+    """Хук default для json.dump: сериализует WordFeatures как словарь"""
+    if isinstance(value, WordFeatures):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")